@@ -0,0 +1,24 @@
+"""Add functional index on lower(graphs.name)
+
+Revision ID: 5c1dd53c6bde
+Revises: 1c2ab5a48576
+Create Date: 2026-10-16 09:12:41.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1dd53c6bde'
+down_revision = '1c2ab5a48576'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_graphs_lower_name', 'graphs', [sa.text('lower(name)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_graphs_lower_name', table_name='graphs')
@@ -0,0 +1,40 @@
+"""Store graph instance run counts as integers
+
+Revision ID: 5e9b7d2c4f18
+Revises: c83d0f6e2a15
+Create Date: 2026-10-16 19:26:51.904127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b7d2c4f18'
+down_revision = 'c83d0f6e2a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # graph_instances is created outside the migrations
+    if not sa.inspect(op.get_bind()).has_table('graph_instances'):
+        return
+    
+    op.alter_column('graph_instances', 'run_count',
+               type_=sa.Integer(),
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               existing_nullable=False,
+               postgresql_using='run_count::text::integer')
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('graph_instances'):
+        return
+    
+    op.alter_column('graph_instances', 'run_count',
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               existing_type=sa.Integer(),
+               existing_nullable=False,
+               postgresql_using='to_json(run_count)')
@@ -0,0 +1,40 @@
+"""Store smart context JSON columns as JSONB
+
+Revision ID: 7a3e5c19d8b4
+Revises: f41c9a7b2d60
+Create Date: 2026-10-16 16:12:40.530961
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e5c19d8b4'
+down_revision = 'f41c9a7b2d60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # smart_contexts is created outside the migrations
+    if not sa.inspect(op.get_bind()).has_table('smart_contexts'):
+        return
+    
+    for column in ('provider_context_data', 'context_metadata'):
+        op.alter_column('smart_contexts', column,
+                   type_=postgresql.JSONB(astext_type=sa.Text()),
+                   existing_type=sa.JSON(),
+                   postgresql_using=f'{column}::jsonb')
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('smart_contexts'):
+        return
+    
+    for column in ('provider_context_data', 'context_metadata'):
+        op.alter_column('smart_contexts', column,
+                   type_=sa.JSON(),
+                   existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                   postgresql_using=f'{column}::json')
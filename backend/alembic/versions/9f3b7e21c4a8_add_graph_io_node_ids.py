@@ -0,0 +1,49 @@
+"""Add input/output node id columns to graphs
+
+Revision ID: 9f3b7e21c4a8
+Revises: 5c1dd53c6bde
+Create Date: 2026-10-16 11:47:05.318342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3b7e21c4a8'
+down_revision = '5c1dd53c6bde'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('graphs', sa.Column('input_node_ids', sa.JSON(), nullable=True))
+    op.add_column('graphs', sa.Column('output_node_ids', sa.JSON(), nullable=True))
+    
+    # Backfill existing graphs from their nodes
+    graphs = sa.table(
+        'graphs',
+        sa.column('id', sa.UUID()),
+        sa.column('nodes', sa.JSON()),
+        sa.column('input_node_ids', sa.JSON()),
+        sa.column('output_node_ids', sa.JSON())
+    )
+    connection = op.get_bind()
+    for graph_id, nodes in connection.execute(sa.select(graphs.c.id, graphs.c.nodes)).all():
+        nodes = nodes or {}
+        input_ids = sorted(
+            node_id for node_id, node in nodes.items() if node.get('node_type') == 'input'
+        )
+        output_ids = [
+            node_id for node_id, node in nodes.items() if node.get('node_type') == 'output'
+        ]
+        connection.execute(
+            graphs.update()
+            .where(graphs.c.id == graph_id)
+            .values(input_node_ids=input_ids, output_node_ids=output_ids)
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('graphs', 'output_node_ids')
+    op.drop_column('graphs', 'input_node_ids')
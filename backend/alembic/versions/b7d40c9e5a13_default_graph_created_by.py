@@ -0,0 +1,36 @@
+"""Default graphs.created_by to 'system' server-side
+
+Revision ID: b7d40c9e5a13
+Revises: 9f3b7e21c4a8
+Create Date: 2026-10-16 13:05:52.740119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d40c9e5a13'
+down_revision = '9f3b7e21c4a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Default first, so rows inserted while the backfill runs get a value;
+    # then backfill existing NULLs before NOT NULL is enforced
+    op.alter_column('graphs', 'created_by',
+               existing_type=sa.String(length=255),
+               server_default='system')
+    op.execute("UPDATE graphs SET created_by = 'system' WHERE created_by IS NULL")
+    op.alter_column('graphs', 'created_by',
+               existing_type=sa.String(length=255),
+               existing_server_default='system',
+               nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('graphs', 'created_by',
+               existing_type=sa.String(length=255),
+               server_default=None,
+               nullable=True)
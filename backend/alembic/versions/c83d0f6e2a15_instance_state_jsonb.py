@@ -0,0 +1,40 @@
+"""Store graph instance state as JSONB
+
+Revision ID: c83d0f6e2a15
+Revises: 7a3e5c19d8b4
+Create Date: 2026-10-16 18:04:12.318442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c83d0f6e2a15'
+down_revision = '7a3e5c19d8b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # graph_instances is created outside the migrations
+    if not sa.inspect(op.get_bind()).has_table('graph_instances'):
+        return
+    
+    op.alter_column('graph_instances', 'instance_state',
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_type=sa.JSON(),
+               existing_nullable=False,
+               postgresql_using='instance_state::jsonb')
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('graph_instances'):
+        return
+    
+    op.alter_column('graph_instances', 'instance_state',
+               type_=sa.JSON(),
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=False,
+               postgresql_using='instance_state::json')
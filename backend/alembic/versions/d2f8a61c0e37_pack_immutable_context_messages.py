@@ -0,0 +1,71 @@
+"""Store immutable context messages as compressed MessagePack
+
+Revision ID: d2f8a61c0e37
+Revises: b7d40c9e5a13
+Create Date: 2026-10-16 14:02:51.604217
+
+"""
+from alembic import op
+import msgspec
+import sqlalchemy as sa
+import zstandard
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f8a61c0e37'
+down_revision = 'b7d40c9e5a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # immutable_contexts is created by init_db; nothing to convert without it
+    connection = op.get_bind()
+    if not sa.inspect(connection).has_table('immutable_contexts'):
+        return
+    
+    op.add_column('immutable_contexts', sa.Column('messages_blob', sa.LargeBinary(), nullable=True))
+    
+    contexts = sa.table(
+        'immutable_contexts',
+        sa.column('context_key', sa.String()),
+        sa.column('messages', sa.JSON()),
+        sa.column('messages_blob', sa.LargeBinary())
+    )
+    compressor = zstandard.ZstdCompressor(level=3)
+    rows = connection.execute(sa.select(contexts.c.context_key, contexts.c.messages)).all()
+    for context_key, messages in rows:
+        connection.execute(
+            contexts.update()
+            .where(contexts.c.context_key == context_key)
+            .values(messages_blob=compressor.compress(msgspec.msgpack.encode(messages or [])))
+        )
+    
+    op.drop_column('immutable_contexts', 'messages')
+    op.alter_column('immutable_contexts', 'messages_blob', new_column_name='messages', nullable=False)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if not sa.inspect(connection).has_table('immutable_contexts'):
+        return
+    
+    op.add_column('immutable_contexts', sa.Column('messages_json', sa.JSON(), nullable=True))
+    
+    contexts = sa.table(
+        'immutable_contexts',
+        sa.column('context_key', sa.String()),
+        sa.column('messages', sa.LargeBinary()),
+        sa.column('messages_json', sa.JSON())
+    )
+    decompressor = zstandard.ZstdDecompressor()
+    rows = connection.execute(sa.select(contexts.c.context_key, contexts.c.messages)).all()
+    for context_key, blob in rows:
+        connection.execute(
+            contexts.update()
+            .where(contexts.c.context_key == context_key)
+            .values(messages_json=msgspec.msgpack.decode(decompressor.decompress(blob)))
+        )
+    
+    op.drop_column('immutable_contexts', 'messages')
+    op.alter_column('immutable_contexts', 'messages_json', new_column_name='messages', nullable=False)
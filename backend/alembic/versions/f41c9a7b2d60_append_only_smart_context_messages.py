@@ -0,0 +1,72 @@
+"""Move smart context messages into an append-only table
+
+Revision ID: f41c9a7b2d60
+Revises: d2f8a61c0e37
+Create Date: 2026-10-16 15:37:12.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f41c9a7b2d60'
+down_revision = 'd2f8a61c0e37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # smart_contexts is created outside the migrations; create_all builds
+    # the new table alongside it when it's missing
+    if not sa.inspect(op.get_bind()).has_table('smart_contexts'):
+        return
+    
+    op.create_table('smart_context_messages',
+    sa.Column('context_id', sa.String(length=100), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['context_id'], ['smart_contexts.context_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('context_id', 'seq')
+    )
+    
+    op.execute("""
+        INSERT INTO smart_context_messages (context_id, seq, role, content)
+        SELECT s.context_id, m.ord - 1, LEFT(COALESCE(m.elem->>'role', 'user'), 20), COALESCE(m.elem->>'content', '')
+        FROM smart_contexts AS s
+        CROSS JOIN LATERAL json_array_elements(s.messages) WITH ORDINALITY AS m(elem, ord)
+        WHERE json_typeof(s.messages) = 'array'
+    """)
+    op.execute("""
+        UPDATE smart_contexts
+        SET provider_context_data = (
+            provider_context_data::jsonb - 'messages' - '_rendered_prefix' - '_rendered_count'
+        )::json
+        WHERE provider_context_data IS NOT NULL
+    """)
+    
+    op.drop_column('smart_contexts', 'messages')
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('smart_context_messages'):
+        return
+    
+    op.add_column('smart_contexts', sa.Column('messages', sa.JSON(), nullable=True))
+    
+    op.execute("""
+        UPDATE smart_contexts AS s
+        SET messages = COALESCE((
+            SELECT json_agg(json_build_object('role', m.role, 'content', m.content) ORDER BY m.seq)
+            FROM smart_context_messages AS m
+            WHERE m.context_id = s.context_id
+        ), '[]'::json)
+    """)
+    op.execute("""
+        UPDATE smart_contexts
+        SET provider_context_data = jsonb_set(provider_context_data::jsonb, '{messages}', messages::jsonb)::json
+        WHERE provider_context_data IS NOT NULL
+    """)
+    
+    op.drop_table('smart_context_messages')
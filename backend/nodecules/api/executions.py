@@ -1,304 +1,330 @@
 """API routes for graph execution."""
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import List
+import time
+from collections import ChainMap
+from typing import Any, AsyncIterator, Dict, List, Mapping
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-import json
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+import orjson
 
-from ..models.database import get_database
+from ..models.database import get_async_database
 from ..models.schemas import Graph, Execution
-from ..core.types import GraphData, NodeData, EdgeData
-from ..core.executor import GraphExecutor
+from ..core.graph_cache import get_graph_data
 from .models import ExecutionCreateRequest, ExecutionResponse, ErrorResponse, ContextAction
-from .graphs import resolve_graph_by_id_or_name
+from .graphs import resolve_graph_by_id_or_name_async
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Validates and serializes whole execution lists in one pydantic-core pass
+_EXECUTION_LIST_ADAPTER = TypeAdapter(List[ExecutionResponse])
 
-@router.post("/", response_model=ExecutionResponse)
-async def execute_graph(
-    request: ExecutionCreateRequest,
-    fastapi_request: Request,
-    db: Session = Depends(get_database)
-):
-    """Execute a graph with optional context management."""
+# Server-Sent Event framing, pre-encoded so each event is a single bytes concat
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+# Events arriving within a short window are written to the socket together
+_SSE_BATCH_SIZE = 16
+_SSE_BATCH_WINDOW = 0.005  # seconds
+_SSE_QUEUE_SIZE = 64
+
+# Terminal events are sent on their own, without waiting for a batch to fill
+_SSE_TERMINAL_EVENTS = frozenset({"execution_complete", "execution_error"})
+
+_STREAM_DONE = object()
+
+
+def _utc_iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds and a Z suffix."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanos // 1000:06d}Z"
+
+
+async def _produce_events(events: AsyncIterator[Dict[str, Any]], queue: asyncio.Queue) -> None:
+    """Feed executor events into the queue, ending with a sentinel or the raised error."""
     try:
-        # Handle context actions first
-        execution_inputs = request.inputs.copy()
-        
-        if request.context_action:
-            context_action = request.context_action
-            
-            if context_action.action == "continue" and context_action.context_id:
-                # Continue from existing context - add context to inputs
-                execution_inputs["_context"] = context_action.context_id
-                
-            elif context_action.action == "rewind" and context_action.context_id:
-                # Rewind context first, then continue
-                from ..core.context_service import context_service
-                
-                # Load and rewind context
-                current_context = await context_service.get_context(context_action.context_id, db)
-                if current_context:
-                    # Simple rewind by removing last N message pairs
-                    steps_back = context_action.rewind_steps or 1
-                    messages_to_remove = steps_back * 2  # user + assistant pairs
-                    
-                    if messages_to_remove < len(current_context.messages):
-                        current_context.messages = current_context.messages[:-messages_to_remove]
-                    
-                    # Create new context step and store
-                    rewound_context = current_context.create_next_step()
-                    await context_service.store_context(rewound_context, db)
-                    
-                    execution_inputs["_context"] = rewound_context.context_id
+        async for event in events:
+            await queue.put(event)
+    except Exception as e:
+        await queue.put(e)
+    else:
+        await queue.put(_STREAM_DONE)
+
+
+async def _coalesce_sse_frames(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Yield SSE frames for the events, joining ones that arrive close together.
+    
+    Ordering is preserved; an error raised by the event source is re-raised
+    after every frame queued before it has been yielded.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_SSE_QUEUE_SIZE)
+    producer = asyncio.create_task(_produce_events(events, queue))
+    
+    try:
+        item = await queue.get()
+        while True:
+            frames = []
+            while item is not _STREAM_DONE and not isinstance(item, Exception):
+                if item.get("type") in _SSE_TERMINAL_EVENTS:
+                    # Flush what we have, then send the terminal frame immediately
+                    if frames:
+                        yield b"".join(frames)
+                        frames = []
+                    yield _SSE_PREFIX + orjson.dumps(item) + _SSE_SUFFIX
+                    item = await queue.get()
+                    continue
                 
-            elif context_action.action == "new":
-                # Create new context if conversation_id specified
-                if context_action.conversation_id:
-                    execution_inputs["_conversation_id"] = context_action.conversation_id
-        
-        # Get graph from database by ID or name
-        db_graph = resolve_graph_by_id_or_name(request.graph_id, db)
-        
-        # Convert to internal format
-        nodes = {}
-        for node_id, node_data in db_graph.nodes.items():
-            nodes[node_id] = NodeData(
-                node_id=node_data["node_id"],
-                node_type=node_data["node_type"],
-                position=node_data.get("position", {}),
-                parameters=node_data.get("parameters", {}),
-                label=node_data.get("label"),
-                description=node_data.get("description")
-            )
+                frames.append(_SSE_PREFIX + orjson.dumps(item) + _SSE_SUFFIX)
+                if len(frames) >= _SSE_BATCH_SIZE:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=_SSE_BATCH_WINDOW)
+                except asyncio.TimeoutError:
+                    break
             
-        edges = []
-        for edge_data in db_graph.edges:
-            edges.append(EdgeData(
-                edge_id=edge_data["edge_id"],
-                source_node=edge_data["source_node"],
-                source_port=edge_data["source_port"],
-                target_node=edge_data["target_node"],
-                target_port=edge_data["target_port"]
-            ))
-        
-        graph_data = GraphData(
-            graph_id=str(db_graph.id),
-            name=db_graph.name,
-            nodes=nodes,
-            edges=edges,
-            meta_data=db_graph.meta_data
-        )
-        
-        # Create execution record
-        db_execution = Execution(
-            graph_id=db_graph.id,
-            status="pending",
-            inputs=execution_inputs  # Use processed inputs with context
-        )
-        db.add(db_execution)
-        db.commit()
-        db.refresh(db_execution)
-        
-        try:
-            # Get node registry from app state
-            node_registry = fastapi_request.app.state.node_registry
+            if frames:
+                yield b"".join(frames)
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            item = await queue.get()
+    finally:
+        producer.cancel()
+
+
+async def _prepare_execution_inputs(request: ExecutionCreateRequest) -> Mapping[str, Any]:
+    """Apply the request's context action and return the inputs to execute with.
+    
+    Context keys are layered over the request inputs with a ChainMap rather
+    than copying the (possibly large) inputs dict.
+    """
+    context_action = request.context_action
+    if context_action is None:
+        # Common case: nothing to layer on top of the request inputs
+        return request.inputs
+    
+    overrides: Dict[str, Any] = {}
+    
+    match context_action.action:
+        case "continue" if context_action.context_id:
+            # Continue from existing context - add context to inputs
+            overrides["_context"] = context_action.context_id
             
-            # Execute graph
-            executor = GraphExecutor(node_registry.get_all())
-            context = await executor.execute_graph(graph_data, execution_inputs)
+        case "rewind" if context_action.context_id:
+            # Rewind context in place (user + assistant pairs), then continue
+            from ..core.smart_context import smart_context_manager
             
-            # Update execution record with results
-            db_execution.status = "completed"
-            db_execution.outputs = context.node_outputs
-            db_execution.node_status = {k: v.value for k, v in context.node_status.items()}
-            db_execution.errors = context.errors
-            db_execution.started_at = context.started_at
-            db_execution.completed_at = context.completed_at
+            steps_back = context_action.rewind_steps or 1
+            await smart_context_manager.rewind_context(context_action.context_id, steps_back)
             
-        except Exception as e:
-            # Update execution record with error
-            db_execution.status = "failed"
-            db_execution.errors = {"execution": str(e)}
-            logger.error(f"Graph execution failed: {e}")
+            overrides["_context"] = context_action.context_id
             
-        db.commit()
-        db.refresh(db_execution)
+        case "new" if context_action.conversation_id:
+            # Create new context if conversation_id specified
+            overrides["_conversation_id"] = context_action.conversation_id
+    
+    return ChainMap(overrides, request.inputs)
+
+
+async def _update_execution(db: AsyncSession, execution_id: UUID, values: Dict[str, Any]) -> None:
+    """Write an execution's new state in one UPDATE and commit it."""
+    # Skip identity-map reconciliation; callers don't read the row back
+    await db.execute(
+        update(Execution)
+        .where(Execution.id == execution_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+@router.post("/", response_model=ExecutionResponse)
+async def execute_graph(
+    request: ExecutionCreateRequest,
+    fastapi_request: Request,
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Execute a graph with optional context management."""
+    # Handle context actions first
+    execution_inputs = await _prepare_execution_inputs(request)
+    
+    # Get graph from database by ID or name
+    db_graph = await resolve_graph_by_id_or_name_async(request.graph_id, db)
+    
+    # Convert to internal format (cached per graph version)
+    graph_data = get_graph_data(db_graph)
+    
+    # Create execution record
+    db_execution = Execution(
+        graph_id=db_graph.id,
+        status="pending",
+        inputs=dict(execution_inputs)  # Use processed inputs with context
+    )
+    db.add(db_execution)
+    # Flush assigns the primary key; the record is committed once, with results
+    await db.flush()
+    
+    try:
+        # Execute graph with the shared executor from app state
+        executor = fastapi_request.app.state.graph_executor
+        context = await executor.execute_graph(graph_data, execution_inputs)
         
-        logger.info(f"Execution {db_execution.id} status: {db_execution.status}")
-        return ExecutionResponse.model_validate(db_execution)
+        # Execution results
+        final_state = {
+            "status": "completed",
+            "outputs": context.node_outputs,
+            "node_status": {k: v.value for k, v in context.node_status.items()},
+            "errors": context.errors,
+            "started_at": context.started_at,
+            "completed_at": context.completed_at
+        }
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Failed to execute graph: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        # Execution error
+        final_state = {
+            "status": "failed",
+            "errors": {"execution": str(e)}
+        }
+        logger.error(f"Graph execution failed: {e}")
+    
+    await _update_execution(db, db_execution.id, final_state)
+    
+    logger.info(f"Execution {db_execution.id} status: {final_state['status']}")
+    # Everything else was set in Python at flush time, so no reload is needed
+    return ExecutionResponse.model_validate(db_execution).model_copy(update=final_state)
 
 
 @router.get("/{execution_id}", response_model=ExecutionResponse)
 async def get_execution(
     execution_id: UUID,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Get execution status and results."""
-    execution = db.query(Execution).filter(Execution.id == execution_id).first()
+    execution = await db.get(Execution, execution_id)
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
     
     return ExecutionResponse.model_validate(execution)
 
 
-@router.get("/", response_model=List[ExecutionResponse])
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": List[ExecutionResponse]}}
+)
 async def list_executions(
     graph_id: UUID = None,
     status: str = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """List executions with optional filtering."""
-    query = db.query(Execution)
+    # ExecutionResponse never touches the graph relationship; make sure a
+    # future change can't silently turn this into one SELECT per row
+    query = select(Execution).options(raiseload(Execution.graph))
     
     if graph_id:
-        query = query.filter(Execution.graph_id == graph_id)
+        query = query.where(Execution.graph_id == graph_id)
     if status:
-        query = query.filter(Execution.status == status)
+        query = query.where(Execution.status == status)
     
-    executions = query.offset(skip).limit(limit).all()
-    return [ExecutionResponse.model_validate(execution) for execution in executions]
+    # Stable ordering so offset/limit pagination doesn't skip or repeat rows
+    query = query.order_by(Execution.created_at.desc(), Execution.id)
+    
+    result = await db.execute(query.offset(skip).limit(limit))
+    executions = result.scalars().all()
+    
+    # Serialize directly so FastAPI doesn't validate the list a second time
+    validated = _EXECUTION_LIST_ADAPTER.validate_python(executions, from_attributes=True)
+    return Response(
+        content=_EXECUTION_LIST_ADAPTER.dump_json(validated),
+        media_type="application/json"
+    )
 
 
 @router.post("/stream", response_class=StreamingResponse)
 async def execute_graph_streaming(
     request: ExecutionCreateRequest,
     fastapi_request: Request,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Execute a graph with streaming responses."""
-    try:
-        # Handle context actions first (same as regular execution)
-        execution_inputs = request.inputs.copy()
-        
-        if request.context_action:
-            context_action = request.context_action
-            
-            if context_action.action == "continue" and context_action.context_id:
-                execution_inputs["_context"] = context_action.context_id
-                
-            elif context_action.action == "rewind" and context_action.context_id:
-                from ..core.context_service import context_service
-                
-                current_context = await context_service.get_context(context_action.context_id, db)
-                if current_context:
-                    steps_back = context_action.rewind_steps or 1
-                    messages_to_remove = steps_back * 2
-                    
-                    if messages_to_remove < len(current_context.messages):
-                        current_context.messages = current_context.messages[:-messages_to_remove]
-                    
-                    rewound_context = current_context.create_next_step()
-                    await context_service.store_context(rewound_context, db)
-                    
-                    execution_inputs["_context"] = rewound_context.context_id
-                
-            elif context_action.action == "new":
-                if context_action.conversation_id:
-                    execution_inputs["_conversation_id"] = context_action.conversation_id
-        
-        # Get graph from database by ID or name
-        db_graph = resolve_graph_by_id_or_name(request.graph_id, db)
-        
-        # Convert to internal format
-        nodes = {}
-        for node_id, node_data in db_graph.nodes.items():
-            nodes[node_id] = NodeData(
-                node_id=node_data["node_id"],
-                node_type=node_data["node_type"],
-                position=node_data.get("position", {}),
-                parameters=node_data.get("parameters", {}),
-                label=node_data.get("label"),
-                description=node_data.get("description")
+    # Handle context actions first (same as regular execution)
+    execution_inputs = await _prepare_execution_inputs(request)
+    
+    # Get graph from database by ID or name
+    db_graph = await resolve_graph_by_id_or_name_async(request.graph_id, db)
+    
+    # Convert to internal format (cached per graph version)
+    graph_data = get_graph_data(db_graph)
+    
+    # Create execution record
+    db_execution = Execution(
+        graph_id=db_graph.id,
+        status="running",
+        inputs=dict(execution_inputs)
+    )
+    db.add(db_execution)
+    # Commit up front so the running stream is visible to other clients;
+    # nothing is read back, so no refresh is needed
+    await db.commit()
+    
+    # Get the shared executor from app state
+    executor = fastapi_request.app.state.graph_executor
+    
+    # Per-node outputs from the stream, saved with the execution record
+    outputs: Dict[str, Any] = {}
+    
+    async def collect_outputs(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        async for event in events:
+            if event.get("type") == "node_complete":
+                outputs[event["node_id"]] = event["outputs"]
+            yield event
+    
+    async def streaming_generator():
+        """Generate Server-Sent Events for streaming execution."""
+        try:
+            # Execute graph with streaming, under the execution record's id
+            events = executor.execute_graph_streaming(
+                graph_data, execution_inputs, execution_id=str(db_execution.id)
             )
+            async for frames in _coalesce_sse_frames(collect_outputs(events)):
+                # Send as Server-Sent Events (possibly several per write)
+                yield frames
             
-        edges = []
-        for edge_data in db_graph.edges:
-            edges.append(EdgeData(
-                edge_id=edge_data["edge_id"],
-                source_node=edge_data["source_node"],
-                source_port=edge_data["source_port"],
-                target_node=edge_data["target_node"],
-                target_port=edge_data["target_port"]
-            ))
-        
-        graph_data = GraphData(
-            graph_id=str(db_graph.id),
-            name=db_graph.name,
-            nodes=nodes,
-            edges=edges,
-            meta_data=db_graph.meta_data
-        )
-        
-        # Create execution record
-        db_execution = Execution(
-            graph_id=db_graph.id,
-            status="running",
-            inputs=execution_inputs
-        )
-        db.add(db_execution)
-        db.commit()
-        db.refresh(db_execution)
-        
-        # Get node registry from app state
-        node_registry = fastapi_request.app.state.node_registry
-        
-        async def streaming_generator():
-            """Generate Server-Sent Events for streaming execution."""
-            try:
-                # Execute graph with streaming
-                executor = GraphExecutor(node_registry.get_all())
-                
-                async for event in executor.execute_graph_streaming(graph_data, execution_inputs):
-                    # Send as Server-Sent Event
-                    yield f"data: {json.dumps(event)}\n\n"
-                
-                # Update execution record with final status
-                db_execution.status = "completed"
-                db.commit()
-                
-            except Exception as e:
-                logger.error(f"Streaming execution failed: {e}")
-                
-                # Send error event
-                error_event = {
-                    "type": "execution_error",
-                    "error": str(e),
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                yield f"data: {json.dumps(error_event)}\n\n"
-                
-                # Update execution record with error
-                db_execution.status = "failed"
-                db_execution.errors = {"execution": str(e)}
-                db.commit()
-        
-        return StreamingResponse(
-            streaming_generator(),
-            media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream"
+            # Update execution record with final status and outputs
+            await _update_execution(db, db_execution.id, {"status": "completed", "outputs": outputs})
+            
+        except Exception as e:
+            logger.error(f"Streaming execution failed: {e}")
+            
+            # Send error event
+            error_event = {
+                "type": "execution_error",
+                "error": str(e),
+                "timestamp": _utc_iso_now()
             }
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to start streaming execution: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            yield _SSE_PREFIX + orjson.dumps(error_event) + _SSE_SUFFIX
+            
+            # Update execution record with error
+            await _update_execution(
+                db, db_execution.id, {"status": "failed", "errors": {"execution": str(e)}}
+            )
+    
+    return StreamingResponse(
+        streaming_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
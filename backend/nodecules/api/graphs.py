@@ -2,19 +2,27 @@
 
 import logging
 import json
-from typing import List
-from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+import orjson
 
-from ..models.database import get_database
+from ..models.database import get_async_database, uuid7
 from ..models.schemas import Graph
-from ..core.types import GraphData, NodeData, EdgeData
+from ..core.graph_cache import get_graph_data, invalidate_graph_data
 from .models import (
+    NodeDataRequest,
+    EdgeDataRequest,
     GraphCreateRequest, 
     GraphUpdateRequest, 
     GraphResponse, 
+    GraphSummaryResponse,
     GraphExecuteRequest,
     GraphExecuteResponse,
     ErrorResponse
@@ -23,22 +31,164 @@ from .models import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Validate and serialize whole graph lists in one pydantic-core pass
+_GRAPH_LIST_ADAPTER = TypeAdapter(List[GraphResponse])
+_GRAPH_SUMMARY_LIST_ADAPTER = TypeAdapter(List[GraphSummaryResponse])
 
-def resolve_graph_by_id_or_name(graph_identifier: str, db: Session) -> Graph:
-    """Helper function to find a graph by UUID or name."""
-    graph = None
+# Bump when the schema response format changes so cached copies are invalidated
+_SCHEMA_VERSION = 1
+
+# Streamed graph bodies are written to the socket in chunks of roughly this size
+_RAW_CHUNK_SIZE = 64 * 1024
+
+
+def _node_dicts(node_requests: Dict[str, NodeDataRequest]) -> Dict[str, Dict[str, Any]]:
+    """Convert validated node requests to their stored JSON form."""
+    return {
+        node_id: {
+            "node_id": node_req.node_id or str(uuid4()),
+            "node_type": node_req.node_type,
+            "position": node_req.position,
+            "parameters": node_req.parameters,
+            "label": node_req.label,
+            "description": node_req.description
+        }
+        for node_id, node_req in node_requests.items()
+    }
+
+
+def _edge_dicts(edge_requests: List[EdgeDataRequest]) -> List[Dict[str, Any]]:
+    """Convert validated edge requests to their stored JSON form."""
+    return [
+        {
+            "edge_id": edge_req.edge_id or (
+                f"{edge_req.source_node}_{edge_req.source_port}-{edge_req.target_node}_{edge_req.target_port}"
+            ),
+            "source_node": edge_req.source_node,
+            "source_port": edge_req.source_port,
+            "target_node": edge_req.target_node,
+            "target_port": edge_req.target_port
+        }
+        for edge_req in edge_requests
+    ]
+
+
+def _io_node_ids(nodes: Dict[str, Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """Return (sorted input node ids, output node ids in graph order)."""
+    input_ids = []
+    output_ids = []
+    for node_id, node_data in nodes.items():
+        node_type = node_data.get("node_type")
+        if node_type == "input":
+            input_ids.append(node_id)
+        elif node_type == "output":
+            output_ids.append(node_id)
+    
+    input_ids.sort()
+    return input_ids, output_ids
+
+
+def _graph_etag(graph: Graph, variant: str = "") -> str:
+    """Weak ETag for a graph representation, derived from updated_at."""
+    version = int(graph.updated_at.timestamp() * 1_000_000)
+    suffix = f"-{variant}" if variant else ""
+    return f'W/"{graph.id}-{version}{suffix}"'
+
+
+def _etag_matches(fastapi_request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match covers the given ETag."""
+    if_none_match = fastapi_request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def _iter_graph_json(graph: Graph) -> Iterator[bytes]:
+    """Yield a graph's JSON (same shape as GraphResponse) in chunks.
+    
+    Nodes and edges are serialized one at a time, so the full document is
+    never held in memory as a single bytes object.
+    """
+    header = orjson.dumps({
+        "id": str(graph.id),
+        "name": graph.name,
+        "description": graph.description,
+        "metadata": graph.meta_data or {},
+        "created_at": graph.created_at,
+        "updated_at": graph.updated_at,
+        "created_by": graph.created_by
+    })
+    # Reopen the header object so nodes and edges can be appended to it
+    buffer = [header[:-1], b',"nodes":{']
+    size = len(header)
+    
+    def flush():
+        nonlocal buffer, size
+        chunk = b"".join(buffer)
+        buffer, size = [], 0
+        return chunk
+    
+    separator = b""
+    for node_id, node in (graph.nodes or {}).items():
+        fragment = separator + orjson.dumps(str(node_id)) + b":" + orjson.dumps(node)
+        buffer.append(fragment)
+        size += len(fragment)
+        separator = b","
+        if size >= _RAW_CHUNK_SIZE:
+            yield flush()
+    
+    buffer.append(b'},"edges":[')
+    separator = b""
+    for edge in graph.edges or []:
+        fragment = separator + orjson.dumps(edge)
+        buffer.append(fragment)
+        size += len(fragment)
+        separator = b","
+        if size >= _RAW_CHUNK_SIZE:
+            yield flush()
+    
+    buffer.append(b"]}")
+    yield flush()
+
+
+def _select_graph_by_identifier(entity, graph_identifier: str):
+    """Select entity from the graph matching graph_identifier by UUID or name."""
+    # Match by name case-insensitively (uses ix_graphs_lower_name)
+    name_condition = func.lower(Graph.name) == graph_identifier.lower()
     
-    # Try to parse as UUID first
     try:
-        graph_uuid = UUID(graph_identifier)
-        graph = db.query(Graph).filter(Graph.id == graph_uuid).first()
+        graph_id = UUID(graph_identifier)
     except ValueError:
-        # Not a valid UUID, try to find by name (case-insensitive first)
-        graph = db.query(Graph).filter(Graph.name.ilike(graph_identifier)).first()
-        
-        # If not found, try exact case-sensitive match
-        if not graph:
-            graph = db.query(Graph).filter(Graph.name == graph_identifier).first()
+        return select(entity).where(name_condition).limit(1)
+    
+    # UUID-shaped: match the id, or a graph named like one, in one statement;
+    # the id match wins when both exist
+    id_condition = Graph.id == graph_id
+    return select(entity).where(
+        or_(id_condition, name_condition)
+    ).order_by(id_condition.desc()).limit(1)
+
+
+def resolve_graph_by_id_or_name(graph_identifier: str, db: Session) -> Graph:
+    """Helper function to find a graph by UUID or name."""
+    # Single round-trip regardless of which form the identifier takes
+    graph = db.execute(_select_graph_by_identifier(Graph, graph_identifier)).scalar_one_or_none()
+    
+    if not graph:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Graph not found: {graph_identifier}"
+        )
+    
+    return graph
+
+
+async def resolve_graph_by_id_or_name_async(graph_identifier: str, db: AsyncSession) -> Graph:
+    """Async variant of resolve_graph_by_id_or_name for AsyncSession handlers."""
+    result = await db.execute(_select_graph_by_identifier(Graph, graph_identifier))
+    graph = result.scalar_one_or_none()
     
     if not graph:
         raise HTTPException(
@@ -49,189 +199,268 @@ def resolve_graph_by_id_or_name(graph_identifier: str, db: Session) -> Graph:
     return graph
 
 
+async def resolve_graph_pk(graph_identifier: str, db: AsyncSession) -> UUID:
+    """Find a graph's id by UUID or name without loading the row."""
+    result = await db.execute(_select_graph_by_identifier(Graph.id, graph_identifier))
+    graph_id = result.scalar_one_or_none()
+    
+    if graph_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Graph not found: {graph_identifier}"
+        )
+    
+    return graph_id
+
+
 @router.post("/", response_model=GraphResponse)
 async def create_graph(
     request: GraphCreateRequest,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Create a new graph."""
-    try:
-        # Convert request to internal format
-        nodes = {}
-        for node_id, node_req in request.nodes.items():
-            nodes[node_id] = NodeData(
-                node_id=node_req.node_id,
-                node_type=node_req.node_type,
-                position=node_req.position,
-                parameters=node_req.parameters,
-                label=node_req.label,
-                description=node_req.description
-            ).__dict__
-            
-        edges = []
-        for edge_req in request.edges:
-            edges.append(EdgeData(
-                edge_id=edge_req.edge_id,
-                source_node=edge_req.source_node,
-                source_port=edge_req.source_port,
-                target_node=edge_req.target_node,
-                target_port=edge_req.target_port
-            ).__dict__)
-        
-        # Create database record
-        db_graph = Graph(
+    # Convert request to internal format
+    nodes = _node_dicts(request.nodes)
+    edges = _edge_dicts(request.edges)
+    
+    input_ids, output_ids = _io_node_ids(nodes)
+    
+    # Create database record. RETURNING hands back the stored row (server
+    # defaults included), so no follow-up SELECT is needed
+    result = await db.execute(
+        insert(Graph).values(
             name=request.name,
             description=request.description,
             nodes=nodes,
             edges=edges,
             meta_data=request.metadata,
-            created_by="system"  # TODO: Get from authentication
-        )
-        
-        db.add(db_graph)
-        db.commit()
-        db.refresh(db_graph)
-        
-        logger.info(f"Created graph {db_graph.id}: {db_graph.name}")
-        return GraphResponse.model_validate(db_graph)
-        
-    except Exception as e:
-        logger.error(f"Failed to create graph: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            input_node_ids=input_ids,
+            output_node_ids=output_ids
+            # created_by falls back to the server-side "system" default until
+            # it can come from authentication
+        ).returning(Graph)
+    )
+    db_graph = result.scalar_one()
+    await db.commit()
+    
+    logger.info(f"Created graph {db_graph.id}: {db_graph.name}")
+    return GraphResponse.model_validate(db_graph)
 
 
 @router.get("/{graph_identifier}", response_model=GraphResponse)
 async def get_graph(
     graph_identifier: str,
-    db: Session = Depends(get_database)
+    fastapi_request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Get a graph by ID or name."""
-    graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
+    
+    # Unchanged since the client's copy: skip serializing nodes/edges
+    etag = _graph_etag(graph)
+    if _etag_matches(fastapi_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     return GraphResponse.model_validate(graph)
 
 
-@router.get("/", response_model=List[GraphResponse])
+@router.get(
+    "/{graph_identifier}/raw",
+    response_class=StreamingResponse,
+    responses={200: {"model": GraphResponse}}
+)
+async def get_graph_raw(
+    graph_identifier: str,
+    fastapi_request: Request,
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Get a graph by ID or name, streaming the JSON body for large graphs."""
+    graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
+    
+    etag = _graph_etag(graph)
+    if _etag_matches(fastapi_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return StreamingResponse(
+        _iter_graph_json(graph),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": Union[List[GraphResponse], List[GraphSummaryResponse]]}}
+)
 async def list_graphs(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_database)
+    summary: bool = False,
+    db: AsyncSession = Depends(get_async_database)
 ):
-    """List all graphs."""
-    graphs = db.query(Graph).offset(skip).limit(limit).all()
-    return [GraphResponse.model_validate(graph) for graph in graphs]
+    """List all graphs; with summary=true, omit nodes, edges and metadata."""
+    if summary:
+        # Only load the columns the summary needs, skipping the JSON blobs
+        query = select(Graph).options(load_only(
+            Graph.id, Graph.name, Graph.description,
+            Graph.created_at, Graph.updated_at, Graph.created_by
+        ))
+        adapter = _GRAPH_SUMMARY_LIST_ADAPTER
+    else:
+        query = select(Graph)
+        adapter = _GRAPH_LIST_ADAPTER
+    
+    result = await db.execute(query.offset(skip).limit(limit))
+    graphs = result.scalars().all()
+    
+    # Validate and serialize the whole page in one pydantic-core pass
+    validated = adapter.validate_python(graphs, from_attributes=True)
+    return Response(content=adapter.dump_json(validated), media_type="application/json")
 
 
 @router.put("/{graph_identifier}", response_model=GraphResponse)
 async def update_graph(
     graph_identifier: str,
     request: GraphUpdateRequest,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Update a graph by ID or name."""
-    db_graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph_id = await resolve_graph_pk(graph_identifier, db)
     
     # Update fields if provided
+    values = {}
     if request.name is not None:
-        db_graph.name = request.name
+        values["name"] = request.name
     if request.description is not None:
-        db_graph.description = request.description
+        values["description"] = request.description
     if request.metadata is not None:
-        db_graph.meta_data = request.metadata
+        values["meta_data"] = request.metadata
         
     # Update nodes if provided
     if request.nodes is not None:
-        nodes = {}
-        for node_id, node_req in request.nodes.items():
-            nodes[node_id] = NodeData(
-                node_id=node_req.node_id,
-                node_type=node_req.node_type,
-                position=node_req.position,
-                parameters=node_req.parameters,
-                label=node_req.label,
-                description=node_req.description
-            ).__dict__
-        db_graph.nodes = nodes
+        values["nodes"] = _node_dicts(request.nodes)
+        values["input_node_ids"], values["output_node_ids"] = _io_node_ids(values["nodes"])
         
     # Update edges if provided
     if request.edges is not None:
-        edges = []
-        for edge_req in request.edges:
-            edges.append(EdgeData(
-                edge_id=edge_req.edge_id,
-                source_node=edge_req.source_node,
-                source_port=edge_req.source_port,
-                target_node=edge_req.target_node,
-                target_port=edge_req.target_port
-            ).__dict__)
-        db_graph.edges = edges
-    
-    db.commit()
-    db.refresh(db_graph)
-    
-    logger.info(f"Updated graph {db_graph.id}")
+        values["edges"] = _edge_dicts(request.edges)
+    
+    # Write directly and read the new row back in the same statement; the
+    # old JSON columns are never loaded (updated_at comes from onupdate)
+    result = await db.execute(
+        update(Graph).where(Graph.id == graph_id).values(**values).returning(Graph)
+    )
+    db_graph = result.scalar_one()
+    await db.commit()
+    invalidate_graph_data(graph_id)
+    
+    logger.info(f"Updated graph {graph_id}")
     return GraphResponse.model_validate(db_graph)
 
 
 @router.delete("/{graph_identifier}")
 async def delete_graph(
     graph_identifier: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Delete a graph by ID or name."""
-    db_graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph_id = await resolve_graph_pk(graph_identifier, db)
     
-    db.delete(db_graph)
-    db.commit()
+    await db.execute(delete(Graph).where(Graph.id == graph_id))
+    await db.commit()
+    invalidate_graph_data(graph_id)
     
-    logger.info(f"Deleted graph {db_graph.id}")
+    logger.info(f"Deleted graph {graph_id}")
     return {"message": "Graph deleted successfully"}
 
 
 @router.post("/{graph_identifier}/copy", response_model=GraphResponse)
 async def copy_graph(
     graph_identifier: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Create a copy of an existing graph by ID or name."""
     # Get the original graph
-    original_graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    original_graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
+    
+    # Copy the row in-database so the nodes/edges JSON never round-trips
+    # through Python
+    new_id = uuid7()
+    new_name = f"{original_graph.name} (Copy)"
+    now = datetime.utcnow()
+    await db.execute(
+        insert(Graph).from_select(
+            [
+                Graph.id, Graph.name, Graph.description, Graph.nodes, Graph.edges,
+                Graph.meta_data, Graph.input_node_ids, Graph.output_node_ids,
+                Graph.created_by, Graph.created_at, Graph.updated_at
+            ],
+            select(
+                literal(new_id, Graph.id.type),
+                literal(new_name, Graph.name.type),
+                Graph.description,
+                Graph.nodes,
+                Graph.edges,
+                Graph.meta_data,
+                Graph.input_node_ids,
+                Graph.output_node_ids,
+                Graph.created_by,
+                literal(now, Graph.created_at.type),
+                literal(now, Graph.updated_at.type)
+            ).where(Graph.id == original_graph.id)
+        )
+    )
     
-    # Create a new graph with copied data
-    new_graph = Graph(
-        name=f"{original_graph.name} (Copy)",
+    # The copy matches the already-loaded source row apart from the id,
+    # name and timestamps chosen above, so the response needs no re-read
+    response = GraphResponse(
+        id=new_id,
+        name=new_name,
         description=original_graph.description,
         nodes=original_graph.nodes,
         edges=original_graph.edges,
-        meta_data=original_graph.meta_data,
+        metadata=original_graph.meta_data,
+        created_at=now,
+        updated_at=now,
         created_by=original_graph.created_by
     )
+    await db.commit()
     
-    db.add(new_graph)
-    db.commit()
-    db.refresh(new_graph)
-    
-    logger.info(f"Copied graph {original_graph.id} to new graph {new_graph.id}")
-    return GraphResponse.model_validate(new_graph)
+    logger.info(f"Copied graph {original_graph.id} to new graph {new_id}")
+    return response
 
 
 @router.get("/{graph_identifier}/schema")
 async def get_graph_schema(
     graph_identifier: str,
-    db: Session = Depends(get_database)
+    fastapi_request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Get the input/output schema for a graph by ID or name with friendly names."""
-    graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
     
-    # Extract input nodes with their friendly information
-    inputs = []
-    input_nodes = [(node_id, node_data) for node_id, node_data in graph.nodes.items() 
-                   if node_data.get("node_type") == "input"]
+    etag = _graph_etag(graph, f"schema{_SCHEMA_VERSION}")
+    if _etag_matches(fastapi_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     
-    # Sort by node_id for consistent ordinal ordering
-    input_nodes.sort(key=lambda x: x[0])
+    # Input/output node ids are stored with the graph (inputs already sorted
+    # by node_id for consistent ordinal ordering); older rows are scanned
+    input_ids, output_ids = graph.input_node_ids, graph.output_node_ids
+    if input_ids is None or output_ids is None:
+        input_ids, output_ids = _io_node_ids(graph.nodes)
     
-    for i, (node_id, node_data) in enumerate(input_nodes, 1):
-        parameters = node_data.get("parameters", {})
+    nodes = graph.nodes
+    input_nodes = [(node_id, nodes[node_id].get("parameters", {})) for node_id in input_ids]
+    output_nodes = [(node_id, nodes[node_id].get("parameters", {})) for node_id in output_ids]
+    
+    # Extract input nodes with their friendly information
+    inputs = []
+    for i, (node_id, parameters) in enumerate(input_nodes, 1):
         label = parameters.get("label", "").strip()
         default_value = parameters.get("value", "")
         data_type = parameters.get("data_type", "text")
@@ -249,11 +478,7 @@ async def get_graph_schema(
     
     # Extract output nodes
     outputs = []
-    output_nodes = [(node_id, node_data) for node_id, node_data in graph.nodes.items() 
-                    if node_data.get("node_type") == "output"]
-    
-    for node_id, node_data in output_nodes:
-        parameters = node_data.get("parameters", {})
+    for node_id, parameters in output_nodes:
         output_label = parameters.get("label", "Output")
         
         output_info = {
@@ -264,6 +489,14 @@ async def get_graph_schema(
         }
         outputs.append(output_info)
     
+    # Example request inputs: ordinal keys first, then friendly labels
+    example_inputs = {}
+    for inp in inputs:
+        example_inputs[inp["ordinal_key"]] = f"<{inp['description']}>"
+    for inp in inputs:
+        if inp["label"]:
+            example_inputs[inp["label"]] = f"<{inp['description']}>"
+    
     return {
         "graph_id": str(graph.id),
         "graph_name": graph.name,
@@ -274,10 +507,7 @@ async def get_graph_schema(
             "method": "POST",
             "body": {
                 "graph_id": str(graph.id),
-                "inputs": {
-                    **{inp["ordinal_key"]: f"<{inp['description']}>" for inp in inputs},
-                    **{inp["label"]: f"<{inp['description']}>" for inp in inputs if inp["label"]}
-                }
+                "inputs": example_inputs
             }
         }
     }
@@ -287,7 +517,7 @@ async def get_graph_schema(
 async def execute_graph(
     graph_identifier: str,
     request: GraphExecuteRequest,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Execute a graph directly with inputs and get outputs + context tokens."""
     from ..core.executor import GraphExecutor
@@ -296,16 +526,10 @@ async def execute_graph(
     from datetime import datetime
     from uuid import uuid4
     
-    graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
     
-    # Convert to GraphData
-    graph_data = GraphData(
-        graph_id=str(graph.id),
-        name=graph.name,
-        nodes={node_id: NodeData(**node_info) for node_id, node_info in graph.nodes.items()},
-        edges=[EdgeData(**edge_info) for edge_info in graph.edges],
-        meta_data=graph.meta_data or {}
-    )
+    # Convert to GraphData (cached per graph version)
+    graph_data = get_graph_data(graph)
     
     # Execute
     executor = GraphExecutor(BUILTIN_NODES)
@@ -351,10 +575,10 @@ async def execute_graph(
 @router.get("/{graph_identifier}/export")
 async def export_graph(
     graph_identifier: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Export graph as JSON file."""
-    graph = resolve_graph_by_id_or_name(graph_identifier, db)
+    graph = await resolve_graph_by_id_or_name_async(graph_identifier, db)
     
     # Create standardized JSON export format
     export_data = {
@@ -372,7 +596,7 @@ async def export_graph(
     
     # Return as downloadable JSON
     filename = f"{graph.name.replace(' ', '_').lower()}.nodecules.json"
-    return JSONResponse(
+    return ORJSONResponse(
         content=export_data,
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
@@ -384,7 +608,7 @@ async def export_graph(
 @router.post("/import")
 async def import_graph(
     file: UploadFile = File(...),
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Import graph from JSON file."""
     if not file.filename.endswith(('.json', '.nodecules.json')):
@@ -420,35 +644,34 @@ async def import_graph(
         name = original_name
         counter = 1
         
-        while db.query(Graph).filter(Graph.name == name).first():
+        while (await db.execute(select(Graph.id).where(Graph.name == name).limit(1))).first():
             name = f"{original_name} (Imported {counter})"
             counter += 1
         
         # Create database record
+        input_ids, output_ids = _io_node_ids(graph_data["nodes"])
         db_graph = Graph(
             name=name,
             description=graph_data.get("description", ""),
             nodes=graph_data["nodes"],
             edges=graph_data["edges"],
             meta_data=graph_data.get("metadata", {}),
+            input_node_ids=input_ids,
+            output_node_ids=output_ids,
             created_by="import"
         )
         
         db.add(db_graph)
-        db.commit()
-        db.refresh(db_graph)
+        # Build the response from flushed values rather than reloading after commit
+        await db.flush()
+        response = GraphResponse.model_validate(db_graph)
+        await db.commit()
         
-        logger.info(f"Imported graph {db_graph.id}: {db_graph.name}")
-        return GraphResponse.model_validate(db_graph)
+        logger.info(f"Imported graph {response.id}: {response.name}")
+        return response
         
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=400,
             detail="Invalid JSON file"
-        )
-    except Exception as e:
-        logger.error(f"Failed to import graph: {e}")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Import failed: {str(e)}"
         )
\ No newline at end of file
@@ -4,11 +4,11 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from pydantic import BaseModel, Field
 
 from ..models.database import get_database
-from ..core.instance_executor import GraphInstanceExecutor
+from ..core.instance_executor import GraphInstanceExecutor, InstanceBusyError, build_instance_info
 from ..plugins.builtin_nodes import BUILTIN_NODES
 
 router = APIRouter()
@@ -92,9 +92,6 @@ async def create_instance(
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error creating instance: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/{instance_id}", response_model=InstanceResponse)
@@ -127,11 +124,10 @@ async def execute_instance(
         
         return InstanceExecutionResponse.from_execution(execution)
         
+    except InstanceBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error executing instance {instance_id}: {e}")
-        raise HTTPException(status_code=500, detail="Execution failed")
 
 
 @router.post("/{instance_id}/reset", response_model=dict)
@@ -174,14 +170,10 @@ async def list_instances(
     """List all active graph instances."""
     from ..models.instance import GraphInstance
     
-    instances = db.query(GraphInstance).filter(
+    # The response only uses instance columns, so one query covers the page;
+    # raiseload keeps relationship access from turning it back into N+1
+    instances = db.query(GraphInstance).options(raiseload("*")).filter(
         GraphInstance.is_active == True
     ).limit(limit).all()
     
-    result = []
-    for instance in instances:
-        info = instance_executor.get_instance_info(db, instance.instance_id)
-        if info:
-            result.append(InstanceResponse(**info))
-    
-    return result
\ No newline at end of file
+    return [InstanceResponse(**build_instance_info(instance)) for instance in instances]
\ No newline at end of file
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class NodeDataRequest(BaseModel):
@@ -45,36 +45,31 @@ class GraphUpdateRequest(BaseModel):
 
 class GraphResponse(BaseModel):
     """Graph response model."""
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+    
     id: UUID
     name: str
     description: Optional[str]
     nodes: Dict[str, Any]
     edges: List[Any]
-    metadata: Dict[str, Any]
+    # Read from the ORM's meta_data column, serialized as "metadata"
+    metadata: Dict[str, Any] = Field(validation_alias=AliasChoices("meta_data", "metadata"))
+    created_at: datetime
+    updated_at: datetime
+    created_by: Optional[str]
+
+
+class GraphSummaryResponse(BaseModel):
+    """Graph listing entry without the nodes/edges/metadata payload."""
+    id: UUID
+    name: str
+    description: Optional[str]
     created_at: datetime
     updated_at: datetime
     created_by: Optional[str]
 
     class Config:
         from_attributes = True
-        
-    @classmethod
-    def model_validate(cls, obj):
-        # Handle the meta_data -> metadata mapping
-        if hasattr(obj, 'meta_data'):
-            data = {
-                'id': obj.id,
-                'name': obj.name,
-                'description': obj.description,
-                'nodes': obj.nodes,
-                'edges': obj.edges,
-                'metadata': obj.meta_data,  # Map meta_data to metadata
-                'created_at': obj.created_at,
-                'updated_at': obj.updated_at,
-                'created_by': obj.created_by,
-            }
-            return cls(**data)
-        return super().model_validate(obj)
 
 
 class ContextAction(BaseModel):
@@ -1,141 +1,126 @@
 """API routes for plugin and node type information."""
 
 import logging
-from typing import List
-from fastapi import APIRouter, Request
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import TypeAdapter
 
+from ..core.executor import NodeRegistry
+from ..core.types import NodeSpec
 from .models import NodeSpecResponse, PortSpecResponse, ParameterSpecResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_NODE_SPEC_LIST_ADAPTER = TypeAdapter(List[NodeSpecResponse])
 
-@router.get("/nodes", response_model=List[NodeSpecResponse])
+
+def _spec_to_response(spec: NodeSpec) -> NodeSpecResponse:
+    """Convert a node spec to its API response model."""
+    inputs = [
+        PortSpecResponse(
+            name=port.name,
+            data_type=port.data_type.value,
+            required=port.required,
+            default=port.default,
+            description=port.description
+        ) for port in spec.inputs
+    ]
+    
+    outputs = [
+        PortSpecResponse(
+            name=port.name,
+            data_type=port.data_type.value,
+            required=port.required,
+            default=port.default,
+            description=port.description
+        ) for port in spec.outputs
+    ]
+    
+    parameters = [
+        ParameterSpecResponse(
+            name=param.name,
+            data_type=param.data_type,
+            default=param.default,
+            description=param.description,
+            constraints=param.constraints
+        ) for param in spec.parameters
+    ]
+    
+    return NodeSpecResponse(
+        node_type=spec.node_type,
+        display_name=spec.display_name,
+        description=spec.description,
+        category=spec.category,
+        inputs=inputs,
+        outputs=outputs,
+        parameters=parameters
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_node_specs(node_registry: NodeRegistry, registry_version: int) -> Tuple[bytes, Dict[str, bytes]]:
+    """Serialize spec responses for every registered node type.
+    
+    Returns the JSON for the full list and for each node type. Specs are
+    static per class, so this only reruns when the registry version changes.
+    """
+    specs_by_type = {}
+    for node_type in node_registry.list_types():
+        node_class = node_registry.get(node_type)
+        if node_class:
+            try:
+                specs_by_type[node_type] = _spec_to_response(node_class.class_spec())
+            except Exception as e:
+                logger.error(f"Failed to create instance for node type {node_type}: {e}")
+    
+    list_json = _NODE_SPEC_LIST_ADAPTER.dump_json(list(specs_by_type.values()))
+    json_by_type = {node_type: spec.model_dump_json().encode() for node_type, spec in specs_by_type.items()}
+    return list_json, json_by_type
+
+
+def _get_node_specs(request: Request) -> Tuple[bytes, Dict[str, bytes]]:
+    """Get the cached spec JSON for the app's node registry."""
+    node_registry = request.app.state.node_registry
+    return _build_node_specs(node_registry, node_registry.version)
+
+
+@router.get(
+    "/nodes",
+    response_model=None,
+    responses={200: {"model": List[NodeSpecResponse]}}
+)
 async def get_available_nodes(request: Request):
     """Get all available node types."""
     try:
-        node_registry = request.app.state.node_registry
-        node_specs = []
-        
-        # Get specs from all registered node types
-        for node_type in node_registry.list_types():
-            node_class = node_registry.get(node_type)
-            if node_class:
-                try:
-                    instance = node_class()
-                    node_specs.append(instance.spec)
-                except Exception as e:
-                    logger.error(f"Failed to create instance for node type {node_type}: {e}")
-        
-        # Convert to response format
-        response_specs = []
-        for spec in node_specs:
-            inputs = [
-                PortSpecResponse(
-                    name=port.name,
-                    data_type=port.data_type.value,
-                    required=port.required,
-                    default=port.default,
-                    description=port.description
-                ) for port in spec.inputs
-            ]
-            
-            outputs = [
-                PortSpecResponse(
-                    name=port.name,
-                    data_type=port.data_type.value,
-                    required=port.required,
-                    default=port.default,
-                    description=port.description
-                ) for port in spec.outputs
-            ]
-            
-            parameters = [
-                ParameterSpecResponse(
-                    name=param.name,
-                    data_type=param.data_type,
-                    default=param.default,
-                    description=param.description,
-                    constraints=param.constraints
-                ) for param in spec.parameters
-            ]
-            
-            response_specs.append(NodeSpecResponse(
-                node_type=spec.node_type,
-                display_name=spec.display_name,
-                description=spec.description,
-                category=spec.category,
-                inputs=inputs,
-                outputs=outputs,
-                parameters=parameters
-            ))
-        
-        return response_specs
+        list_json, _ = _get_node_specs(request)
+        return Response(content=list_json, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to get available nodes: {e}")
         return []
 
 
-@router.get("/nodes/{node_type}", response_model=NodeSpecResponse)
+@router.get(
+    "/nodes/{node_type}",
+    response_model=None,
+    responses={200: {"model": NodeSpecResponse}}
+)
 async def get_node_spec(node_type: str, request: Request):
     """Get specification for a specific node type."""
     try:
-        node_registry = request.app.state.node_registry
-        node_class = node_registry.get(node_type)
-        
-        if node_class:
-            try:
-                instance = node_class()
-                spec = instance.spec
-                inputs = [
-                    PortSpecResponse(
-                        name=port.name,
-                        data_type=port.data_type.value,
-                        required=port.required,
-                        default=port.default,
-                        description=port.description
-                    ) for port in spec.inputs
-                ]
-                
-                outputs = [
-                    PortSpecResponse(
-                        name=port.name,
-                        data_type=port.data_type.value,
-                        required=port.required,
-                        default=port.default,
-                        description=port.description
-                    ) for port in spec.outputs
-                ]
-                
-                parameters = [
-                    ParameterSpecResponse(
-                        name=param.name,
-                        data_type=param.data_type,
-                        default=param.default,
-                        description=param.description,
-                        constraints=param.constraints
-                    ) for param in spec.parameters
-                ]
-                
-                return NodeSpecResponse(
-                    node_type=spec.node_type,
-                    display_name=spec.display_name,
-                    description=spec.description,
-                    category=spec.category,
-                    inputs=inputs,
-                    outputs=outputs,
-                    parameters=parameters
-                )
-            except Exception as e:
-                logger.error(f"Failed to create instance for node type {node_type}: {e}")
-                from fastapi import HTTPException
-                raise HTTPException(status_code=500, detail=str(e))
-        
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail=f"Node type '{node_type}' not found")
-        
+        _, json_by_type = _get_node_specs(request)
     except Exception as e:
         logger.error(f"Failed to get node spec for {node_type}: {e}")
-        from fastapi import HTTPException
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    spec_json = json_by_type.get(node_type)
+    if spec_json is not None:
+        return Response(content=spec_json, media_type="application/json")
+    
+    if request.app.state.node_registry.get(node_type):
+        # Registered, but its spec could not be built (logged above)
+        raise HTTPException(status_code=500, detail=f"Failed to create instance for node type {node_type}")
+    
+    raise HTTPException(status_code=404, detail=f"Node type '{node_type}' not found")
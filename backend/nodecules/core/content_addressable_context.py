@@ -1,17 +1,43 @@
 """Content-addressable immutable context system."""
 
-import hashlib
-import json
-import redis
+import asyncio
+import logging
+import msgspec
+import xxhash
+import zstandard
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy.orm import Session
+from redis import asyncio as aioredis
 
-from ..models.database import get_database
-from sqlalchemy import Column, String, JSON, DateTime, Text, create_engine
+from ..models.database import AsyncSessionLocal
+from sqlalchemy import Column, String, JSON, DateTime, LargeBinary, Text, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from ..models.database import Base
 
+logger = logging.getLogger(__name__)
+
+# One bounded pool shared by every manager, so connections are reused across
+# requests instead of each client opening its own
+_REDIS_POOL = aioredis.ConnectionPool(
+    host='localhost', port=6379, db=1, max_connections=32
+)
+
+# Messages are stored as zstd-compressed MessagePack, in Postgres and Redis alike
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+
+def pack_blob(value: Any) -> bytes:
+    """Serialize a value to a compressed MessagePack blob."""
+    return _ZSTD_COMPRESSOR.compress(msgspec.msgpack.encode(value))
+
+
+def unpack_blob(blob: bytes) -> Any:
+    """Inverse of pack_blob."""
+    return msgspec.msgpack.decode(_ZSTD_DECOMPRESSOR.decompress(blob))
+
 
 class ImmutableContext(Base):
     """Immutable context storage - content addressable."""
@@ -19,9 +45,9 @@ class ImmutableContext(Base):
     __tablename__ = "immutable_contexts"
     
     context_key = Column(String(16), primary_key=True)  # 64-bit hex key
-    messages = Column(JSON, nullable=False)  # Message history
+    messages = Column(LargeBinary, nullable=False)  # Message history (pack_blob)
     context_metadata = Column(JSON, nullable=False, default=dict)
-    content_hash = Column(String(64), nullable=False, index=True)  # Full SHA256 for verification
+    content_hash = Column(String(64), nullable=False, index=True)  # Full content hash for verification
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_accessed = Column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -29,32 +55,93 @@ class ImmutableContext(Base):
 class ContentAddressableContextManager:
     """Manages immutable, content-addressable contexts."""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
-        self.redis = redis_client or redis.Redis(host='localhost', port=6379, db=1, decode_responses=True)
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
+        self.redis = redis_client or aioredis.Redis(connection_pool=_REDIS_POOL)
         self.cache_ttl = 86400  # 24 hours cache
+        # Hash state after each recently keyed message list, so extending a
+        # context only hashes the appended messages
+        self._hasher_cache: "OrderedDict[str, xxhash.xxh3_128]" = OrderedDict()
+        self._hasher_cache_size = 1024
+        # Messages of recently stored or loaded contexts; these are the chains
+        # being extended, so extend_context can skip the cache/DB round trip
+        self._recent_contexts: "OrderedDict[str, List[Dict[str, str]]]" = OrderedDict()
+        self._recent_contexts_size = 256
+        # Keys read since the last flush; last_accessed is written in batches
+        self._pending_access: set = set()
+        self._access_flush_interval = 5.0  # seconds
+        self._access_flush_task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def _field_bytes(value: Any) -> bytes:
+        """Type-tagged bytes for one message field."""
+        if isinstance(value, str):
+            return b"s" + value.encode()
+        if value is None:
+            return b"n"
+        # Structured content (e.g. content blocks), with stable key order
+        return b"j" + msgspec.json.encode(value, order="sorted")
+    
+    @classmethod
+    def _hash_messages(cls, hasher: "xxhash.xxh3_128", messages: List[Dict[str, str]]) -> None:
+        """Feed each message's fields into the hasher, in order."""
+        # Every field is length-prefixed, so no content can forge a field
+        # boundary, and the digest of a prefix stays reusable when messages
+        # are appended
+        update = hasher.update
+        field_bytes = cls._field_bytes
+        for msg in messages:
+            for value in (msg.get("role"), msg.get("content")):
+                data = field_bytes(value)
+                update(len(data).to_bytes(8, "big"))
+                update(data)
+    
+    def _finish_key(self, hasher: "xxhash.xxh3_128") -> Tuple[str, str]:
+        """Derive the context key from a hasher and remember its state."""
+        full_hash = hasher.hexdigest()
+        context_key = full_hash[:16]  # 64-bit key
+        
+        self._hasher_cache[context_key] = hasher
+        self._hasher_cache.move_to_end(context_key)
+        if len(self._hasher_cache) > self._hasher_cache_size:
+            self._hasher_cache.popitem(last=False)
+        
+        return context_key, full_hash
+    
+    def _remember_messages(self, context_key: str, messages: List[Dict[str, str]]) -> None:
+        """Keep a context's messages in the recent-contexts LRU."""
+        self._recent_contexts[context_key] = messages
+        self._recent_contexts.move_to_end(context_key)
+        if len(self._recent_contexts) > self._recent_contexts_size:
+            self._recent_contexts.popitem(last=False)
     
     def generate_context_key(self, messages: List[Dict[str, str]]) -> Tuple[str, str]:
         """Generate content-addressable key for messages.
         
         Returns:
-            (context_key, full_hash) - 16 char key and full 64 char hash
+            (context_key, full_hash) - 16 char key and full 32 char XXH3-128 hash
         """
-        # Normalize messages for consistent hashing
-        normalized = []
-        for msg in messages:
-            normalized.append({
-                "role": msg.get("role", ""),
-                "content": msg.get("content", "")
-            })
-        
-        # Create deterministic JSON
-        content = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+        hasher = xxhash.xxh3_128()
+        self._hash_messages(hasher, messages)
+        return self._finish_key(hasher)
+    
+    def extend_context_key(
+        self,
+        base_key: str,
+        base_messages: List[Dict[str, str]],
+        new_messages: List[Dict[str, str]]
+    ) -> Tuple[str, str]:
+        """Generate the key for base_messages + new_messages.
         
-        # Generate hashes
-        full_hash = hashlib.sha256(content.encode()).hexdigest()
-        context_key = full_hash[:16]  # 64-bit key
+        Reuses the cached hash state for base_key when available, so only the
+        new messages are hashed.
+        """
+        base_hasher = self._hasher_cache.get(base_key)
+        if base_hasher is None:
+            return self.generate_context_key(base_messages + new_messages)
         
-        return context_key, full_hash
+        hasher = base_hasher.copy()
+        self._hash_messages(hasher, new_messages)
+        return self._finish_key(hasher)
     
     async def store_context(
         self, 
@@ -63,12 +150,16 @@ class ContentAddressableContextManager:
     ) -> str:
         """Store immutable context and return key."""
         context_key, full_hash = self.generate_context_key(messages)
-        
-        # Check if already exists (immutable, so no need to update)
-        if await self.context_exists(context_key):
-            await self._update_access_time(context_key)
-            return context_key
-        
+        return await self._store_context(context_key, full_hash, messages, metadata)
+    
+    async def _store_context(
+        self,
+        context_key: str,
+        full_hash: str,
+        messages: List[Dict[str, str]],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Store messages under an already computed key."""
         # Store in cache
         cache_data = {
             "messages": messages,
@@ -79,28 +170,30 @@ class ContentAddressableContextManager:
         
         cache_key = f"ctx:{context_key}"
         try:
-            self.redis.setex(cache_key, self.cache_ttl, json.dumps(cache_data))
+            # NX: contexts are immutable, so never replace an existing entry
+            await self.redis.set(cache_key, pack_blob(cache_data), ex=self.cache_ttl, nx=True)
         except:
             pass  # Cache failure shouldn't break functionality
         
-        # Store in database
-        db = next(get_database())
-        try:
-            context = ImmutableContext(
-                context_key=context_key,
-                messages=messages,
-                context_metadata=metadata or {},
-                content_hash=full_hash
-            )
-            
-            db.merge(context)  # merge handles duplicates gracefully
-            db.commit()
-            
-        except Exception as e:
-            # If it's a duplicate key, that's fine (immutable contexts)
-            db.rollback()
-        finally:
-            db.close()
+        # Store in database; an existing context only has its access time
+        # bumped (immutable, so nothing else to update)
+        now = datetime.utcnow()
+        stmt = pg_insert(ImmutableContext).values(
+            context_key=context_key,
+            messages=pack_blob(messages),
+            context_metadata=metadata or {},
+            content_hash=full_hash,
+            created_at=now,
+            last_accessed=now
+        ).on_conflict_do_update(
+            index_elements=[ImmutableContext.context_key],
+            set_={"last_accessed": now}
+        )
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+        
+        self._remember_messages(context_key, list(messages))
         
         return context_key
     
@@ -109,24 +202,27 @@ class ContentAddressableContextManager:
         # Try cache first
         cache_key = f"ctx:{context_key}"
         try:
-            cached = self.redis.get(cache_key)
+            # Read and refresh the TTL in one round trip
+            async with self.redis.pipeline() as pipe:
+                pipe.get(cache_key)
+                pipe.expire(cache_key, self.cache_ttl)
+                cached, _ = await pipe.execute()
             if cached:
-                data = json.loads(cached)
+                data = unpack_blob(cached)
                 await self._update_access_time(context_key)
+                # Copied, so callers changing the history can't reach the LRU
+                self._remember_messages(context_key, list(data["messages"]))
                 return data
         except:
             pass
         
         # Load from database
-        db = next(get_database())
-        try:
-            context = db.query(ImmutableContext).filter(
-                ImmutableContext.context_key == context_key
-            ).first()
+        async with AsyncSessionLocal() as db:
+            context = await db.get(ImmutableContext, context_key)
             
             if context:
                 data = {
-                    "messages": context.messages,
+                    "messages": unpack_blob(context.messages),
                     "metadata": context.context_metadata,
                     "full_hash": context.content_hash,
                     "created_at": context.created_at.isoformat()
@@ -134,40 +230,41 @@ class ContentAddressableContextManager:
                 
                 # Update cache
                 try:
-                    self.redis.setex(cache_key, self.cache_ttl, json.dumps(data))
+                    await self.redis.setex(cache_key, self.cache_ttl, pack_blob(data))
                 except:
                     pass
                 
-                # Update access time
-                context.last_accessed = datetime.utcnow()
-                db.commit()
+                # Update access time (batched; no commit on the read path)
+                await self._update_access_time(context_key)
                 
+                self._remember_messages(context_key, list(data["messages"]))
                 return data
             
             return None
-            
-        finally:
-            db.close()
     
     async def context_exists(self, context_key: str) -> bool:
         """Check if context exists."""
         # Check cache first
         cache_key = f"ctx:{context_key}"
         try:
-            if self.redis.exists(cache_key):
+            # Probe and refresh the TTL of a hit in one round trip
+            async with self.redis.pipeline() as pipe:
+                pipe.exists(cache_key)
+                pipe.expire(cache_key, self.cache_ttl)
+                exists, _ = await pipe.execute()
+            if exists:
                 return True
         except:
             pass
         
         # Check database
-        db = next(get_database())
-        try:
-            exists = db.query(ImmutableContext).filter(
-                ImmutableContext.context_key == context_key
-            ).first() is not None
-            return exists
-        finally:
-            db.close()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ImmutableContext.context_key)
+                .where(ImmutableContext.context_key == context_key)
+                .limit(1)
+            )
+            return result.first() is not None
     
     async def extend_context(
         self, 
@@ -183,31 +280,57 @@ class ContentAddressableContextManager:
         Returns:
             New context key for extended conversation
         """
-        # Load base context
-        base_context = await self.load_context(base_key) if base_key else None
-        base_messages = base_context["messages"] if base_context else []
+        # Load base context, unless it was stored or loaded recently
+        base_messages = []
+        if base_key:
+            base_messages = self._recent_contexts.get(base_key)
+            if base_messages is None:
+                base_context = await self.load_context(base_key)
+                base_messages = base_context["messages"] if base_context else []
+            else:
+                # Skipping the load shouldn't skip the access-time bump
+                await self._update_access_time(base_key)
         
         # Create extended message list
         extended_messages = base_messages + new_messages
         
+        # Hash only the appended messages when the base state is cached
+        context_key, full_hash = self.extend_context_key(base_key, base_messages, new_messages)
+        
         # Store and return new key
-        return await self.store_context(extended_messages)
+        return await self._store_context(context_key, full_hash, extended_messages)
     
     async def _update_access_time(self, context_key: str):
-        """Update last accessed time for context."""
-        db = next(get_database())
+        """Queue a last-accessed update for context; written on the next flush."""
+        self._pending_access.add(context_key)
+        if self._access_flush_task is None:
+            self._access_flush_task = asyncio.create_task(self._flush_access_times_later())
+    
+    async def _flush_access_times_later(self):
+        """Wait for the flush interval, then write queued access times."""
         try:
-            context = db.query(ImmutableContext).filter(
-                ImmutableContext.context_key == context_key
-            ).first()
-            
-            if context:
-                context.last_accessed = datetime.utcnow()
-                db.commit()
-        except:
-            db.rollback()
+            await asyncio.sleep(self._access_flush_interval)
         finally:
-            db.close()
+            self._access_flush_task = None
+        await self.flush_access_times()
+    
+    async def flush_access_times(self):
+        """Write last_accessed for every queued context in one UPDATE."""
+        if not self._pending_access:
+            return
+        keys, self._pending_access = self._pending_access, set()
+        
+        async with AsyncSessionLocal() as db:
+            try:
+                await db.execute(
+                    update(ImmutableContext)
+                    .where(ImmutableContext.context_key.in_(keys))
+                    .values(last_accessed=datetime.utcnow())
+                )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Failed to update access time for {len(keys)} contexts: {e}")
 
 
 # Global instance
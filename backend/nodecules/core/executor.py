@@ -2,15 +2,18 @@
 
 import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, AsyncGenerator
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, AsyncGenerator
 
 from .graph import GraphExecutionPlanner
-from .types import BaseNode, ExecutionContext, GraphData, NodeStatus
+from .types import BaseNode, ExecutionContext, GraphData, NodeData, NodeStatus
 
 
 logger = logging.getLogger(__name__)
 
+_STREAM_DONE = object()
+
 
 class ExecutionError(Exception):
     """Raised when execution fails."""
@@ -20,8 +23,87 @@ class ExecutionError(Exception):
 class GraphExecutor:
     """Executes graphs using topological sort."""
     
-    def __init__(self, node_registry: Dict[str, type[BaseNode]]):
+    # Node types that always run through the streaming path
+    STREAMING_NODE_TYPES = frozenset({"immutable_chat", "smart_chat"})
+    
+    def __init__(
+        self, 
+        node_registry: Dict[str, type[BaseNode]], 
+        max_concurrency: int = 16
+    ):
         self.node_registry = node_registry
+        # Upper bound on nodes running at once within a single execution
+        self.max_concurrency = max_concurrency
+        # One shared instance per stateless node type
+        self._node_instances: Dict[str, BaseNode] = {}
+        
+    def _get_node_instance(self, node_type: str) -> BaseNode:
+        """Get an instance of a node type, reusing it when the node is stateless."""
+        node_instance = self._node_instances.get(node_type)
+        if node_instance is not None:
+            return node_instance
+        
+        if node_type not in self.node_registry:
+            raise ExecutionError(f"Unknown node type: {node_type}")
+            
+        node_instance = self.node_registry[node_type]()
+        if node_instance.stateless:
+            self._node_instances[node_type] = node_instance
+        return node_instance
+        
+    async def _execute_when_ready(
+        self, 
+        context: ExecutionContext, 
+        execution_order: List[str], 
+        run_node: Callable[[str], Awaitable[None]]
+    ) -> None:
+        """Run each node as soon as all of its dependencies have completed.
+        
+        Independent nodes overlap instead of waiting on each other in
+        topological order. The first failure cancels the nodes still running
+        and is re-raised.
+        """
+        # Dependencies between nodes of this graph, counted once per node pair
+        parents = {node_id: set() for node_id in execution_order}
+        children = defaultdict(list)
+        for edge in context.graph.edges:
+            node_parents = parents.get(edge.target_node)
+            if node_parents is not None and edge.source_node not in node_parents:
+                node_parents.add(edge.source_node)
+                children[edge.source_node].append(edge.target_node)
+        pending = {node_id: len(node_parents) for node_id, node_parents in parents.items()}
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running: Dict[asyncio.Task, str] = {}
+        
+        async def run_limited(node_id: str) -> None:
+            async with semaphore:
+                await run_node(node_id)
+        
+        def launch(node_id: str) -> None:
+            running[asyncio.create_task(run_limited(node_id))] = node_id
+        
+        for node_id in execution_order:
+            if pending[node_id] == 0:
+                launch(node_id)
+                
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    task.result()
+                    
+                    # Start every successor whose last dependency just finished
+                    for child in children[node_id]:
+                        pending[child] -= 1
+                        if pending[child] == 0:
+                            launch(child)
+        finally:
+            if running:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
         
     async def execute_graph(self, graph: GraphData, inputs: Optional[Dict[str, Any]] = None) -> ExecutionContext:
         """Execute a complete graph."""
@@ -42,9 +124,10 @@ class GraphExecutor:
             
             logger.info(f"Executing graph {graph.graph_id} with {len(execution_order)} nodes")
             
-            # Execute nodes in order
-            for node_id in execution_order:
-                await self._execute_node(context, node_id)
+            # Execute nodes as their dependencies complete
+            await self._execute_when_ready(
+                context, execution_order, lambda node_id: self._execute_node(context, node_id)
+            )
                 
             context.completed_at = datetime.utcnow()
             logger.info(f"Graph {graph.graph_id} execution completed")
@@ -68,9 +151,10 @@ class GraphExecutor:
             
             logger.info(f"Executing graph {context.graph.graph_id} with {len(execution_order)} nodes")
             
-            # Execute nodes in order
-            for node_id in execution_order:
-                await self._execute_node(context, node_id)
+            # Execute nodes as their dependencies complete
+            await self._execute_when_ready(
+                context, execution_order, lambda node_id: self._execute_node(context, node_id)
+            )
                 
             context.completed_at = datetime.utcnow()
             logger.info(f"Graph {context.graph.graph_id} execution completed")
@@ -100,13 +184,26 @@ class GraphExecutor:
             
             logger.info(f"Executing graph {graph.graph_id} with {len(batches)} batches")
             
-            # Execute batches sequentially, nodes within batches in parallel
+            # Execute batches sequentially, nodes within batches in parallel,
+            # bounded like the dependency-driven scheduler
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def run_limited(node_id: str) -> None:
+                async with semaphore:
+                    await self._execute_node(context, node_id)
+            
             for batch_idx, batch in enumerate(batches):
                 logger.info(f"Executing batch {batch_idx + 1}/{len(batches)} with {len(batch)} nodes")
                 
-                # Execute all nodes in batch concurrently
-                tasks = [self._execute_node(context, node_id) for node_id in batch]
-                await asyncio.gather(*tasks)
+                # Execute all nodes in batch concurrently; a failure cancels
+                # the rest of the batch instead of leaving it running
+                tasks = [asyncio.create_task(run_limited(node_id)) for node_id in batch]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
                 
             context.completed_at = datetime.utcnow()
             logger.info(f"Graph {graph.graph_id} execution completed")
@@ -124,31 +221,16 @@ class GraphExecutor:
         
         try:
             context.set_node_status(node_id, NodeStatus.RUNNING)
-            logger.debug(f"Executing node {node_id} ({node_data.node_type})")
+            logger.debug("Executing node %s (%s)", node_id, node_data.node_type)
             
             # Get node implementation
-            if node_data.node_type not in self.node_registry:
-                raise ExecutionError(f"Unknown node type: {node_data.node_type}")
-                
-            node_class = self.node_registry[node_data.node_type]
-            node_instance = node_class()
+            node_instance = self._get_node_instance(node_data.node_type)
             
             # Collect inputs from connected nodes
-            inputs = {}
-            for port in node_instance.spec.inputs:
-                value = context.get_input_value(node_id, port.name)
-                logger.debug(f"Node {node_id} port {port.name}: value={value}, required={port.required}")
-                if value is not None:
-                    inputs[port.name] = value
-                elif port.required and port.default is not None:
-                    inputs[port.name] = port.default
-                    
-            logger.debug(f"Node {node_id} collected inputs: {inputs}")
-            logger.debug(f"Node {node_id} required ports: {[p.name for p in node_instance.spec.inputs if p.required]}")
+            inputs, missing_required = self._collect_inputs(context, node_id, node_instance)
                     
             # Validate inputs
             if not node_instance.validate_inputs(inputs):
-                missing_required = [p.name for p in node_instance.spec.inputs if p.required and p.name not in inputs]
                 raise ExecutionError(f"Invalid inputs for node {node_id}. Missing required inputs: {missing_required}")
                 
             # Execute node
@@ -159,7 +241,7 @@ class GraphExecutor:
                 context.set_node_output(node_id, port_name, value)
                 
             context.set_node_status(node_id, NodeStatus.COMPLETED)
-            logger.debug(f"Node {node_id} completed successfully")
+            logger.debug("Node %s completed successfully", node_id)
             
         except Exception as e:
             context.set_node_status(node_id, NodeStatus.FAILED)
@@ -167,14 +249,47 @@ class GraphExecutor:
             logger.error(f"Node {node_id} failed: {e}")
             raise ExecutionError(f"Node {node_id} failed: {e}") from e
     
+    def _collect_inputs(
+        self, 
+        context: ExecutionContext, 
+        node_id: str, 
+        node_instance: BaseNode
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Collect a node's input values and the required ports left without one."""
+        # Checked once so the per-port messages aren't built when DEBUG is off
+        debug = logger.isEnabledFor(logging.DEBUG)
+        inputs = {}
+        missing_required = []
+        
+        for port in node_instance.spec.inputs:
+            value = context.get_input_value(node_id, port.name)
+            if debug:
+                logger.debug("Node %s port %s: value=%s, required=%s", node_id, port.name, value, port.required)
+            if value is not None:
+                inputs[port.name] = value
+            elif port.required:
+                if port.default is not None:
+                    inputs[port.name] = port.default
+                else:
+                    missing_required.append(port.name)
+                    
+        if debug:
+            logger.debug("Node %s collected inputs: %s", node_id, inputs)
+        return inputs, missing_required
+    
     async def execute_graph_streaming(
         self, 
         graph: GraphData, 
-        inputs: Optional[Dict[str, Any]] = None
+        inputs: Optional[Dict[str, Any]] = None,
+        execution_id: str = ""
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Execute a graph with streaming for nodes that support it."""
+        """Execute a graph with streaming for nodes that support it.
+        
+        Each node_complete event carries that node's outputs; the final
+        execution_complete event only identifies the execution.
+        """
         context = ExecutionContext(
-            execution_id="",  # Will be auto-generated
+            execution_id=execution_id,  # Auto-generated when empty
             graph=graph,
             execution_inputs=inputs or {},
             started_at=datetime.utcnow()
@@ -190,41 +305,61 @@ class GraphExecutor:
             
             logger.info(f"Streaming execution of graph {graph.graph_id} with {len(execution_order)} nodes")
             
-            # Execute nodes in order, yielding streaming updates
-            for node_id in execution_order:
+            # Execute nodes as their dependencies complete; nodes running at
+            # the same time push their updates onto one queue
+            events: asyncio.Queue = asyncio.Queue()
+            
+            async def run_node(node_id: str) -> None:
                 node_data = graph.nodes[node_id]
                 
                 # Check if node supports streaming
                 if self._node_supports_streaming(node_data):
                     # Stream this node's execution
                     async for chunk in self._execute_node_streaming(context, node_id):
-                        yield {
+                        await events.put({
                             "type": "node_chunk",
                             "node_id": node_id,
                             "chunk": chunk,
                             "timestamp": datetime.utcnow().isoformat()
-                        }
+                        })
                 else:
                     # Execute normally
                     await self._execute_node(context, node_id)
                     
                 # Yield node completion
-                yield {
+                await events.put({
                     "type": "node_complete",
                     "node_id": node_id,
                     "status": context.node_status.get(node_id, NodeStatus.PENDING).value,
                     "outputs": context.node_outputs.get(node_id, {}),
                     "timestamp": datetime.utcnow().isoformat()
-                }
+                })
+            
+            async def schedule() -> None:
+                try:
+                    await self._execute_when_ready(context, execution_order, run_node)
+                except Exception as e:
+                    await events.put(e)
+                else:
+                    await events.put(_STREAM_DONE)
+            
+            scheduler = asyncio.create_task(schedule())
+            try:
+                while (event := await events.get()) is not _STREAM_DONE:
+                    if isinstance(event, Exception):
+                        raise event
+                    yield event
+            finally:
+                scheduler.cancel()
                 
             context.completed_at = datetime.utcnow()
             logger.info(f"Graph {graph.graph_id} streaming execution completed")
             
-            # Final completion message
+            # Final completion message; outputs were already sent per node
             yield {
                 "type": "execution_complete",
                 "status": "completed",
-                "outputs": context.node_outputs,
+                "execution_id": context.execution_id,
                 "timestamp": context.completed_at.isoformat()
             }
             
@@ -240,14 +375,9 @@ class GraphExecutor:
             raise ExecutionError(f"Graph streaming execution failed: {e}") from e
     
     def _node_supports_streaming(self, node_data) -> bool:
-        """Check if a node supports streaming based on its parameters."""
-        # Check for streaming parameter
-        streaming_param = node_data.parameters.get("streaming", False)
-        
-        # Also check for streaming-capable node types
-        streaming_node_types = {"immutable_chat", "smart_chat"}
-        
-        return (streaming_param or node_data.node_type in streaming_node_types)
+        """Check if a node supports streaming based on its type and parameters."""
+        # Streaming-capable node types, or an explicit streaming parameter
+        return node_data.node_type in self.STREAMING_NODE_TYPES or node_data.parameters.get("streaming", False)
     
     async def _execute_node_streaming(self, context: ExecutionContext, node_id: str) -> AsyncGenerator[str, None]:
         """Execute a node with streaming support."""
@@ -255,31 +385,20 @@ class GraphExecutor:
         
         try:
             context.set_node_status(node_id, NodeStatus.RUNNING)
-            logger.debug(f"Streaming execution of node {node_id} ({node_data.node_type})")
+            logger.debug("Streaming execution of node %s (%s)", node_id, node_data.node_type)
             
             # Get node implementation
-            if node_data.node_type not in self.node_registry:
-                raise ExecutionError(f"Unknown node type: {node_data.node_type}")
-                
-            node_class = self.node_registry[node_data.node_type]
-            node_instance = node_class()
+            node_instance = self._get_node_instance(node_data.node_type)
             
             # Collect inputs from connected nodes
-            inputs = {}
-            for port in node_instance.spec.inputs:
-                value = context.get_input_value(node_id, port.name)
-                if value is not None:
-                    inputs[port.name] = value
-                elif port.required and port.default is not None:
-                    inputs[port.name] = port.default
+            inputs, missing_required = self._collect_inputs(context, node_id, node_instance)
                     
             # Validate inputs
             if not node_instance.validate_inputs(inputs):
-                missing_required = [p.name for p in node_instance.spec.inputs if p.required and p.name not in inputs]
                 raise ExecutionError(f"Invalid inputs for node {node_id}. Missing required inputs: {missing_required}")
                 
             # Check if node has streaming execution method
-            if hasattr(node_instance, 'execute_streaming'):
+            if node_instance._supports_streaming:
                 # Use streaming execution
                 final_outputs = {}
                 async for chunk in node_instance.execute_streaming(context, node_data):
@@ -305,7 +424,7 @@ class GraphExecutor:
                     yield outputs["response"]
                     
             context.set_node_status(node_id, NodeStatus.COMPLETED)
-            logger.debug(f"Node {node_id} streaming completed successfully")
+            logger.debug("Node %s streaming completed successfully", node_id)
             
         except Exception as e:
             context.set_node_status(node_id, NodeStatus.FAILED)
@@ -319,10 +438,13 @@ class NodeRegistry:
     
     def __init__(self):
         self._nodes: Dict[str, type[BaseNode]] = {}
+        # Bumped on every registration so derived caches know to rebuild
+        self.version = 0
         
     def register(self, node_type: str, node_class: type[BaseNode]) -> None:
         """Register a node type."""
         self._nodes[node_type] = node_class
+        self.version += 1
         logger.info(f"Registered node type: {node_type}")
         
     def get(self, node_type: str) -> Optional[type[BaseNode]]:
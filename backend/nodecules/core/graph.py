@@ -1,9 +1,52 @@
 """Graph validation and topological sorting."""
 
-from collections import defaultdict, deque
-from typing import Dict, List, Set, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
 
-from .types import EdgeData, GraphData, NodeData
+from .types import EdgeData, EdgeIndex, GraphData, NodeData
+
+
+# Maximum number of graph structures whose plans are kept in memory
+PLAN_CACHE_SIZE = 256
+
+# (node ids in order, (source, source_port, target, target_port) per edge)
+GraphFingerprint = Tuple[Tuple[str, ...], Tuple[Tuple[str, str, str, str], ...]]
+
+
+@dataclass
+class _GraphPlan:
+    """Planner results for one graph structure, filled in as they are requested."""
+    execution_order: Optional[Tuple[str, ...]] = None
+    batches: Optional[Tuple[Tuple[str, ...], ...]] = None
+
+
+_plan_cache: "OrderedDict[GraphFingerprint, _GraphPlan]" = OrderedDict()
+
+
+def _graph_fingerprint(graph: GraphData) -> GraphFingerprint:
+    """Everything the planner's results depend on, as a hashable key."""
+    return (
+        tuple(graph.nodes),
+        tuple((edge.source_node, edge.source_port, edge.target_node, edge.target_port) for edge in graph.edges)
+    )
+
+
+def _get_plan(graph: GraphData) -> _GraphPlan:
+    """Get the shared plan entry for a graph's structure."""
+    key = _graph_fingerprint(graph)
+    
+    plan = _plan_cache.get(key)
+    if plan is not None:
+        _plan_cache.move_to_end(key)
+        return plan
+    
+    plan = _GraphPlan()
+    _plan_cache[key] = plan
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    
+    return plan
 
 
 class GraphValidationError(Exception):
@@ -11,6 +54,59 @@ class GraphValidationError(Exception):
     pass
 
 
+def topological_sort_with_levels(edge_index: EdgeIndex) -> Tuple[List[str], List[int]]:
+    """Kahn's algorithm over integer node indices.
+    
+    Returns the node ids in topological order and, indexed like
+    edge_index.node_ids, each node's level (one past its deepest
+    dependency). Edges into unknown nodes are ignored; edges from unknown
+    nodes leave their target unresolvable. Raises GraphValidationError if
+    not every node resolves.
+    """
+    node_ids = edge_index.node_ids
+    node_count = len(node_ids)
+    
+    # Flat per-index lists instead of dicts keyed by node id
+    successors = [[] for _ in range(node_count)]
+    in_degree = [0] * node_count
+    for source, target in zip(edge_index.sources, edge_index.targets):
+        if target < 0:
+            continue
+        in_degree[target] += 1
+        if source >= 0:
+            successors[source].append(target)
+            
+    levels = [0] * node_count
+    queue = deque([i for i in range(node_count) if in_degree[i] == 0])
+    order = []
+    
+    while queue:
+        node = queue.popleft()
+        order.append(node_ids[node])
+        
+        # Reduce in-degree of neighbors, pushing their level past ours
+        next_level = levels[node] + 1
+        for neighbor in successors[node]:
+            if levels[neighbor] < next_level:
+                levels[neighbor] = next_level
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+                
+    if len(order) != node_count:
+        raise GraphValidationError("Graph contains cycles")
+        
+    return order, levels
+
+
+def _batches_from_levels(node_ids: Sequence[str], levels: List[int]) -> Tuple[Tuple[str, ...], ...]:
+    """Bucket nodes by level, keeping graph order within each batch."""
+    batches = [[] for _ in range(max(levels, default=-1) + 1)]
+    for node_id, level in zip(node_ids, levels):
+        batches[level].append(node_id)
+    return tuple(tuple(batch) for batch in batches)
+
+
 class GraphValidator:
     """Validates graph structure and dependencies."""
     
@@ -27,12 +123,19 @@ class GraphValidator:
         except GraphValidationError as e:
             errors.append(str(e))
             
-        # Check for orphaned edges
-        node_ids = set(self.graph.nodes.keys())
-        for edge in self.graph.edges:
-            if edge.source_node not in node_ids:
+        errors.extend(self.validate_edges())
+        return len(errors) == 0, errors
+        
+    def validate_edges(self) -> List[str]:
+        """Check edges for missing endpoints and duplicates, without sorting."""
+        errors = []
+        edge_index = self.graph.edge_index
+        
+        # Check for orphaned edges (endpoints already resolved to -1)
+        for edge, source, target in zip(self.graph.edges, edge_index.sources, edge_index.targets):
+            if source < 0:
                 errors.append(f"Edge references non-existent source node: {edge.source_node}")
-            if edge.target_node not in node_ids:
+            if target < 0:
                 errors.append(f"Edge references non-existent target node: {edge.target_node}")
                 
         # Check for duplicate edges
@@ -43,42 +146,12 @@ class GraphValidator:
                 errors.append(f"Duplicate edge: {edge.source_node}.{edge.source_port} -> {edge.target_node}.{edge.target_port}")
             edge_signatures.add(signature)
             
-        return len(errors) == 0, errors
+        return errors
         
     def _topological_sort(self) -> List[str]:
         """Internal topological sort for cycle detection."""
-        # Build adjacency graph
-        graph = defaultdict(list)
-        in_degree = defaultdict(int)
-        
-        # Initialize all nodes with in_degree 0
-        for node_id in self.graph.nodes:
-            in_degree[node_id] = 0
-            
-        # Build graph and calculate in-degrees
-        for edge in self.graph.edges:
-            graph[edge.source_node].append(edge.target_node)
-            in_degree[edge.target_node] += 1
-            
-        # Kahn's algorithm
-        queue = deque([node for node, degree in in_degree.items() if degree == 0])
-        result = []
-        
-        while queue:
-            node = queue.popleft()
-            result.append(node)
-            
-            # Reduce in-degree of neighbors
-            for neighbor in graph[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-                    
-        # Check for cycles
-        if len(result) != len(self.graph.nodes):
-            raise GraphValidationError("Graph contains cycles")
-            
-        return result
+        order, _ = topological_sort_with_levels(self.graph.edge_index)
+        return order
 
 
 class GraphExecutionPlanner:
@@ -87,77 +160,48 @@ class GraphExecutionPlanner:
     def __init__(self, graph: GraphData):
         self.graph = graph
         self.validator = GraphValidator(graph)
+        # Graphs with the same nodes and edges share validation and ordering work
+        self._plan = _get_plan(graph)
         
     def get_execution_order(self) -> List[str]:
         """Get topologically sorted execution order."""
-        is_valid, errors = self.validator.validate()
-        if not is_valid:
-            raise GraphValidationError(f"Invalid graph: {', '.join(errors)}")
+        if self._plan.execution_order is None:
+            # One pass detects cycles and yields both the order and the
+            # parallel batches; only the edge checks run separately
+            edge_index = self.graph.edge_index
+            errors = []
+            try:
+                order, levels = topological_sort_with_levels(edge_index)
+            except GraphValidationError as e:
+                errors.append(str(e))
+            errors.extend(self.validator.validate_edges())
+            if errors:
+                raise GraphValidationError(f"Invalid graph: {', '.join(errors)}")
             
-        return self._topological_sort()
+            self._plan.execution_order = tuple(order)
+            if self._plan.batches is None:
+                self._plan.batches = _batches_from_levels(edge_index.node_ids, levels)
+            
+        return list(self._plan.execution_order)
         
     def get_parallel_batches(self) -> List[List[str]]:
         """Get nodes grouped into parallel execution batches."""
-        # Build dependency graph
-        dependencies = self._build_dependency_graph()
-        
-        # Group nodes by dependency level
-        batches = []
-        processed = set()
-        
-        while len(processed) < len(self.graph.nodes):
-            # Find nodes with no remaining dependencies
-            ready_nodes = []
-            for node_id in self.graph.nodes:
-                if node_id not in processed:
-                    deps = dependencies.get(node_id, set())
-                    if deps.issubset(processed):
-                        ready_nodes.append(node_id)
-                        
-            if not ready_nodes:
-                raise GraphValidationError("Cannot resolve dependencies - possible cycle")
-                
-            batches.append(ready_nodes)
-            processed.update(ready_nodes)
+        if self._plan.batches is None:
+            self._plan.batches = self._compute_parallel_batches()
             
-        return batches
+        return [list(batch) for batch in self._plan.batches]
         
-    def _build_dependency_graph(self) -> Dict[str, Set[str]]:
-        """Build reverse dependency graph (node -> its dependencies)."""
-        dependencies = defaultdict(set)
-        
-        for edge in self.graph.edges:
-            dependencies[edge.target_node].add(edge.source_node)
+    def _compute_parallel_batches(self) -> Tuple[Tuple[str, ...], ...]:
+        """Group nodes by dependency level."""
+        edge_index = self.graph.edge_index
+        try:
+            _, levels = topological_sort_with_levels(edge_index)
+        except GraphValidationError:
+            raise GraphValidationError("Cannot resolve dependencies - possible cycle")
             
-        return dict(dependencies)
+        return _batches_from_levels(edge_index.node_ids, levels)
         
     def _topological_sort(self) -> List[str]:
         """Topological sort using Kahn's algorithm."""
-        # Build adjacency graph
-        graph = defaultdict(list)
-        in_degree = defaultdict(int)
-        
-        # Initialize all nodes with in_degree 0
-        for node_id in self.graph.nodes:
-            in_degree[node_id] = 0
-            
-        # Build graph and calculate in-degrees
-        for edge in self.graph.edges:
-            graph[edge.source_node].append(edge.target_node)
-            in_degree[edge.target_node] += 1
-            
-        # Kahn's algorithm
-        queue = deque([node for node, degree in in_degree.items() if degree == 0])
-        result = []
-        
-        while queue:
-            node = queue.popleft()
-            result.append(node)
-            
-            # Reduce in-degree of neighbors
-            for neighbor in graph[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-                    
-        return result
\ No newline at end of file
+        order, _ = topological_sort_with_levels(self.graph.edge_index)
+        return order
@@ -0,0 +1,89 @@
+"""In-process cache of parsed graph definitions."""
+
+from collections import OrderedDict
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import msgspec
+
+from .types import EdgeData, GraphData, NodeData
+
+
+# Maximum number of graph versions kept in memory
+GRAPH_CACHE_SIZE = 512
+
+# Shared stand-in for missing position/parameters; nodes never mutate either
+_EMPTY_DICT = MappingProxyType({})
+
+_graph_data_cache: "OrderedDict[Tuple[UUID, Optional[datetime]], GraphData]" = OrderedDict()
+
+
+def _build_nodes_and_edges(db_graph: Any) -> Tuple[Dict[str, NodeData], List[EdgeData]]:
+    """Lenient pure-Python conversion for rows msgspec rejects (e.g. null fields)."""
+    # Positional construction skips keyword matching in the dataclass __init__
+    nodes = {}
+    for node_id, node_data in db_graph.nodes.items():
+        nodes[node_id] = NodeData(
+            node_data["node_id"],
+            node_data["node_type"],
+            node_data.get("position") or _EMPTY_DICT,
+            node_data.get("parameters") or _EMPTY_DICT,
+            node_data.get("label"),
+            node_data.get("description")
+        )
+
+    edges = []
+    for edge_data in db_graph.edges:
+        edges.append(EdgeData(
+            edge_data["edge_id"],
+            edge_data["source_node"],
+            edge_data["source_port"],
+            edge_data["target_node"],
+            edge_data["target_port"]
+        ))
+
+    return nodes, edges
+
+
+def build_graph_data(db_graph: Any) -> GraphData:
+    """Convert a database Graph row to an immutable GraphData."""
+    try:
+        # msgspec builds the dataclasses in C, one call per collection
+        nodes = msgspec.convert(db_graph.nodes, Dict[str, NodeData])
+        edges = msgspec.convert(db_graph.edges, List[EdgeData])
+    except msgspec.ValidationError:
+        nodes, edges = _build_nodes_and_edges(db_graph)
+
+    # Cached graphs are shared between executions, so freeze the containers
+    return GraphData(
+        graph_id=str(db_graph.id),
+        name=db_graph.name,
+        nodes=MappingProxyType(nodes),
+        edges=tuple(edges),
+        meta_data=db_graph.meta_data or {}
+    )
+
+
+def get_graph_data(db_graph: Any) -> GraphData:
+    """Get GraphData for a database Graph, reusing the parsed copy if unchanged."""
+    key = (db_graph.id, db_graph.updated_at)
+
+    graph_data = _graph_data_cache.get(key)
+    if graph_data is not None:
+        _graph_data_cache.move_to_end(key)
+        return graph_data
+
+    graph_data = build_graph_data(db_graph)
+    _graph_data_cache[key] = graph_data
+    if len(_graph_data_cache) > GRAPH_CACHE_SIZE:
+        _graph_data_cache.popitem(last=False)
+
+    return graph_data
+
+
+def invalidate_graph_data(graph_id: UUID) -> None:
+    """Drop all cached versions of a graph."""
+    for key in [key for key in _graph_data_cache if key[0] == graph_id]:
+        _graph_data_cache.pop(key, None)
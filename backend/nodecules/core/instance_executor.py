@@ -1,12 +1,18 @@
 """Graph Instance Executor for persistent multi-run execution."""
 
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Optional
-from uuid import uuid4
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID, uuid4
+from redis import asyncio as aioredis
+from redis.exceptions import LockError, RedisError
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
 from .executor import GraphExecutor
+from .graph_cache import GRAPH_CACHE_SIZE, get_graph_data
 from .types import GraphData, ExecutionContext, NodeStatus
 from ..models.database import get_database
 from ..models.schemas import Graph
@@ -14,37 +20,168 @@ from ..models.instance import GraphInstance, InstanceExecution, InstanceStateMan
 
 logger = logging.getLogger(__name__)
 
+# How long an instance run may hold its lock; outlasts the 20 minute LLM
+# request timeout, and frees instances whose worker died mid-run
+INSTANCE_LOCK_TIMEOUT = 1800  # seconds
+
+
+class InstanceBusyError(Exception):
+    """Raised when an instance is already being executed."""
+    pass
+
+
+# Lookups by instance_id, built once; SQLAlchemy reuses their compiled form
+_SELECT_INSTANCE = select(GraphInstance).where(
+    GraphInstance.instance_id == bindparam("instance_id")
+)
+_SELECT_ACTIVE_INSTANCE = _SELECT_INSTANCE.where(GraphInstance.is_active == True)
+# The outer join keeps a missing graph distinguishable from a missing instance
+_SELECT_ACTIVE_INSTANCE_WITH_GRAPH = select(GraphInstance, Graph).outerjoin(
+    Graph, Graph.id == GraphInstance.graph_id
+).where(
+    GraphInstance.instance_id == bindparam("instance_id"),
+    GraphInstance.is_active == True
+)
+# Records a finished run in one UPDATE: merges the changed state keys into
+# the stored state, so a run writes only what it changed, and sets the run
+# bookkeeping; "fetch" refreshes the loaded instance from the returned row
+_RECORD_INSTANCE_RUN = update(GraphInstance).where(
+    GraphInstance.id == bindparam("pk")
+).values(
+    instance_state=GraphInstance.instance_state.op("||")(bindparam("changes", type_=JSONB)),
+    run_count=GraphInstance.run_count + 1,
+    last_executed=bindparam("executed_at"),
+    last_outputs=bindparam("context_keys", type_=GraphInstance.last_outputs.type)
+).execution_options(synchronize_session="fetch")
+
+# The only node outputs a run reads back from the previous one
+CONTEXT_OUTPUT_KEYS = ("context_key", "context_id")
+
+
+def context_outputs(node_outputs: Dict[str, Any], node_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Project the outputs of node_ids down to the context keys the next run injects."""
+    projected = {}
+    for node_id in node_ids:
+        outputs = node_outputs.get(node_id)
+        if isinstance(outputs, dict):
+            keys = {key: outputs[key] for key in CONTEXT_OUTPUT_KEYS if key in outputs}
+            if keys:
+                projected[node_id] = keys
+    return projected
+
+
+_MISSING = object()
+
+
+class _StateOverlay:
+    """Read-through, write-back view of an instance's state for one run.
+    
+    Keys are read from the instance on first access and memoized; writes
+    stay here, with their keys recorded as dirty, until flushed.
+    """
+    
+    __slots__ = ("_base", "_values", "dirty")
+    
+    def __init__(self, base: Optional[Dict[str, Any]]):
+        self._base = base or {}
+        self._values: Dict[str, Any] = {}
+        self.dirty: set = set()
+    
+    def __bool__(self) -> bool:
+        # InstanceStateManager treats an empty state as "use the default";
+        # get() already does that per key
+        return True
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._base.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._values[key] = value
+        return value
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._values[key] = value
+        self.dirty.add(key)
+    
+    def dirty_items(self) -> Dict[str, Any]:
+        """The keys written since the last flush, with their values."""
+        return {key: self._values[key] for key in self.dirty}
+
+
+class _BufferedInstance:
+    """Stand-in for an instance, so InstanceStateManager works on the overlay."""
+    
+    __slots__ = ("instance_state",)
+    
+    def __init__(self, instance_state: _StateOverlay):
+        self.instance_state = instance_state
+
 
 class InstanceExecutionContext(ExecutionContext):
-    """Extended execution context with instance state access."""
+    """Extended execution context with instance state access.
+    
+    State reads are memoized and changes are buffered for the run; the
+    executor collects them once, through take_instance_state_changes().
+    """
     
     def __init__(self, instance: GraphInstance, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.instance = instance
         self.state_manager = InstanceStateManager()
+        self._state = _StateOverlay(instance.instance_state)
+        self._buffered = _BufferedInstance(self._state)
     
     def get_instance_state(self, key: str, default: Any = None) -> Any:
         """Get value from persistent instance state."""
-        return self.state_manager.get_state(self.instance, key, default)
+        return self.state_manager.get_state(self._buffered, key, default)
     
     def set_instance_state(self, key: str, value: Any) -> None:
         """Set value in persistent instance state."""
-        self.state_manager.set_state(self.instance, key, value)
+        self.state_manager.set_state(self._buffered, key, value)
     
     def increment_instance_counter(self, key: str = "default", amount: int = 1) -> int:
         """Increment counter in instance state."""
-        return self.state_manager.increment_counter(self.instance, key, amount)
+        return self.state_manager.increment_counter(self._buffered, key, amount)
     
     def append_to_instance_list(self, key: str, item: Any) -> list:
         """Append to list in instance state."""
-        return self.state_manager.append_to_list(self.instance, key, item)
+        return self.state_manager.append_to_list(self._buffered, key, item)
+    
+    def take_instance_state_changes(self) -> Dict[str, Any]:
+        """The state keys changed since the last call, with their values."""
+        changes = self._state.dirty_items()
+        self._state.dirty.clear()
+        return changes
+
+
+def build_instance_info(instance: GraphInstance) -> Dict[str, Any]:
+    """Build the API view of an already-loaded instance (no DB access)."""
+    return {
+        "instance_id": instance.instance_id,
+        "graph_id": str(instance.graph_id),
+        "name": instance.name,
+        "description": instance.description,
+        "state": instance.instance_state,
+        "run_count": instance.run_count,
+        "created_at": instance.created_at.isoformat(),
+        "last_executed": instance.last_executed.isoformat() if instance.last_executed else None,
+        "last_outputs": instance.last_outputs
+    }
 
 
 class GraphInstanceExecutor:
     """Executor for persistent graph instances."""
     
-    def __init__(self, node_registry: Dict[str, type]):
+    def __init__(self, node_registry: Dict[str, type], redis_client: Optional[aioredis.Redis] = None):
         self.executor = GraphExecutor(node_registry)
+        # Per-instance run locks live in Redis, so they hold across workers
+        self.redis = redis_client or aioredis.Redis(host='localhost', port=6379, db=0)
+        # Whether each node type's spec declares a context output port
+        self._emitter_types: Dict[str, bool] = {}
+        # Context-emitting node ids per graph version, keyed like the graph cache
+        self._emitter_nodes: "OrderedDict[Tuple[UUID, Optional[datetime]], Tuple[str, ...]]" = OrderedDict()
     
     def create_instance(
         self, 
@@ -93,26 +230,69 @@ class GraphInstanceExecutor:
         instance_id: str,
         inputs: Dict[str, Any]
     ) -> InstanceExecution:
-        """Execute a graph instance with persistent state."""
+        """Execute a graph instance with persistent state.
         
-        # Load instance
-        instance = db.query(GraphInstance).filter(
-            GraphInstance.instance_id == instance_id,
-            GraphInstance.is_active == True
-        ).first()
+        Runs of one instance are serialized: a second concurrent run would
+        read the same state and overwrite the first one's updates, so it
+        raises InstanceBusyError instead.
+        """
+        lock = await self._acquire_instance_lock(instance_id)
+        try:
+            return await self._execute_instance(db, instance_id, inputs)
+        finally:
+            await self._release_instance_lock(instance_id, lock)
+    
+    async def _acquire_instance_lock(self, instance_id: str) -> Optional[Any]:
+        """Take the run lock for an instance; None if Redis is unavailable."""
+        lock = self.redis.lock(
+            f"instance_lock:{instance_id}",
+            timeout=INSTANCE_LOCK_TIMEOUT,
+            blocking=False,
+            thread_local=False
+        )
+        try:
+            acquired = await lock.acquire()
+        except RedisError as e:
+            logger.warning(f"Instance lock unavailable, running {instance_id} unlocked: {e}")
+            return None
         
-        if not instance:
+        if not acquired:
+            raise InstanceBusyError(f"Instance is already executing: {instance_id}")
+        return lock
+    
+    async def _release_instance_lock(self, instance_id: str, lock: Optional[Any]) -> None:
+        """Release a run lock, if this run still holds it."""
+        if lock is None:
+            return
+        try:
+            await lock.release()
+        except (LockError, RedisError) as e:
+            logger.warning(f"Failed to release lock for instance {instance_id}: {e}")
+    
+    async def _execute_instance(
+        self,
+        db: Session,
+        instance_id: str,
+        inputs: Dict[str, Any]
+    ) -> InstanceExecution:
+        """Execute a graph instance; the caller holds its run lock."""
+        
+        # Load instance and its graph in one round trip
+        row = db.execute(_SELECT_ACTIVE_INSTANCE_WITH_GRAPH, {"instance_id": instance_id}).first()
+        
+        if not row:
             raise ValueError(f"Instance not found: {instance_id}")
         
-        # Load graph
-        graph = db.query(Graph).filter(Graph.id == instance.graph_id).first()
+        instance, graph = row
         if not graph:
             raise ValueError(f"Graph not found for instance: {instance_id}")
         
         # Convert to GraphData
         graph_data = self._graph_to_data(graph)
+        emitters = self._context_emitters(graph, graph_data)
         
-        # Create execution record
+        # Create execution record; nothing reads the "running" state, so it
+        # is written together with the results in the run's only commit
         execution_id = str(uuid4())
         execution_record = InstanceExecution(
             instance_id=instance.id,
@@ -122,23 +302,24 @@ class GraphInstanceExecutor:
             status="running"
         )
         
-        db.add(execution_record)
-        db.commit()
-        
         try:
             # Inject previous context IDs from last execution
             enhanced_inputs = inputs.copy()
             
-            if instance.last_outputs and instance.run_count > 0:
-                # Find any context keys from previous run and inject them
-                for node_id, node_outputs in instance.last_outputs.items():
-                    if isinstance(node_outputs, dict):
-                        # Handle both old context_id and new context_key
-                        # Store node-specific context keys only - no global bleeding
-                        if 'context_key' in node_outputs:
-                            enhanced_inputs[f"_context_key_{node_id}"] = node_outputs['context_key']
-                        elif 'context_id' in node_outputs:
-                            enhanced_inputs[f"_context_id_{node_id}"] = node_outputs['context_id']
+            last_outputs = instance.last_outputs
+            if last_outputs and instance.run_count > 0:
+                # Find any context keys from previous run and inject them;
+                # only nodes that can emit one need checking
+                for node_id in emitters:
+                    node_outputs = last_outputs.get(node_id)
+                    if not node_outputs:
+                        continue
+                    # Handle both old context_id and new context_key
+                    # Store node-specific context keys only - no global bleeding
+                    if 'context_key' in node_outputs:
+                        enhanced_inputs[f"_context_key_{node_id}"] = node_outputs['context_key']
+                    elif 'context_id' in node_outputs:
+                        enhanced_inputs[f"_context_id_{node_id}"] = node_outputs['context_id']
             
             # Create instance-aware execution context
             context = InstanceExecutionContext(
@@ -153,10 +334,15 @@ class GraphInstanceExecutor:
             logger.info(f"Executing instance {instance_id}, run #{instance.run_count + 1}")
             final_context = await self.executor.execute_graph_with_context(context)
             
-            # Update instance state
-            instance.run_count += 1
-            instance.last_executed = datetime.utcnow()
-            instance.last_outputs = final_context.node_outputs
+            # Update instance state and run bookkeeping in one statement.
+            # Full outputs live on the execution record; the instance only
+            # keeps what the next run injects
+            db.execute(_RECORD_INSTANCE_RUN, {
+                "pk": instance.id,
+                "changes": context.take_instance_state_changes(),
+                "executed_at": datetime.utcnow(),
+                "context_keys": context_outputs(final_context.node_outputs, emitters)
+            })
             
             # Update execution record
             execution_record.outputs = final_context.node_outputs
@@ -165,17 +351,20 @@ class GraphInstanceExecutor:
             execution_record.completed_at = datetime.utcnow()
             execution_record.status = "completed" if not final_context.errors else "failed"
             
+            db.add(execution_record)
             db.commit()
             
             logger.info(f"Instance {instance_id} execution completed")
             return execution_record
             
         except Exception as e:
-            # Update execution record with error
+            # Drop any partial instance updates, but keep a record of the failure
+            db.rollback()
             execution_record.status = "failed"
             execution_record.errors = {"system": str(e)}
             execution_record.completed_at = datetime.utcnow()
             
+            db.add(execution_record)
             db.commit()
             
             logger.error(f"Instance {instance_id} execution failed: {e}")
@@ -183,32 +372,16 @@ class GraphInstanceExecutor:
     
     def get_instance_info(self, db: Session, instance_id: str) -> Optional[Dict[str, Any]]:
         """Get instance information and state."""
-        instance = db.query(GraphInstance).filter(
-            GraphInstance.instance_id == instance_id,
-            GraphInstance.is_active == True
-        ).first()
+        instance = db.execute(_SELECT_ACTIVE_INSTANCE, {"instance_id": instance_id}).scalar_one_or_none()
         
         if not instance:
             return None
         
-        return {
-            "instance_id": instance.instance_id,
-            "graph_id": str(instance.graph_id),
-            "name": instance.name,
-            "description": instance.description,
-            "state": instance.instance_state,
-            "run_count": instance.run_count,
-            "created_at": instance.created_at.isoformat(),
-            "last_executed": instance.last_executed.isoformat() if instance.last_executed else None,
-            "last_outputs": instance.last_outputs
-        }
+        return build_instance_info(instance)
     
     def reset_instance(self, db: Session, instance_id: str, keys: Optional[list] = None) -> bool:
         """Reset instance state (specific keys or all)."""
-        instance = db.query(GraphInstance).filter(
-            GraphInstance.instance_id == instance_id,
-            GraphInstance.is_active == True
-        ).first()
+        instance = db.execute(_SELECT_ACTIVE_INSTANCE, {"instance_id": instance_id}).scalar_one_or_none()
         
         if not instance:
             return False
@@ -230,9 +403,7 @@ class GraphInstanceExecutor:
     
     def delete_instance(self, db: Session, instance_id: str) -> bool:
         """Delete a graph instance."""
-        instance = db.query(GraphInstance).filter(
-            GraphInstance.instance_id == instance_id
-        ).first()
+        instance = db.execute(_SELECT_INSTANCE, {"instance_id": instance_id}).scalar_one_or_none()
         
         if not instance:
             return False
@@ -243,35 +414,36 @@ class GraphInstanceExecutor:
         logger.info(f"Deleted instance {instance_id}")
         return True
     
-    def _graph_to_data(self, graph: Graph) -> GraphData:
-        """Convert database Graph to GraphData."""
-        from ..core.types import GraphData, NodeData, EdgeData
-        
-        # Convert nodes
-        nodes = {}
-        for node_id, node_info in graph.nodes.items():
-            nodes[node_id] = NodeData(
-                node_id=node_info["node_id"],
-                node_type=node_info["node_type"],
-                position=node_info.get("position", {}),
-                parameters=node_info.get("parameters", {})
+    def _emits_context(self, node_type: str) -> bool:
+        """Check whether a node type declares a context_key/context_id output."""
+        emits = self._emitter_types.get(node_type)
+        if emits is None:
+            node_class = self.executor.node_registry.get(node_type)
+            emits = node_class is not None and any(
+                port.name in CONTEXT_OUTPUT_KEYS for port in node_class.class_spec().outputs
             )
+            self._emitter_types[node_type] = emits
+        return emits
+    
+    def _context_emitters(self, graph: Graph, graph_data: GraphData) -> Tuple[str, ...]:
+        """Ids of the graph's context-emitting nodes, computed once per graph version."""
+        key = (graph.id, graph.updated_at)
+        
+        emitters = self._emitter_nodes.get(key)
+        if emitters is not None:
+            self._emitter_nodes.move_to_end(key)
+            return emitters
         
-        # Convert edges
-        edges = []
-        for edge_info in graph.edges:
-            edges.append(EdgeData(
-                edge_id=edge_info["edge_id"],
-                source_node=edge_info["source_node"],
-                source_port=edge_info["source_port"],
-                target_node=edge_info["target_node"],
-                target_port=edge_info["target_port"]
-            ))
+        emitters = tuple(
+            node_id for node_id, node in graph_data.nodes.items() if self._emits_context(node.node_type)
+        )
+        self._emitter_nodes[key] = emitters
+        if len(self._emitter_nodes) > GRAPH_CACHE_SIZE:
+            self._emitter_nodes.popitem(last=False)
         
-        return GraphData(
-            graph_id=str(graph.id),
-            name=graph.name,
-            nodes=nodes,
-            edges=edges,
-            meta_data=graph.meta_data or {}
-        )
\ No newline at end of file
+        return emitters
+    
+    def _graph_to_data(self, graph: Graph) -> GraphData:
+        """Convert database Graph to GraphData, reusing the parsed copy until the graph is edited."""
+        # Keyed by (id, updated_at) and shared with the graph/execution routes
+        return get_graph_data(graph)
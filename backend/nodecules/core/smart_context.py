@@ -1,16 +1,25 @@
 """Smart context management that adapts to provider capabilities."""
 
-import json
-import redis
+import asyncio
+import orjson
+import random
+import zstandard
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
 from uuid import UUID, uuid4
 from abc import ABC, abstractmethod
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, deferred, sessionmaker, undefer
+from redis import asyncio as aioredis
 
-from ..models.database import get_database, Base
-from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, Boolean, create_engine
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from ..models.database import engine, run_db_sync, Base, uuid7
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, bindparam, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+
+
+# Cached contexts are zstd-compressed JSON; histories repeat a lot, and the
+# fastest level already shrinks them several times over
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=1)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
 
 
 class SmartContext(Base):
@@ -18,16 +27,125 @@ class SmartContext(Base):
     
     __tablename__ = "smart_contexts"
     
-    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid7)
     context_id = Column(String(100), unique=True, nullable=False, index=True)
     provider = Column(String(50), nullable=False)
-    provider_context_data = Column(JSON, nullable=True)  # Provider-specific context info
-    messages = Column(JSON, nullable=True)  # Full message history (for non-caching providers)
-    context_metadata = Column(JSON, nullable=False, default=dict)
+    # Provider-specific context info (without messages); loaded only on request
+    provider_context_data = deferred(Column(JSONB, nullable=True))
+    context_metadata = Column(JSONB, nullable=False, default=dict)
     turn_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_updated = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    
+    # The message history lives in smart_context_messages; loaded contexts
+    # carry it as a plain `messages` attribute (see _attach_messages)
+
+
+class SmartContextMessage(Base):
+    """One message of a smart context's history; rows are only ever appended."""
+    
+    __tablename__ = "smart_context_messages"
+    
+    context_id = Column(
+        String(100), ForeignKey("smart_contexts.context_id", ondelete="CASCADE"), primary_key=True
+    )
+    seq = Column(Integer, primary_key=True)  # Position in the history, from 0
+    role = Column(String(20), nullable=False)
+    content = Column(Text, nullable=False)
+
+
+# Provider data keys kept out of the smart_contexts row: the messages have
+# their own table, and the rendered prompt is a cache that grows with them
+_UNSTORED_PROVIDER_KEYS = frozenset({"messages", "_rendered_prefix", "_rendered_count"})
+
+
+def _persisted_provider_data(provider_context_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Provider data as stored on the smart_contexts row."""
+    if provider_context_data is None:
+        return None
+    return {k: v for k, v in provider_context_data.items() if k not in _UNSTORED_PROVIDER_KEYS}
+
+
+def _message_rows(context_id: str, messages: List[Dict[str, Any]], start: int = 0) -> List[SmartContextMessage]:
+    """Rows for messages appended at position start of a context's history."""
+    return [
+        SmartContextMessage(context_id=context_id, seq=start + i, role=msg["role"], content=msg["content"])
+        for i, msg in enumerate(messages)
+    ]
+
+
+def _attach_messages(context: SmartContext, messages: List[Dict[str, Any]]) -> None:
+    """Give a loaded context its history, where callers and adapters expect it."""
+    context.messages = messages
+    context.provider_context_data = {**(context.provider_context_data or {}), "messages": messages}
+
+
+async def _iter_ndjson(response: Any, chunk_size: int = 8192) -> AsyncIterator[Any]:
+    """Parse a streamed NDJSON (newline-delimited JSON) body, skipping blank or malformed lines.
+    
+    Lines are split on the raw bytes and handed straight to orjson, so no
+    str is decoded per line.
+    """
+    buf = bytearray()
+    async for data in response.aiter_bytes(chunk_size):
+        buf.extend(data)
+        start = 0
+        while (newline := buf.find(b"\n", start)) != -1:
+            line = buf[start:newline]
+            start = newline + 1
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+        # Drop the consumed lines once per chunk, keeping any partial line
+        del buf[:start]
+    
+    # A final line without a trailing newline
+    if buf.strip():
+        try:
+            yield orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            pass
+
+
+# Context lookups by context_id, built once; SQLAlchemy reuses their compiled form
+_SELECT_ACTIVE_CONTEXT = select(SmartContext).where(
+    SmartContext.context_id == bindparam("context_id"),
+    SmartContext.is_active == True
+)
+_SELECT_ACTIVE_CONTEXT_WITH_PROVIDER_DATA = _SELECT_ACTIVE_CONTEXT.options(
+    undefer(SmartContext.provider_context_data)
+)
+_SELECT_CONTEXT_MESSAGES = select(SmartContextMessage.role, SmartContextMessage.content).where(
+    SmartContextMessage.context_id == bindparam("context_id")
+).order_by(SmartContextMessage.seq)
+
+
+# Drops the last N messages of a context, deleting only the trimmed rows.
+# Fails (no row returned) unless the context keeps at least one message.
+_REWIND_CONTEXT_SQL = text("""
+    WITH target AS (
+        SELECT c.context_id, max(m.seq) + 1 AS length
+        FROM smart_contexts AS c
+        JOIN smart_context_messages AS m ON m.context_id = c.context_id
+        WHERE c.context_id = :context_id
+          AND c.is_active
+        GROUP BY c.context_id
+        HAVING count(*) > :drop
+    ), trimmed AS (
+        DELETE FROM smart_context_messages AS m
+        USING target AS t
+        WHERE m.context_id = t.context_id
+          AND m.seq >= t.length - :drop
+    )
+    UPDATE smart_contexts AS c
+    SET turn_count = GREATEST(c.turn_count - :steps, 0),
+        last_updated = timezone('utc', now())
+    FROM target AS t
+    WHERE c.context_id = t.context_id
+    RETURNING c.context_id
+""")
 
 
 class ProviderCapabilities:
@@ -63,11 +181,22 @@ class ProviderCapabilities:
     
     @classmethod
     def supports_caching(cls, provider: str) -> bool:
-        return cls.CAPABILITIES.get(provider, {}).get("context_caching", False)
+        return provider in _CACHING_PROVIDERS
     
     @classmethod
     def get_max_context(cls, provider: str) -> int:
-        return cls.CAPABILITIES.get(provider, {}).get("max_context_length", 4000)
+        return _MAX_CONTEXT_LENGTHS.get(provider, 4000)
+
+
+# The capability table is fixed, so flatten the per-call lookups once
+_CACHING_PROVIDERS = frozenset(
+    provider for provider, caps in ProviderCapabilities.CAPABILITIES.items()
+    if caps.get("context_caching", False)
+)
+_MAX_CONTEXT_LENGTHS = {
+    provider: caps.get("max_context_length", 4000)
+    for provider, caps in ProviderCapabilities.CAPABILITIES.items()
+}
 
 
 class BaseProviderAdapter(ABC):
@@ -112,12 +241,38 @@ class BaseProviderAdapter(ABC):
         pass
 
 
+# Ollama prompt prefix per message role; other roles are left out
+_OLLAMA_ROLE_PREFIX = {"system": "System: ", "user": "Human: ", "assistant": "Assistant: "}
+
+
 class OllamaAdapter(BaseProviderAdapter):
     """Ollama adapter - no caching, full message history."""
     
     def __init__(self, base_url: str = "http://host.docker.internal:11434"):
         self.base_url = base_url.rstrip("/")
     
+    @staticmethod
+    def _join_prompt(prefix: str, part: str) -> str:
+        """Append a prompt part, separated the way the full history is."""
+        return f"{prefix}\n\n{part}" if prefix else part
+    
+    def _rendered_prefix(self, context_data: Dict[str, Any], messages: List[Dict[str, Any]]) -> str:
+        """Get the history rendered in Ollama prompt format.
+        
+        Contexts keep the rendering from their last turn, tagged with the
+        message count it covers; it is rebuilt only when the messages were
+        changed some other way (e.g. rewound).
+        """
+        prefix = context_data.get("_rendered_prefix")
+        if prefix is not None and context_data.get("_rendered_count") == len(messages):
+            return prefix
+        
+        return "\n\n".join(
+            _OLLAMA_ROLE_PREFIX[msg["role"]] + msg["content"]
+            for msg in messages
+            if msg["role"] in _OLLAMA_ROLE_PREFIX
+        )
+    
     async def generate_with_context(
         self, 
         context_data: Dict[str, Any], 
@@ -130,25 +285,14 @@ class OllamaAdapter(BaseProviderAdapter):
         import httpx
         
         # Get message history
-        messages = context_data.get("messages", [])
+        history = context_data.get("messages", [])
         
         # Add new user message (make a copy to avoid mutation)
-        messages = messages + [{"role": "user", "content": new_message}]
+        messages = history + [{"role": "user", "content": new_message}]
         
-        # Convert to Ollama prompt format
-        prompt_parts = []
-        for msg in messages:
-            role = msg["role"]
-            content = msg["content"]
-            if role == "system":
-                prompt_parts.append(f"System: {content}")
-            elif role == "user":
-                prompt_parts.append(f"Human: {content}")
-            elif role == "assistant":
-                prompt_parts.append(f"Assistant: {content}")
-        
-        prompt_parts.append("Assistant:")
-        full_prompt = "\n\n".join(prompt_parts)
+        # Convert to Ollama prompt format, reusing the rendered history
+        turn_prefix = self._join_prompt(self._rendered_prefix(context_data, history), f"Human: {new_message}")
+        full_prompt = turn_prefix + "\n\nAssistant:"
         
         # Call Ollama
         async with httpx.AsyncClient(timeout=1200.0) as client:  # 20 minutes
@@ -177,7 +321,9 @@ class OllamaAdapter(BaseProviderAdapter):
         updated_context = {
             "messages": messages,
             "last_model": model,
-            "last_temperature": temperature
+            "last_temperature": temperature,
+            "_rendered_prefix": turn_prefix + f"\n\nAssistant: {ai_response}",
+            "_rendered_count": len(messages)
         }
         
         return ai_response, updated_context
@@ -192,28 +338,16 @@ class OllamaAdapter(BaseProviderAdapter):
     ) -> tuple[Any, Dict[str, Any]]:
         """Generate streaming response with Ollama."""
         import httpx
-        import json
         
         # Get message history
-        messages = context_data.get("messages", [])
+        history = context_data.get("messages", [])
         
         # Add new user message (make a copy to avoid mutation)
-        messages = messages + [{"role": "user", "content": new_message}]
+        messages = history + [{"role": "user", "content": new_message}]
         
-        # Convert to Ollama prompt format
-        prompt_parts = []
-        for msg in messages:
-            role = msg["role"]
-            content = msg["content"]
-            if role == "system":
-                prompt_parts.append(f"System: {content}")
-            elif role == "user":
-                prompt_parts.append(f"Human: {content}")
-            elif role == "assistant":
-                prompt_parts.append(f"Assistant: {content}")
-        
-        prompt_parts.append("Assistant:")
-        full_prompt = "\n\n".join(prompt_parts)
+        # Convert to Ollama prompt format, reusing the rendered history
+        turn_prefix = self._join_prompt(self._rendered_prefix(context_data, history), f"Human: {new_message}")
+        full_prompt = turn_prefix + "\n\nAssistant:"
         
         # Prepare updated context
         updated_context = {
@@ -223,7 +357,7 @@ class OllamaAdapter(BaseProviderAdapter):
         }
         
         async def ollama_stream_generator():
-            full_response = ""
+            response_parts = []
             try:
                 async with httpx.AsyncClient(timeout=1200.0) as client:  # 20 minutes
                     async with client.stream(
@@ -242,31 +376,28 @@ class OllamaAdapter(BaseProviderAdapter):
                             yield f"Ollama error: HTTP {response.status_code}"
                             return
                         
-                        async for line in response.aiter_lines():
-                            if line.strip():
-                                try:
-                                    chunk_data = json.loads(line)
-                                    if "response" in chunk_data:
-                                        text_chunk = chunk_data["response"]
-                                        full_response += text_chunk
-                                        yield text_chunk
-                                    
-                                    # Check if done
-                                    if chunk_data.get("done", False):
-                                        break
-                                        
-                                except json.JSONDecodeError:
-                                    continue
+                        async for chunk_data in _iter_ndjson(response):
+                            if "response" in chunk_data:
+                                text_chunk = chunk_data["response"]
+                                response_parts.append(text_chunk)
+                                yield text_chunk
+                            
+                            # Check if done
+                            if chunk_data.get("done", False):
+                                break
                                     
             except Exception as e:
                 yield f"Streaming error: {str(e)}"
                 return
             
             # Update context with complete response
+            full_response = "".join(response_parts)
             updated_context["messages"].append({
                 "role": "assistant", 
                 "content": full_response
             })
+            updated_context["_rendered_prefix"] = turn_prefix + f"\n\nAssistant: {full_response}"
+            updated_context["_rendered_count"] = len(updated_context["messages"])
         
         return ollama_stream_generator(), updated_context
     
@@ -440,7 +571,7 @@ class AnthropicAdapter(BaseProviderAdapter):
         
         try:
             # Create streaming message
-            full_response = ""
+            response_parts = []
             with client.messages.stream(
                 model=model,
                 max_tokens=max_tokens,
@@ -449,8 +580,9 @@ class AnthropicAdapter(BaseProviderAdapter):
                 messages=conversation_messages
             ) as stream:
                 for text in stream.text_stream:
-                    full_response += text
+                    response_parts.append(text)
                     yield text
+            full_response = "".join(response_parts)
             
             # Update context with complete exchange - yield as final result
             updated_messages = messages.copy()
@@ -481,12 +613,24 @@ class AnthropicAdapter(BaseProviderAdapter):
         }
 
 
+# Contexts are read after commit (to refresh the cache), so don't expire them
+ContextSession = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
 class SmartContextManager:
     """Context manager that adapts to provider capabilities."""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
-        self.redis = redis_client or redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+    def __init__(
+        self, 
+        redis_client: Optional[aioredis.Redis] = None, 
+        session_factory: Optional[sessionmaker] = None
+    ):
+        self.redis = redis_client or aioredis.Redis(host='localhost', port=6379, db=0)
+        self.session_factory = session_factory or ContextSession
         self.cache_ttl = 3600  # 1 hour
+        # In-flight cache writes by context id; reads of a context wait for
+        # its write so they never see the previous turn
+        self._cache_writes: Dict[str, asyncio.Task] = {}
         
         # Provider adapters
         self.adapters = {
@@ -514,31 +658,85 @@ class SmartContextManager:
         
         # Create provider-specific context
         provider_context_data = adapter.create_new_context(system_prompt)
+        messages = provider_context_data.get("messages", [])
         
         # Store in database
-        db = next(get_database())
-        try:
-            smart_context = SmartContext(
-                context_id=context_id,
-                provider=provider,
-                provider_context_data=provider_context_data,
-                messages=provider_context_data.get("messages", []),
-                context_metadata={
-                    "system_prompt": system_prompt,
-                    "supports_caching": ProviderCapabilities.supports_caching(provider)
-                }
-            )
-            
+        smart_context = SmartContext(
+            context_id=context_id,
+            provider=provider,
+            provider_context_data=_persisted_provider_data(provider_context_data),
+            context_metadata={
+                "system_prompt": system_prompt,
+                "supports_caching": ProviderCapabilities.supports_caching(provider)
+            }
+        )
+        await run_db_sync(self._add_context_sync, smart_context, messages)
+        
+        # Cache it
+        _attach_messages(smart_context, messages)
+        self._cache_context(context_id, smart_context)
+        
+        return context_id
+    
+    def _add_context_sync(self, smart_context: SmartContext, messages: List[Dict[str, Any]]) -> None:
+        """Insert a new context with its initial messages (blocking)."""
+        with self.session_factory() as db:
             db.add(smart_context)
+            db.add_all(_message_rows(smart_context.context_id, messages))
             db.commit()
-            
-            # Cache it
-            self._cache_context(context_id, smart_context)
-            
-            return context_id
-            
-        finally:
-            db.close()
+    
+    def _save_context_sync(
+        self,
+        context_id: str,
+        context: SmartContext,
+        messages: List[Dict[str, Any]],
+        stored_count: int,
+        stored_provider_data: Optional[Dict[str, Any]]
+    ) -> int:
+        """Append a turn's new messages and update the context row (blocking).
+        
+        Only messages past stored_count (the history length when the context
+        was loaded) are inserted; earlier ones are already stored, and
+        provider_context_data is only written if it differs from
+        stored_provider_data. The turn count is incremented by the database,
+        so interleaved turns can't lose one; returns the new count.
+        """
+        values = {
+            "turn_count": SmartContext.turn_count + 1,
+            "last_updated": context.last_updated
+        }
+        provider_data = _persisted_provider_data(context.provider_context_data)
+        if provider_data != stored_provider_data:
+            values["provider_context_data"] = provider_data
+        
+        with self.session_factory() as db:
+            db.add_all(_message_rows(context_id, messages[stored_count:], stored_count))
+            turn_count = db.execute(
+                update(SmartContext)
+                .where(SmartContext.context_id == context_id)
+                .values(**values)
+                .returning(SmartContext.turn_count)
+            ).scalar_one()
+            db.commit()
+        
+        return turn_count
+    
+    async def _save_context(
+        self,
+        context_id: str,
+        context: SmartContext,
+        messages: List[Dict[str, Any]],
+        stored_count: int,
+        stored_provider_data: Optional[Dict[str, Any]]
+    ) -> None:
+        """Persist a finished turn, then refresh the cache in the background."""
+        context.turn_count = await run_db_sync(
+            self._save_context_sync, context_id, context, messages, stored_count, stored_provider_data
+        )
+        
+        # Update cache
+        _attach_messages(context, messages)
+        self._cache_context(context_id, context)
     
     async def continue_conversation(
         self,
@@ -559,6 +757,10 @@ class SmartContextManager:
         if not adapter:
             raise ValueError(f"Unsupported provider: {context.provider}")
         
+        # Adapters may extend the history in place, so note what is stored first
+        stored_count = len(context.messages)
+        stored_provider_data = _persisted_provider_data(context.provider_context_data)
+        
         # Generate response
         response, updated_provider_data = await adapter.generate_with_context(
             context.provider_context_data,
@@ -568,23 +770,13 @@ class SmartContextManager:
         )
         
         # Update context in database
+        messages = updated_provider_data.get("messages", context.messages)
         context.provider_context_data = updated_provider_data
-        context.messages = updated_provider_data.get("messages", context.messages)
-        context.turn_count += 1
         context.last_updated = datetime.utcnow()
         
-        db = next(get_database())
-        try:
-            db.merge(context)
-            db.commit()
-            
-            # Update cache
-            self._cache_context(context_id, context)
-            
-            return response, context_id
-            
-        finally:
-            db.close()
+        await self._save_context(context_id, context, messages, stored_count, stored_provider_data)
+        
+        return response, context_id
     
     async def continue_conversation_streaming(
         self,
@@ -605,6 +797,10 @@ class SmartContextManager:
         if not adapter:
             raise ValueError(f"Unsupported provider: {context.provider}")
         
+        # Adapters may extend the history in place, so note what is stored first
+        stored_count = len(context.messages)
+        stored_provider_data = _persisted_provider_data(context.provider_context_data)
+        
         # Generate streaming response
         stream_generator, updated_provider_data = await adapter.generate_with_context_streaming(
             context.provider_context_data,
@@ -619,27 +815,47 @@ class SmartContextManager:
                 yield chunk
             
             # Update context after streaming completes
+            messages = updated_provider_data.get("messages", context.messages)
             context.provider_context_data = updated_provider_data
-            context.messages = updated_provider_data.get("messages", context.messages)
-            context.turn_count += 1
             context.last_updated = datetime.utcnow()
             
-            db = next(get_database())
-            try:
-                db.merge(context)
-                db.commit()
-                
-                # Update cache
-                self._cache_context(context_id, context)
-                
-            finally:
-                db.close()
+            await self._save_context(context_id, context, messages, stored_count, stored_provider_data)
         
         return context_updating_stream(), context_id
     
+    async def rewind_context(self, context_id: str, steps: int = 1) -> bool:
+        """Drop the last `steps` user/assistant exchanges from a context.
+        
+        Only the trimmed message rows are deleted, in the database, so no
+        history travels over the wire. Returns False if the context doesn't
+        exist or has too few messages to rewind that far.
+        """
+        rewound = await run_db_sync(self._rewind_context_sync, context_id, steps)
+        
+        if rewound:
+            # A pending write of the untrimmed context must not land after the delete
+            await self._wait_for_cache_write(context_id)
+            try:
+                await self.redis.delete(self._get_cache_key(context_id))
+            except Exception:
+                pass  # Cache entry will expire on its own
+        
+        return rewound
+    
+    def _rewind_context_sync(self, context_id: str, steps: int) -> bool:
+        """Trim a context's history (blocking)."""
+        with self.session_factory() as db:
+            rewound = db.execute(
+                _REWIND_CONTEXT_SQL,
+                {"context_id": context_id, "steps": steps, "drop": steps * 2}
+            ).first() is not None
+            db.commit()
+        
+        return rewound
+    
     async def get_context_info(self, context_id: str) -> Optional[Dict[str, Any]]:
         """Get context information for external systems."""
-        context = await self._load_context(context_id)
+        context = await self._load_context(context_id, with_provider_data=False)
         if not context:
             return None
         
@@ -654,48 +870,75 @@ class SmartContextManager:
             "metadata": context.metadata
         }
     
-    async def _load_context(self, context_id: str) -> Optional[SmartContext]:
-        """Load context from cache or database."""
+    async def _load_context(self, context_id: str, with_provider_data: bool = True) -> Optional[SmartContext]:
+        """Load context from cache or database.
+        
+        Without with_provider_data, a database load skips the provider data
+        column; such partial contexts are not cached.
+        """
+        await self._wait_for_cache_write(context_id)
+        
         # Try cache first
         cache_key = self._get_cache_key(context_id)
         try:
-            cached_data = self.redis.get(cache_key)
+            cached_data = await self.redis.get(cache_key)
             if cached_data:
-                data = json.loads(cached_data)
+                data = orjson.loads(_ZSTD_DECOMPRESSOR.decompress(cached_data))
                 context = SmartContext()
                 for key, value in data.items():
                     if key in ['created_at', 'last_updated']:
                         setattr(context, key, datetime.fromisoformat(value))
+                    elif key == 'id':
+                        context.id = UUID(value)
                     else:
                         setattr(context, key, value)
+                _attach_messages(context, data["messages"])
                 return context
         except Exception:
             pass
         
-        # Load from database
-        db = next(get_database())
-        try:
-            context = db.query(SmartContext).filter(
-                SmartContext.context_id == context_id,
-                SmartContext.is_active == True
-            ).first()
-            
-            if context:
-                self._cache_context(context_id, context)
+        context = await run_db_sync(self._load_context_sync, context_id, with_provider_data)
+        if context and with_provider_data:
+            # Refill only; a save that landed meanwhile has the newer entry
+            self._cache_context(context_id, context, refill=True)
+        
+        return context
+    
+    def _load_context_sync(self, context_id: str, with_provider_data: bool) -> Optional[SmartContext]:
+        """Load context and its messages from the database (blocking)."""
+        with self.session_factory() as db:
+            params = {"context_id": context_id}
+            stmt = _SELECT_ACTIVE_CONTEXT_WITH_PROVIDER_DATA if with_provider_data else _SELECT_ACTIVE_CONTEXT
+            context = db.execute(stmt, params).scalar_one_or_none()
             
-            return context
+            if not context:
+                return None
             
-        finally:
-            db.close()
+            rows = db.execute(_SELECT_CONTEXT_MESSAGES, params)
+            messages = [{"role": role, "content": content} for role, content in rows]
+        
+        if with_provider_data:
+            _attach_messages(context, messages)
+        else:
+            context.messages = messages
+        
+        return context
     
-    def _cache_context(self, context_id: str, context: SmartContext):
-        """Cache context data."""
+    def _cache_context(self, context_id: str, context: SmartContext, refill: bool = False):
+        """Cache context data without waiting for Redis.
+        
+        The entry is serialized now, so later changes to context don't
+        leak into it; the write itself runs as a background task. A refill
+        (after a read) never replaces an existing entry.
+        """
         try:
             cache_data = {
                 "id": str(context.id),
                 "context_id": context.context_id,
                 "provider": context.provider,
-                "provider_context_data": context.provider_context_data,
+                "provider_context_data": {
+                    k: v for k, v in (context.provider_context_data or {}).items() if k != "messages"
+                },
                 "messages": context.messages,
                 "metadata": context.context_metadata,
                 "turn_count": context.turn_count,
@@ -704,10 +947,33 @@ class SmartContextManager:
                 "is_active": context.is_active
             }
             
-            cache_key = self._get_cache_key(context_id)
-            self.redis.setex(cache_key, self.cache_ttl, json.dumps(cache_data))
+            payload = _ZSTD_COMPRESSOR.compress(orjson.dumps(cache_data))
+        except Exception:
+            return  # Cache failure shouldn't break functionality
+        
+        task = asyncio.create_task(self._write_cache(context_id, payload, refill))
+        self._cache_writes[context_id] = task
+        task.add_done_callback(lambda done: self._forget_cache_write(context_id, done))
+    
+    async def _write_cache(self, context_id: str, payload: bytes, refill: bool = False) -> None:
+        """Store a serialized context in Redis."""
+        # Jitter the TTL so contexts cached together don't all expire together
+        ttl = self.cache_ttl + random.randint(0, self.cache_ttl // 10)
+        try:
+            await self.redis.set(self._get_cache_key(context_id), payload, ex=ttl, nx=refill)
         except Exception:
             pass  # Cache failure shouldn't break functionality
+    
+    def _forget_cache_write(self, context_id: str, task: asyncio.Task) -> None:
+        """Drop a finished write, unless a newer one has replaced it."""
+        if self._cache_writes.get(context_id) is task:
+            del self._cache_writes[context_id]
+    
+    async def _wait_for_cache_write(self, context_id: str) -> None:
+        """Wait for any in-flight cache write of a context."""
+        task = self._cache_writes.get(context_id)
+        if task is not None:
+            await task
 
 
 # Global instance
@@ -1,10 +1,12 @@
 """Core types for the nodecules execution engine."""
 
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 
@@ -29,7 +31,7 @@ class DataType(str, Enum):
     ANY = "any"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PortSpec:
     """Specification for node input/output port."""
     name: str
@@ -39,7 +41,7 @@ class PortSpec:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParameterSpec:
     """Specification for node parameter."""
     name: str
@@ -49,7 +51,7 @@ class ParameterSpec:
     constraints: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResourceRequirement:
     """Resource requirements for node execution."""
     cpu_cores: float = 1.0
@@ -58,7 +60,7 @@ class ResourceRequirement:
     timeout_seconds: int = 300
 
 
-@dataclass 
+@dataclass(slots=True)
 class NodeSpec:
     """Node type specification."""
     node_type: str
@@ -71,7 +73,7 @@ class NodeSpec:
     resource_requirements: ResourceRequirement = field(default_factory=ResourceRequirement)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeData:
     """Runtime node data."""
     node_id: str
@@ -83,10 +85,10 @@ class NodeData:
     
     def __post_init__(self):
         if not self.node_id:
-            self.node_id = str(uuid4())
+            object.__setattr__(self, "node_id", str(uuid4()))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EdgeData:
     """Edge connection data."""
     edge_id: str
@@ -97,7 +99,10 @@ class EdgeData:
     
     def __post_init__(self):
         if not self.edge_id:
-            self.edge_id = f"{self.source_node}_{self.source_port}-{self.target_node}_{self.target_port}"
+            object.__setattr__(
+                self, "edge_id",
+                f"{self.source_node}_{self.source_port}-{self.target_node}_{self.target_port}"
+            )
 
 
 @dataclass
@@ -113,9 +118,51 @@ class GraphData:
     def __post_init__(self):
         if not self.graph_id:
             self.graph_id = str(uuid4())
+            
+    @cached_property
+    def edge_index(self) -> "EdgeIndex":
+        """Edge endpoints as parallel integer arrays over the node order.
+        
+        Built on first use; graphs must not change nodes or edges afterwards.
+        """
+        node_ids = tuple(self.nodes)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        # -1 marks an endpoint that isn't a node of this graph
+        sources = array("i", [index.get(edge.source_node, -1) for edge in self.edges])
+        targets = array("i", [index.get(edge.target_node, -1) for edge in self.edges])
+        return EdgeIndex(node_ids, sources, targets)
+        
+    @cached_property
+    def input_sources(self) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """(source node, source port) feeding each (target node, target port).
+        
+        Built on first use, like edge_index. When several edges feed one
+        port, the first one wins.
+        """
+        sources = {}
+        for edge in self.edges:
+            sources.setdefault((edge.target_node, edge.target_port), (edge.source_node, edge.source_port))
+        return sources
+        
+    @cached_property
+    def input_ordinals(self) -> Dict[str, int]:
+        """1-based position of each input node, ordered by node id.
+        
+        Built on first use, like edge_index.
+        """
+        input_nodes = sorted(node_id for node_id, node in self.nodes.items() if node.node_type == "input")
+        return {node_id: ordinal for ordinal, node_id in enumerate(input_nodes, 1)}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class EdgeIndex:
+    """Structure-of-arrays view of a graph's edges."""
+    node_ids: tuple
+    sources: array
+    targets: array
+
+
+@dataclass(slots=True)
 class ExecutionContext:
     """Runtime execution context."""
     execution_id: str
@@ -134,12 +181,13 @@ class ExecutionContext:
     def get_input_value(self, node_id: str, port_name: str) -> Any:
         """Get input value for a node port from connected outputs."""
         # Find the edge that connects to this input
-        for edge in self.graph.edges:
-            if edge.target_node == node_id and edge.target_port == port_name:
-                # Get the output from the source node
-                source_outputs = self.node_outputs.get(edge.source_node, {})
-                return source_outputs.get(edge.source_port)
-        return None
+        source = self.graph.input_sources.get((node_id, port_name))
+        if source is None:
+            return None
+        
+        # Get the output from the source node
+        source_outputs = self.node_outputs.get(source[0])
+        return source_outputs.get(source[1]) if source_outputs else None
         
     def set_node_output(self, node_id: str, port_name: str, value: Any) -> None:
         """Set output value for a node port."""
@@ -155,12 +203,40 @@ class ExecutionContext:
 class BaseNode(ABC):
     """Abstract base class for all node types."""
     
-    def __init__(self, spec: NodeSpec):
-        self.spec = spec
+    # Spec shared by every instance of the class; nodes whose spec varies
+    # per instance pass one to __init__ instead
+    NODE_SPEC: Optional[NodeSpec] = None
+    
+    # Stateless nodes keep nothing between execute() calls, so the executor
+    # can reuse one instance; nodes holding per-execution state set False
+    stateless: bool = True
+    
+    # Set per class below, from whether it defines execute_streaming()
+    _supports_streaming: bool = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Classify once per class instead of probing instances on every run
+        cls._supports_streaming = callable(getattr(cls, "execute_streaming", None))
+        
+    def __init__(self, spec: Optional[NodeSpec] = None):
+        self.spec = spec if spec is not None else self.NODE_SPEC
+        
+    @classmethod
+    def class_spec(cls) -> NodeSpec:
+        """The node type's spec, without creating an instance when the class declares NODE_SPEC."""
+        if cls.NODE_SPEC is not None:
+            return cls.NODE_SPEC
+        return cls().spec
         
     @abstractmethod
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
-        """Execute the node logic and return outputs."""
+        """Execute the node logic and return outputs.
+        
+        Runs on the executor's event loop. Nodes with blocking sections
+        offload those themselves (e.g. with asyncio.to_thread), so
+        loop-bound clients stay on this loop.
+        """
         pass
         
     def validate_inputs(self, inputs: Dict[str, Any]) -> bool:
@@ -1,15 +1,18 @@
 """Main FastAPI application."""
 
 import logging
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .api.graphs import router as graphs_router
 from .api.executions import router as executions_router
 from .api.plugins import router as plugins_router
 from .api.instances import router as instances_router
-from .core.executor import NodeRegistry
+from .core.content_addressable_context import content_addressable_context
+from .core.executor import GraphExecutor, NodeRegistry
 from .plugins.loader import PluginManager
 from .plugins.builtin_nodes import BUILTIN_NODES
 
@@ -55,10 +58,18 @@ async def lifespan(app: FastAPI):
     app.state.plugin_manager = plugin_manager
     app.state.node_registry = node_registry
     
+    # Executors keep per-run state on the ExecutionContext, so one instance
+    # can serve every request
+    app.state.graph_executor = GraphExecutor(
+        node_registry.get_all(),
+        max_concurrency=int(os.getenv("NODE_MAX_CONCURRENCY", "16"))
+    )
+    
     yield
     
     # Shutdown
     logger.info("Shutting down nodecules...")
+    await content_addressable_context.flush_access_times()
 
 
 # Create FastAPI app
@@ -66,9 +77,48 @@ app = FastAPI(
     title="Nodecules API",
     description="A Python node-based graph processing engine",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Graph payloads (nodes/edges) can be large; encode responses with orjson
+    default_response_class=ORJSONResponse
 )
 
+class UnhandledErrorMiddleware:
+    """Turn unexpected errors into a generic 500 and log them once.
+    
+    Added before CORSMiddleware so it runs inside it: the 500 keeps the
+    CORS headers, and the browser sees the error instead of a CORS failure.
+    Errors raised after a response has started are re-raised.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_tracking(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_tracking)
+        except Exception:
+            if response_started:
+                raise
+            logger.exception(f"Unhandled error on {scope['method']} {scope['path']}")
+            # Error messages can carry connection strings or queries; keep them in the log
+            response = ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+            await response(scope, receive, send)
+
+
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -78,6 +128,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
 # Include routers
 app.include_router(graphs_router, prefix="/api/v1/graphs", tags=["graphs"])
 app.include_router(executions_router, prefix="/api/v1/executions", tags=["executions"])
@@ -2,12 +2,12 @@
 
 from datetime import datetime
 from typing import Dict, Any, Optional
-from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, JSON, Boolean, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import Column, String, DateTime, JSON, Boolean, Integer, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
 
-from .database import Base
+from .database import Base, uuid7
 
 
 class GraphInstance(Base):
@@ -15,7 +15,7 @@ class GraphInstance(Base):
     
     __tablename__ = "graph_instances"
     
-    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid7)
     instance_id = Column(String(100), unique=True, nullable=False, index=True)
     graph_id = Column(PG_UUID(as_uuid=True), nullable=False)
     
@@ -24,11 +24,12 @@ class GraphInstance(Base):
     description = Column(Text, nullable=True)
     
     # Persistent state storage
-    instance_state = Column(JSON, nullable=False, default=dict)  # Cross-execution state
-    last_outputs = Column(JSON, nullable=True)  # Outputs from last execution
+    # Cross-execution state; setting or removing a key marks it changed
+    instance_state = Column(MutableDict.as_mutable(JSONB), nullable=False, default=dict)
+    last_outputs = Column(JSON, nullable=True)  # Context keys from last execution, by node
     
     # Execution tracking
-    run_count = Column(JSON, nullable=False, default=0)  # How many times executed
+    run_count = Column(Integer, nullable=False, default=0)  # How many times executed
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_executed = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
@@ -45,7 +46,7 @@ class InstanceExecution(Base):
     
     __tablename__ = "instance_executions"
     
-    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid7)
     instance_id = Column(PG_UUID(as_uuid=True), ForeignKey('graph_instances.id'), nullable=False)
     execution_id = Column(String(100), nullable=False, index=True)
     
@@ -1,12 +1,11 @@
 """SQLAlchemy database models."""
 
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Boolean, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from .database import Base
+from .database import Base, uuid7
 
 
 class Graph(Base):
@@ -14,26 +13,33 @@ class Graph(Base):
     
     __tablename__ = "graphs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     nodes = Column(JSON, nullable=False, default=dict)
     edges = Column(JSON, nullable=False, default=list)
     meta_data = Column(JSON, default=dict)
+    # Denormalized from nodes at write time so schema lookups skip the scan
+    input_node_ids = Column(JSON)  # Sorted input node ids
+    output_node_ids = Column(JSON)  # Output node ids in graph order
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_by = Column(String(255))  # User ID
+    created_by = Column(String(255), nullable=False, server_default="system")  # User ID
     
     # Relationships
     executions = relationship("Execution", back_populates="graph")
 
 
+# Case-insensitive name lookups compare lower(name)
+Index("ix_graphs_lower_name", func.lower(Graph.name))
+
+
 class Execution(Base):
     """Execution history model."""
     
     __tablename__ = "executions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     graph_id = Column(UUID(as_uuid=True), ForeignKey("graphs.id"), nullable=False)
     status = Column(String(50), nullable=False, default="pending")  # pending, running, completed, failed
     inputs = Column(JSON, default=dict)
@@ -53,7 +59,7 @@ class DataObject(Base):
     
     __tablename__ = "data_objects"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     object_type = Column(String(50), nullable=False)  # text, image, audio, video, file
     content_hash = Column(String(64), nullable=False, unique=True)
     storage_location = Column(String(500))  # File path or URL
@@ -73,7 +79,7 @@ class Annotation(Base):
     
     __tablename__ = "annotations"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     data_object_id = Column(UUID(as_uuid=True), ForeignKey("data_objects.id"), nullable=False)
     annotation_type = Column(String(50), nullable=False)  # classification, extraction, summary
     content = Column(JSON, nullable=False)
@@ -90,7 +96,7 @@ class User(Base):
     
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username = Column(String(100), unique=True, nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -106,7 +112,7 @@ class ContextStorage(Base):
     
     __tablename__ = "context_storage"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     context_key = Column(String(255), nullable=False, unique=True, index=True)
     context_data = Column(JSON, nullable=False, default=dict)
     meta_data = Column(JSON, default=dict)  # Store provider info, model, etc.
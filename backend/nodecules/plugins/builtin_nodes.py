@@ -1,9 +1,11 @@
 """Built-in node types for basic operations."""
 
-import json
 import re
+from functools import lru_cache
 from typing import Any, Dict
 
+import orjson
+
 from ..core.types import BaseNode, DataType, NodeSpec, ParameterSpec, PortSpec, ResourceRequirement, ExecutionContext, NodeData
 
 
@@ -12,39 +14,37 @@ class InputNode(BaseNode):
     
     NODE_TYPE = "input"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Input",
-            description="Provides input data to the graph",
-            category="Input/Output",
-            inputs=[],
-            outputs=[
-                PortSpec(name="output", data_type=DataType.ANY, description="Input data")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="label",
-                    data_type="string",
-                    default="",
-                    description="Friendly name for this input (e.g., 'source_text', 'temperature')"
-                ),
-                ParameterSpec(
-                    name="value",
-                    data_type="string",
-                    default="",
-                    description="Input value"
-                ),
-                ParameterSpec(
-                    name="data_type",
-                    data_type="string", 
-                    default="text",
-                    description="Data type (text, json, number)"
-                ),
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Input",
+        description="Provides input data to the graph",
+        category="Input/Output",
+        inputs=[],
+        outputs=[
+            PortSpec(name="output", data_type=DataType.ANY, description="Input data")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="label",
+                data_type="string",
+                default="",
+                description="Friendly name for this input (e.g., 'source_text', 'temperature')"
+            ),
+            ParameterSpec(
+                name="value",
+                data_type="string",
+                default="",
+                description="Input value"
+            ),
+            ParameterSpec(
+                name="data_type",
+                data_type="string", 
+                default="text",
+                description="Data type (text, json, number)"
+            ),
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         # Try multiple input resolution methods in order of priority
         value = None
@@ -57,17 +57,11 @@ class InputNode(BaseNode):
         # 2. Try by ordinal (input_1, input_2, etc.)
         if value is None:
             # Find this node's ordinal position among input nodes
-            input_nodes = [node_id for node_id, node in context.graph.nodes.items() 
-                          if node.node_type == "input"]
-            input_nodes.sort()  # Ensure consistent ordering
-            
-            try:
-                ordinal = input_nodes.index(node_data.node_id) + 1  # 1-based indexing
+            ordinal = context.graph.input_ordinals.get(node_data.node_id)
+            if ordinal is not None:
                 ordinal_key = f"input_{ordinal}"
                 if ordinal_key in context.execution_inputs:
                     value = context.execution_inputs[ordinal_key]
-            except ValueError:
-                pass  # Node not found in input_nodes (shouldn't happen)
         
         # 3. Try by node ID (backwards compatibility)
         if value is None and node_data.node_id in context.execution_inputs:
@@ -82,8 +76,8 @@ class InputNode(BaseNode):
         # Convert value based on data type
         if data_type == "json" and isinstance(value, str):
             try:
-                value = json.loads(value)
-            except json.JSONDecodeError:
+                value = orjson.loads(value)
+            except orjson.JSONDecodeError:
                 pass  # Keep as string if invalid JSON
         elif data_type == "number":
             try:
@@ -99,85 +93,86 @@ class TextTransformNode(BaseNode):
     
     NODE_TYPE = "text_transform"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Text Transform",
-            description="Transform text using various operations",
-            category="Text Processing",
-            inputs=[
-                PortSpec(name="text", data_type=DataType.TEXT, description="Input text")
-            ],
-            outputs=[
-                PortSpec(name="output", data_type=DataType.TEXT, description="Transformed text")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="operation",
-                    data_type="string",
-                    default="uppercase",
-                    description="Transform operation",
-                    constraints={"enum": ["uppercase", "lowercase", "title", "strip", "reverse"]}
-                )
-            ]
-        )
-        super().__init__(spec)
-        
+    # Transform for each operation; unknown operations pass text through
+    OPERATIONS = {
+        "uppercase": str.upper,
+        "lowercase": str.lower,
+        "title": str.title,
+        "strip": str.strip,
+        "reverse": lambda text: text[::-1],
+    }
+    
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Text Transform",
+        description="Transform text using various operations",
+        category="Text Processing",
+        inputs=[
+            PortSpec(name="text", data_type=DataType.TEXT, description="Input text")
+        ],
+        outputs=[
+            PortSpec(name="output", data_type=DataType.TEXT, description="Transformed text")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="operation",
+                data_type="string",
+                default="uppercase",
+                description="Transform operation",
+                constraints={"enum": ["uppercase", "lowercase", "title", "strip", "reverse"]}
+            )
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         text = context.get_input_value(node_data.node_id, "text") or ""
         operation = node_data.parameters.get("operation", "uppercase")
         
-        if operation == "uppercase":
-            result = text.upper()
-        elif operation == "lowercase":
-            result = text.lower()
-        elif operation == "title":
-            result = text.title()
-        elif operation == "strip":
-            result = text.strip()
-        elif operation == "reverse":
-            result = text[::-1]
-        else:
-            result = text
+        transform = self.OPERATIONS.get(operation)
+        result = transform(text) if transform is not None else text
             
         return {"output": result}
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compiled regex for a filter pattern, reused across executions."""
+    return re.compile(pattern)
+
+
 class TextFilterNode(BaseNode):
     """Filter text using regex or string matching."""
     
     NODE_TYPE = "text_filter"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Text Filter",
-            description="Filter text using regex or string patterns",
-            category="Text Processing",
-            inputs=[
-                PortSpec(name="text", data_type=DataType.TEXT, description="Input text")
-            ],
-            outputs=[
-                PortSpec(name="matches", data_type=DataType.TEXT, description="Matching text"),
-                PortSpec(name="filtered", data_type=DataType.TEXT, description="Text with matches removed")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="pattern",
-                    data_type="string",
-                    default="",
-                    description="Regex pattern or string to match"
-                ),
-                ParameterSpec(
-                    name="use_regex",
-                    data_type="boolean",
-                    default=True,
-                    description="Use regex pattern matching"
-                )
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Text Filter",
+        description="Filter text using regex or string patterns",
+        category="Text Processing",
+        inputs=[
+            PortSpec(name="text", data_type=DataType.TEXT, description="Input text")
+        ],
+        outputs=[
+            PortSpec(name="matches", data_type=DataType.TEXT, description="Matching text"),
+            PortSpec(name="filtered", data_type=DataType.TEXT, description="Text with matches removed")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="pattern",
+                data_type="string",
+                default="",
+                description="Regex pattern or string to match"
+            ),
+            ParameterSpec(
+                name="use_regex",
+                data_type="boolean",
+                default=True,
+                description="Use regex pattern matching"
+            )
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         text = context.get_input_value(node_data.node_id, "text") or ""
         pattern = node_data.parameters.get("pattern", "")
@@ -188,24 +183,35 @@ class TextFilterNode(BaseNode):
             
         if use_regex:
             try:
-                matches = re.findall(pattern, text)
-                filtered = re.sub(pattern, "", text)
+                compiled = _compile_pattern(pattern)
+            except re.error:
+                # Invalid regex, fall back to string matching
+                use_regex = False
+            else:
+                # Collect matches (as findall would report them) while
+                # removing them, in a single pass over the text
+                matches = []
+                group_count = compiled.groups
+                
+                def remove(match: "re.Match[str]") -> str:
+                    if group_count == 0:
+                        matches.append(match.group())
+                    elif group_count == 1:
+                        matches.append(match.groups("")[0])
+                    else:
+                        matches.append(match.groups(""))
+                    return ""
+                
+                filtered = compiled.sub(remove, text)
                 return {
                     "matches": "\n".join(matches),
                     "filtered": filtered
                 }
-            except re.error:
-                # Invalid regex, fall back to string matching
-                use_regex = False
                 
         if not use_regex:
-            # Simple string matching
-            if pattern in text:
-                matches = pattern
-                filtered = text.replace(pattern, "")
-            else:
-                matches = ""
-                filtered = text
+            # Simple string matching; the text only shrinks if it matched
+            filtered = text.replace(pattern, "")
+            matches = pattern if len(filtered) != len(text) else ""
                 
             return {"matches": matches, "filtered": filtered}
 
@@ -215,31 +221,29 @@ class TextConcatNode(BaseNode):
     
     NODE_TYPE = "text_concat"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Text Concat",
-            description="Concatenate multiple text inputs",
-            category="Text Processing",
-            inputs=[
-                PortSpec(name="text1", data_type=DataType.TEXT, description="First text input"),
-                PortSpec(name="text2", data_type=DataType.TEXT, description="Second text input", required=False),
-                PortSpec(name="text3", data_type=DataType.TEXT, description="Third text input", required=False)
-            ],
-            outputs=[
-                PortSpec(name="output", data_type=DataType.TEXT, description="Concatenated text")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="separator",
-                    data_type="string",
-                    default=" ",
-                    description="Separator between texts"
-                )
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Text Concat",
+        description="Concatenate multiple text inputs",
+        category="Text Processing",
+        inputs=[
+            PortSpec(name="text1", data_type=DataType.TEXT, description="First text input"),
+            PortSpec(name="text2", data_type=DataType.TEXT, description="Second text input", required=False),
+            PortSpec(name="text3", data_type=DataType.TEXT, description="Third text input", required=False)
+        ],
+        outputs=[
+            PortSpec(name="output", data_type=DataType.TEXT, description="Concatenated text")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="separator",
+                data_type="string",
+                default=" ",
+                description="Separator between texts"
+            )
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         text1 = context.get_input_value(node_data.node_id, "text1")
         text2 = context.get_input_value(node_data.node_id, "text2")  
@@ -253,8 +257,8 @@ class TextConcatNode(BaseNode):
             else:
                 return str(value)
         
-        # Convert and filter out empty texts
-        texts = [to_string(t) for t in [text1, text2, text3] if to_string(t)]
+        # Convert and filter out empty texts, converting each value once
+        texts = [text for text in map(to_string, (text1, text2, text3)) if text]
         result = separator.join(texts)
         
         return {"output": result}
@@ -265,43 +269,41 @@ class JsonExtractNode(BaseNode):
     
     NODE_TYPE = "json_extract"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="JSON Extract",
-            description="Extract a specific field value from JSON/dict data",
-            category="Data Processing",
-            inputs=[
-                PortSpec(name="data", data_type=DataType.JSON, description="JSON object or dict"),
-                PortSpec(name="key", data_type=DataType.TEXT, description="Key to extract", required=False)
-            ],
-            outputs=[
-                PortSpec(name="value", data_type=DataType.TEXT, description="Extracted value as string"),
-                PortSpec(name="found", data_type=DataType.JSON, description="Whether key was found")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="key_path",
-                    data_type="string",
-                    default="",
-                    description="Dot-separated path to extract (e.g., 'user.name' or 'words')"
-                ),
-                ParameterSpec(
-                    name="default_value",
-                    data_type="string", 
-                    default="",
-                    description="Default value if key not found"
-                ),
-                ParameterSpec(
-                    name="stringify",
-                    data_type="boolean",
-                    default=True,
-                    description="Convert extracted value to string"
-                )
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="JSON Extract",
+        description="Extract a specific field value from JSON/dict data",
+        category="Data Processing",
+        inputs=[
+            PortSpec(name="data", data_type=DataType.JSON, description="JSON object or dict"),
+            PortSpec(name="key", data_type=DataType.TEXT, description="Key to extract", required=False)
+        ],
+        outputs=[
+            PortSpec(name="value", data_type=DataType.TEXT, description="Extracted value as string"),
+            PortSpec(name="found", data_type=DataType.JSON, description="Whether key was found")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="key_path",
+                data_type="string",
+                default="",
+                description="Dot-separated path to extract (e.g., 'user.name' or 'words')"
+            ),
+            ParameterSpec(
+                name="default_value",
+                data_type="string", 
+                default="",
+                description="Default value if key not found"
+            ),
+            ParameterSpec(
+                name="stringify",
+                data_type="boolean",
+                default=True,
+                description="Convert extracted value to string"
+            )
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         data = context.get_input_value(node_data.node_id, "data")
         key_input = context.get_input_value(node_data.node_id, "key")
@@ -352,38 +354,36 @@ class JsonReplaceNode(BaseNode):
     
     NODE_TYPE = "json_replace"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="JSON Replace",
-            description="Replace a specific field value in JSON/dict data",
-            category="Data Processing",
-            inputs=[
-                PortSpec(name="data", data_type=DataType.JSON, description="JSON object or dict to modify"),
-                PortSpec(name="key", data_type=DataType.TEXT, description="Key to replace", required=False),
-                PortSpec(name="value", data_type=DataType.ANY, description="New value to set")
-            ],
-            outputs=[
-                PortSpec(name="result", data_type=DataType.JSON, description="Modified JSON object"),
-                PortSpec(name="success", data_type=DataType.JSON, description="Whether replacement was successful")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="key_path",
-                    data_type="string",
-                    default="",
-                    description="Dot-separated path to replace (e.g., 'user.name' or 'content')"
-                ),
-                ParameterSpec(
-                    name="create_if_missing",
-                    data_type="boolean",
-                    default=True,
-                    description="Create the key path if it doesn't exist"
-                )
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="JSON Replace",
+        description="Replace a specific field value in JSON/dict data",
+        category="Data Processing",
+        inputs=[
+            PortSpec(name="data", data_type=DataType.JSON, description="JSON object or dict to modify"),
+            PortSpec(name="key", data_type=DataType.TEXT, description="Key to replace", required=False),
+            PortSpec(name="value", data_type=DataType.ANY, description="New value to set")
+        ],
+        outputs=[
+            PortSpec(name="result", data_type=DataType.JSON, description="Modified JSON object"),
+            PortSpec(name="success", data_type=DataType.JSON, description="Whether replacement was successful")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="key_path",
+                data_type="string",
+                default="",
+                description="Dot-separated path to replace (e.g., 'user.name' or 'content')"
+            ),
+            ParameterSpec(
+                name="create_if_missing",
+                data_type="boolean",
+                default=True,
+                description="Create the key path if it doesn't exist"
+            )
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         data = context.get_input_value(node_data.node_id, "data")
         key_input = context.get_input_value(node_data.node_id, "key")
@@ -452,29 +452,27 @@ class OutputNode(BaseNode):
     
     NODE_TYPE = "output"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Output",
-            description="Display output from the graph",
-            category="Input/Output",
-            inputs=[
-                PortSpec(name="input", data_type=DataType.ANY, description="Data to output")
-            ],
-            outputs=[
-                PortSpec(name="result", data_type=DataType.ANY, description="Output result for capture")
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="label",
-                    data_type="string",
-                    default="Output",
-                    description="Label for the output"
-                ),
-            ]
-        )
-        super().__init__(spec)
-        
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Output",
+        description="Display output from the graph",
+        category="Input/Output",
+        inputs=[
+            PortSpec(name="input", data_type=DataType.ANY, description="Data to output")
+        ],
+        outputs=[
+            PortSpec(name="result", data_type=DataType.ANY, description="Output result for capture")
+        ],
+        parameters=[
+            ParameterSpec(
+                name="label",
+                data_type="string",
+                default="Output",
+                description="Label for the output"
+            ),
+        ]
+    )
+    
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         input_value = context.get_input_value(node_data.node_id, "input")
         label = node_data.parameters.get("label", "Output")
@@ -18,60 +18,58 @@ class ContextStoreNode(BaseNode):
     
     NODE_TYPE = "context_store"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Context Store",
-            description="Store conversation context by key for stateless AI providers",
-            category="AI/Context",
-            inputs=[
-                PortSpec(
-                    name="context_key",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Unique key to store context under (auto-generated if empty)"
-                ),
-                PortSpec(
-                    name="context_data",
-                    data_type=DataType.JSON,
-                    description="Context data to store (messages, state, etc.)"
-                ),
-                PortSpec(
-                    name="metadata",
-                    data_type=DataType.JSON,
-                    required=False,
-                    description="Optional metadata (provider, model, etc.)"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="stored_key",
-                    data_type=DataType.TEXT,
-                    description="The key where context was stored"
-                ),
-                PortSpec(
-                    name="success",
-                    data_type=DataType.TEXT,
-                    description="Success status"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="expires_hours",
-                    data_type="number",
-                    default=24,
-                    description="Hours until context expires (0 = never)",
-                    constraints={"min": 0, "max": 8760}  # Max 1 year
-                ),
-                ParameterSpec(
-                    name="overwrite",
-                    data_type="boolean", 
-                    default=True,
-                    description="Allow overwriting existing context"
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Context Store",
+        description="Store conversation context by key for stateless AI providers",
+        category="AI/Context",
+        inputs=[
+            PortSpec(
+                name="context_key",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Unique key to store context under (auto-generated if empty)"
+            ),
+            PortSpec(
+                name="context_data",
+                data_type=DataType.JSON,
+                description="Context data to store (messages, state, etc.)"
+            ),
+            PortSpec(
+                name="metadata",
+                data_type=DataType.JSON,
+                required=False,
+                description="Optional metadata (provider, model, etc.)"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="stored_key",
+                data_type=DataType.TEXT,
+                description="The key where context was stored"
+            ),
+            PortSpec(
+                name="success",
+                data_type=DataType.TEXT,
+                description="Success status"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="expires_hours",
+                data_type="number",
+                default=24,
+                description="Hours until context expires (0 = never)",
+                constraints={"min": 0, "max": 8760}  # Max 1 year
+            ),
+            ParameterSpec(
+                name="overwrite",
+                data_type="boolean", 
+                default=True,
+                description="Allow overwriting existing context"
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute context store node."""
@@ -151,57 +149,55 @@ class ContextRetrieveNode(BaseNode):
     
     NODE_TYPE = "context_retrieve"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Context Retrieve",
-            description="Retrieve stored conversation context by key",
-            category="AI/Context",
-            inputs=[
-                PortSpec(
-                    name="context_key",
-                    data_type=DataType.TEXT,
-                    description="Key to retrieve context from"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="context_data",
-                    data_type=DataType.JSON,
-                    description="Retrieved context data"
-                ),
-                PortSpec(
-                    name="metadata",
-                    data_type=DataType.JSON,
-                    description="Context metadata"
-                ),
-                PortSpec(
-                    name="found",
-                    data_type=DataType.TEXT,
-                    description="Whether context was found (true/false)"
-                ),
-                PortSpec(
-                    name="age_hours",
-                    data_type=DataType.TEXT,
-                    description="Age of context in hours"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="default_context",
-                    data_type="json",
-                    default={},
-                    description="Default context to return if key not found"
-                ),
-                ParameterSpec(
-                    name="cleanup_expired",
-                    data_type="boolean",
-                    default=True,
-                    description="Automatically clean up expired contexts"
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Context Retrieve",
+        description="Retrieve stored conversation context by key",
+        category="AI/Context",
+        inputs=[
+            PortSpec(
+                name="context_key",
+                data_type=DataType.TEXT,
+                description="Key to retrieve context from"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="context_data",
+                data_type=DataType.JSON,
+                description="Retrieved context data"
+            ),
+            PortSpec(
+                name="metadata",
+                data_type=DataType.JSON,
+                description="Context metadata"
+            ),
+            PortSpec(
+                name="found",
+                data_type=DataType.TEXT,
+                description="Whether context was found (true/false)"
+            ),
+            PortSpec(
+                name="age_hours",
+                data_type=DataType.TEXT,
+                description="Age of context in hours"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="default_context",
+                data_type="json",
+                default={},
+                description="Default context to return if key not found"
+            ),
+            ParameterSpec(
+                name="cleanup_expired",
+                data_type="boolean",
+                default=True,
+                description="Automatically clean up expired contexts"
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute context retrieve node."""
@@ -290,49 +286,47 @@ class ContextListNode(BaseNode):
     
     NODE_TYPE = "context_list"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Context List",
-            description="List all stored contexts with metadata",
-            category="AI/Context",
-            inputs=[
-                PortSpec(
-                    name="pattern",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Optional pattern to filter context keys"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="contexts",
-                    data_type=DataType.JSON,
-                    description="List of context information"
-                ),
-                PortSpec(
-                    name="count",
-                    data_type=DataType.TEXT,
-                    description="Number of contexts found"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="include_expired",
-                    data_type="boolean",
-                    default=False,
-                    description="Include expired contexts in list"
-                ),
-                ParameterSpec(
-                    name="limit",
-                    data_type="number",
-                    default=50,
-                    description="Maximum contexts to return",
-                    constraints={"min": 1, "max": 1000}
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Context List",
+        description="List all stored contexts with metadata",
+        category="AI/Context",
+        inputs=[
+            PortSpec(
+                name="pattern",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Optional pattern to filter context keys"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="contexts",
+                data_type=DataType.JSON,
+                description="List of context information"
+            ),
+            PortSpec(
+                name="count",
+                data_type=DataType.TEXT,
+                description="Number of contexts found"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="include_expired",
+                data_type="boolean",
+                default=False,
+                description="Include expired contexts in list"
+            ),
+            ParameterSpec(
+                name="limit",
+                data_type="number",
+                default=50,
+                description="Maximum contexts to return",
+                constraints={"min": 1, "max": 1000}
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute context list node."""
@@ -405,67 +399,65 @@ class GenerateRandomKeyNode(BaseNode):
     
     NODE_TYPE = "generate_random_key"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Generate Random Key",
-            description="Generate random keys with optional seed data (invocation-triggered)",
-            category="Utilities",
-            inputs=[
-                PortSpec(
-                    name="seed_data",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Optional seed data to influence key generation"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="random_key",
-                    data_type=DataType.TEXT,
-                    description="Generated random key"
-                ),
-                PortSpec(
-                    name="short_key",
-                    data_type=DataType.TEXT,
-                    description="Shorter 8-character version"
-                ),
-                PortSpec(
-                    name="hash_key",
-                    data_type=DataType.TEXT,
-                    description="Hash-based key if seed provided"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="key_format",
-                    data_type="select",
-                    default="uuid",
-                    description="Format for random key generation",
-                    constraints={"options": ["uuid", "hex", "alphanumeric", "words"]}
-                ),
-                ParameterSpec(
-                    name="key_length",
-                    data_type="number",
-                    default=12,
-                    description="Length of generated key (for hex/alphanumeric)",
-                    constraints={"min": 4, "max": 64}
-                ),
-                ParameterSpec(
-                    name="prefix",
-                    data_type="string",
-                    default="key_",
-                    description="Prefix for generated keys"
-                ),
-                ParameterSpec(
-                    name="include_timestamp",
-                    data_type="boolean",
-                    default=False,
-                    description="Include timestamp component in key"
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Generate Random Key",
+        description="Generate random keys with optional seed data (invocation-triggered)",
+        category="Utilities",
+        inputs=[
+            PortSpec(
+                name="seed_data",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Optional seed data to influence key generation"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="random_key",
+                data_type=DataType.TEXT,
+                description="Generated random key"
+            ),
+            PortSpec(
+                name="short_key",
+                data_type=DataType.TEXT,
+                description="Shorter 8-character version"
+            ),
+            PortSpec(
+                name="hash_key",
+                data_type=DataType.TEXT,
+                description="Hash-based key if seed provided"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="key_format",
+                data_type="select",
+                default="uuid",
+                description="Format for random key generation",
+                constraints={"options": ["uuid", "hex", "alphanumeric", "words"]}
+            ),
+            ParameterSpec(
+                name="key_length",
+                data_type="number",
+                default=12,
+                description="Length of generated key (for hex/alphanumeric)",
+                constraints={"min": 4, "max": 64}
+            ),
+            ParameterSpec(
+                name="prefix",
+                data_type="string",
+                default="key_",
+                description="Prefix for generated keys"
+            ),
+            ParameterSpec(
+                name="include_timestamp",
+                data_type="boolean",
+                default=False,
+                description="Include timestamp component in key"
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute random key generation."""
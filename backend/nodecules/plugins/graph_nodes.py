@@ -15,63 +15,61 @@ class SubgraphNode(BaseNode):
     
     NODE_TYPE = "subgraph"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Subgraph",
-            description="Execute another graph as a node with exposed inputs/outputs",
-            category="Flow Control",
-            inputs=[
-                PortSpec(
-                    name="trigger",
-                    data_type=DataType.ANY,
-                    required=False,
-                    description="Optional trigger input"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="result",
-                    data_type=DataType.ANY,
-                    description="Result from subgraph execution"
-                ),
-                PortSpec(
-                    name="execution_info",
-                    data_type=DataType.TEXT,
-                    description="Information about subgraph execution"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="graph_id",
-                    data_type="string",
-                    default="",
-                    description="ID or name of the graph to execute"
-                ),
-                ParameterSpec(
-                    name="input_mapping",
-                    data_type="text", 
-                    default="{}",
-                    description="JSON mapping of node inputs to subgraph inputs"
-                ),
-                ParameterSpec(
-                    name="output_mapping", 
-                    data_type="text",
-                    default="{}",
-                    description="JSON mapping of subgraph outputs to node outputs"
-                ),
-                ParameterSpec(
-                    name="isolation_mode",
-                    data_type="select",
-                    default="isolated",
-                    description="Execution isolation level",
-                    constraints={
-                        "options": ["isolated", "shared_context", "inherit_context"]
-                    }
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Subgraph",
+        description="Execute another graph as a node with exposed inputs/outputs",
+        category="Flow Control",
+        inputs=[
+            PortSpec(
+                name="trigger",
+                data_type=DataType.ANY,
+                required=False,
+                description="Optional trigger input"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="result",
+                data_type=DataType.ANY,
+                description="Result from subgraph execution"
+            ),
+            PortSpec(
+                name="execution_info",
+                data_type=DataType.TEXT,
+                description="Information about subgraph execution"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="graph_id",
+                data_type="string",
+                default="",
+                description="ID or name of the graph to execute"
+            ),
+            ParameterSpec(
+                name="input_mapping",
+                data_type="text", 
+                default="{}",
+                description="JSON mapping of node inputs to subgraph inputs"
+            ),
+            ParameterSpec(
+                name="output_mapping", 
+                data_type="text",
+                default="{}",
+                description="JSON mapping of subgraph outputs to node outputs"
+            ),
+            ParameterSpec(
+                name="isolation_mode",
+                data_type="select",
+                default="isolated",
+                description="Execution isolation level",
+                constraints={
+                    "options": ["isolated", "shared_context", "inherit_context"]
+                }
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute the subgraph node."""
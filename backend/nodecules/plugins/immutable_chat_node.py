@@ -12,103 +12,104 @@ class ImmutableChatNode(BaseNode):
     
     NODE_TYPE = "immutable_chat"
     
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Immutable Chat",
+        description="Chat with immutable, content-addressable context management",
+        category="AI/Chat",
+        inputs=[
+            PortSpec(
+                name="message",
+                data_type=DataType.TEXT,
+                description="User message"
+            ),
+            PortSpec(
+                name="context_key",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Previous context key (optional)"
+            ),
+            # Optional parameter inputs - can be connected or use node defaults
+            PortSpec(
+                name="model",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Model name (optional, uses node parameter if not connected)"
+            ),
+            PortSpec(
+                name="system_prompt",
+                data_type=DataType.TEXT,
+                required=False,
+                description="System prompt (optional, uses node parameter if not connected)"
+            ),
+            PortSpec(
+                name="temperature",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Temperature (optional, uses node parameter if not connected)"
+            ),
+            PortSpec(
+                name="provider",
+                data_type=DataType.TEXT,
+                required=False,
+                description="Provider (optional, uses node parameter if not connected)"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="response",
+                data_type=DataType.TEXT,
+                description="AI response"
+            ),
+            PortSpec(
+                name="context_key",
+                data_type=DataType.TEXT,
+                description="New context key for next turn"
+            ),
+            PortSpec(
+                name="message_count",
+                data_type=DataType.TEXT,
+                description="Total messages in context"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="provider",
+                data_type="select",
+                default="ollama",
+                description="LLM provider",
+                constraints={"options": ["ollama", "anthropic"]}
+            ),
+            ParameterSpec(
+                name="model",
+                data_type="string",
+                default="llama3.2:3b",
+                description="Model name"
+            ),
+            ParameterSpec(
+                name="system_prompt",
+                data_type="text",
+                default="You are a helpful AI assistant.",
+                description="System prompt"
+            ),
+            ParameterSpec(
+                name="temperature",
+                data_type="number",
+                default=0.7,
+                description="Response temperature",
+                constraints={"min": 0.0, "max": 2.0}
+            ),
+            ParameterSpec(
+                name="streaming",
+                data_type="boolean",
+                default=False,
+                description="Enable streaming response"
+            )
+        ]
+    )
+    
     def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Immutable Chat",
-            description="Chat with immutable, content-addressable context management",
-            category="AI/Chat",
-            inputs=[
-                PortSpec(
-                    name="message",
-                    data_type=DataType.TEXT,
-                    description="User message"
-                ),
-                PortSpec(
-                    name="context_key",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Previous context key (optional)"
-                ),
-                # Optional parameter inputs - can be connected or use node defaults
-                PortSpec(
-                    name="model",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Model name (optional, uses node parameter if not connected)"
-                ),
-                PortSpec(
-                    name="system_prompt",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="System prompt (optional, uses node parameter if not connected)"
-                ),
-                PortSpec(
-                    name="temperature",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Temperature (optional, uses node parameter if not connected)"
-                ),
-                PortSpec(
-                    name="provider",
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Provider (optional, uses node parameter if not connected)"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="response",
-                    data_type=DataType.TEXT,
-                    description="AI response"
-                ),
-                PortSpec(
-                    name="context_key",
-                    data_type=DataType.TEXT,
-                    description="New context key for next turn"
-                ),
-                PortSpec(
-                    name="message_count",
-                    data_type=DataType.TEXT,
-                    description="Total messages in context"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="provider",
-                    data_type="select",
-                    default="ollama",
-                    description="LLM provider",
-                    constraints={"options": ["ollama", "anthropic"]}
-                ),
-                ParameterSpec(
-                    name="model",
-                    data_type="string",
-                    default="llama3.2:3b",
-                    description="Model name"
-                ),
-                ParameterSpec(
-                    name="system_prompt",
-                    data_type="text",
-                    default="You are a helpful AI assistant.",
-                    description="System prompt"
-                ),
-                ParameterSpec(
-                    name="temperature",
-                    data_type="number",
-                    default=0.7,
-                    description="Response temperature",
-                    constraints={"min": 0.0, "max": 2.0}
-                ),
-                ParameterSpec(
-                    name="streaming",
-                    data_type="boolean",
-                    default=False,
-                    description="Enable streaming response"
-                )
-            ]
-        )
-        super().__init__(spec)
+        super().__init__()
         
         # Initialize Ollama adapter
         self.ollama = OllamaAdapter()
@@ -155,6 +156,9 @@ class ImmutableChatNode(BaseNode):
                 if prev_context:
                     prev_messages = prev_context["messages"]
             
+            # A turn on a stored history is appended to that context
+            base_key = prev_context_key if prev_messages else None
+            
             # If no previous messages, start with system prompt
             if not prev_messages:
                 prev_messages = [{"role": "system", "content": system_prompt}]
@@ -190,19 +194,24 @@ class ImmutableChatNode(BaseNode):
                     temperature=temperature
                 )
             
-            # Create new message list with the conversation
-            new_messages = prev_messages + [
+            # This turn's messages
+            turn_messages = [
                 {"role": "user", "content": message},
                 {"role": "assistant", "content": response}
             ]
             
-            # Store new immutable context
-            new_context_key = await content_addressable_context.store_context(new_messages)
+            # Store new immutable context. Extending the base context reuses
+            # the history just loaded and its hash state, so only the turn is
+            # hashed and nothing is read back
+            if base_key:
+                new_context_key = await content_addressable_context.extend_context(base_key, turn_messages)
+            else:
+                new_context_key = await content_addressable_context.store_context(prev_messages + turn_messages)
             
             return {
                 "response": response,
                 "context_key": new_context_key,
-                "message_count": str(len(new_messages))
+                "message_count": str(len(prev_messages) + len(turn_messages))
             }
             
         except Exception as e:
@@ -184,9 +184,7 @@ class PluginLoader:
         specs = []
         for node_type, node_class in self.node_classes.items():
             try:
-                # Create temporary instance to get spec
-                instance = node_class()
-                specs.append(instance.spec)
+                specs.append(node_class.class_spec())
             except Exception as e:
                 logger.error(f"Failed to get spec for node type {node_type}: {e}")
                 
@@ -11,67 +11,65 @@ class SmartChatNode(BaseNode):
     
     NODE_TYPE = "smart_chat"
     
-    def __init__(self):
-        spec = NodeSpec(
-            node_type=self.NODE_TYPE,
-            display_name="Smart Chat",
-            description="Chat with smart context management (adapts to provider capabilities)",
-            category="AI/Chat", 
-            inputs=[
-                PortSpec(
-                    name="message",
-                    data_type=DataType.TEXT,
-                    description="User message"
-                ),
-                PortSpec(
-                    name="context_id", 
-                    data_type=DataType.TEXT,
-                    required=False,
-                    description="Context ID for conversation continuity (optional)"
-                )
-            ],
-            outputs=[
-                PortSpec(
-                    name="response",
-                    data_type=DataType.TEXT,
-                    description="AI response"
-                ),
-                PortSpec(
-                    name="context_id",
-                    data_type=DataType.TEXT, 
-                    description="Context ID for next turn"
-                )
-            ],
-            parameters=[
-                ParameterSpec(
-                    name="provider",
-                    data_type="select",
-                    default="ollama",
-                    description="LLM provider",
-                    constraints={"options": ["ollama", "anthropic", "mock"]}
-                ),
-                ParameterSpec(
-                    name="model", 
-                    data_type="string",
-                    default="llama2",
-                    description="Model name"
-                ),
-                ParameterSpec(
-                    name="system_prompt",
-                    data_type="text",
-                    default="You are a helpful AI assistant.",
-                    description="System prompt for new conversations"
-                ),
-                ParameterSpec(
-                    name="temperature",
-                    data_type="number", 
-                    default=0.7,
-                    description="Response temperature",
-                    constraints={"min": 0.0, "max": 2.0}
-                )
-            ]
-        )
-        super().__init__(spec)
+    NODE_SPEC = NodeSpec(
+        node_type=NODE_TYPE,
+        display_name="Smart Chat",
+        description="Chat with smart context management (adapts to provider capabilities)",
+        category="AI/Chat", 
+        inputs=[
+            PortSpec(
+                name="message",
+                data_type=DataType.TEXT,
+                description="User message"
+            ),
+            PortSpec(
+                name="context_id", 
+                data_type=DataType.TEXT,
+                required=False,
+                description="Context ID for conversation continuity (optional)"
+            )
+        ],
+        outputs=[
+            PortSpec(
+                name="response",
+                data_type=DataType.TEXT,
+                description="AI response"
+            ),
+            PortSpec(
+                name="context_id",
+                data_type=DataType.TEXT, 
+                description="Context ID for next turn"
+            )
+        ],
+        parameters=[
+            ParameterSpec(
+                name="provider",
+                data_type="select",
+                default="ollama",
+                description="LLM provider",
+                constraints={"options": ["ollama", "anthropic", "mock"]}
+            ),
+            ParameterSpec(
+                name="model", 
+                data_type="string",
+                default="llama2",
+                description="Model name"
+            ),
+            ParameterSpec(
+                name="system_prompt",
+                data_type="text",
+                default="You are a helpful AI assistant.",
+                description="System prompt for new conversations"
+            ),
+            ParameterSpec(
+                name="temperature",
+                data_type="number", 
+                default=0.7,
+                description="Response temperature",
+                constraints={"min": 0.0, "max": 2.0}
+            )
+        ]
+    )
     
     async def execute(self, context: ExecutionContext, node_data: NodeData) -> Dict[str, Any]:
         """Execute smart chat node."""
@@ -12,6 +12,7 @@ from sqlalchemy import inspect, text
 from nodecules.models.database import engine, Base
 from nodecules.models.schemas import Graph, Execution, DataObject, Annotation, User, ContextStorage
 from nodecules.core.content_addressable_context import ImmutableContext
+from nodecules.core.smart_context import SmartContext, SmartContextMessage
 
 
 def check_database_connection():
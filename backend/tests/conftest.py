@@ -0,0 +1,53 @@
+"""Shared fixtures.
+
+Tests that need PostgreSQL (JSONB operators, data-modifying CTEs) run
+against the database named by TEST_DATABASE_URL and are skipped when it is
+unset. Use a scratch database: its nodecules tables are created for the
+test session and dropped afterwards.
+"""
+
+import os
+
+import orjson
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Imported for their tables
+import nodecules.core.content_addressable_context  # noqa: F401
+import nodecules.core.smart_context  # noqa: F401
+import nodecules.models.instance  # noqa: F401
+import nodecules.models.schemas  # noqa: F401
+from nodecules.models.database import Base, _json_dumps
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    # Configured like the application's engine
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        json_serializer=_json_dumps,
+        json_deserializer=orjson.loads
+    )
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(postgres_engine):
+    """Sessions configured like SessionLocal; tables are emptied after each test."""
+    yield sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=postgres_engine
+    )
+
+    with postgres_engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
@@ -0,0 +1,229 @@
+"""Tests for content-addressable contexts and the chat node that chains them."""
+
+import pytest
+
+from nodecules.core import content_addressable_context as cac
+from nodecules.core.content_addressable_context import ContentAddressableContextManager
+from nodecules.core.types import EdgeData, ExecutionContext, GraphData, NodeData
+from nodecules.plugins import immutable_chat_node
+from nodecules.plugins.immutable_chat_node import ImmutableChatNode
+
+
+class DictRedis:
+    """Stands in for the Redis client as a plain in-memory cache."""
+
+    def __init__(self):
+        self.values = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def expire(self, key, ttl):
+        return key in self.values
+
+    def pipeline(self):
+        return DictPipeline(self)
+
+
+class DictPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def get(self, key):
+        self.calls.append(self.redis.get(key))
+
+    def expire(self, key, ttl):
+        self.calls.append(self.redis.expire(key, ttl))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+class NullSession:
+    """Stands in for an AsyncSession; writes go nowhere and reads find nothing."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def get(self, model, key):
+        return None
+
+
+@pytest.fixture
+async def manager(monkeypatch):
+    monkeypatch.setattr(cac, "AsyncSessionLocal", NullSession)
+    manager = ContentAddressableContextManager(redis_client=DictRedis())
+    yield manager
+    if manager._access_flush_task is not None:
+        manager._access_flush_task.cancel()
+
+
+def history(turns):
+    messages = [{"role": "system", "content": "Be brief."}]
+    for turn in range(1, turns + 1):
+        messages.append({"role": "user", "content": f"question {turn}"})
+        messages.append({"role": "assistant", "content": f"answer {turn}"})
+    return messages
+
+
+def test_extended_key_matches_the_key_of_the_full_history():
+    base, turn = history(2), history(3)[-2:]
+    expected = ContentAddressableContextManager().generate_context_key(base + turn)
+
+    warm = ContentAddressableContextManager()
+    base_key, _ = warm.generate_context_key(base)
+    assert warm.extend_context_key(base_key, base, turn) == expected
+
+    # Without the base's hash state the full history is hashed
+    cold = ContentAddressableContextManager()
+    assert cold.extend_context_key(base_key, base, turn) == expected
+
+
+def test_field_boundaries_are_part_of_the_key():
+    manager = ContentAddressableContextManager()
+
+    split = manager.generate_context_key([{"role": "user", "content": "ab"}])
+    shifted = manager.generate_context_key([{"role": "usera", "content": "b"}])
+    not_text = manager.generate_context_key([{"role": "user", "content": None}])
+    empty = manager.generate_context_key([{"role": "user", "content": ""}])
+
+    assert len({split, shifted, not_text, empty}) == 4
+
+
+async def test_extend_context_reuses_a_recently_loaded_history(manager):
+    base_key = await manager.store_context(history(1))
+    await manager.load_context(base_key)
+    gets = manager.redis.gets
+
+    key = await manager.extend_context(base_key, history(2)[-2:])
+
+    assert manager.redis.gets == gets
+    assert key == manager.generate_context_key(history(2))[0]
+    assert (await manager.load_context(key))["messages"] == history(2)
+
+
+async def test_loaded_history_can_be_changed_by_the_caller(manager):
+    base_key = await manager.store_context(history(1))
+    loaded = await manager.load_context(base_key)
+
+    loaded["messages"].append({"role": "user", "content": "not stored"})
+    key = await manager.extend_context(base_key, history(2)[-2:])
+
+    assert (await manager.load_context(key))["messages"] == history(2)
+
+
+@pytest.fixture
+def chat_node(manager, monkeypatch):
+    monkeypatch.setattr(immutable_chat_node, "content_addressable_context", manager)
+    node = ImmutableChatNode()
+    calls = []
+
+    async def generate_with_context(context_data, new_message, **kwargs):
+        calls.append(list(context_data["messages"]))
+        turn = len(calls)
+        return f"answer {turn}", {}
+
+    monkeypatch.setattr(node.ollama, "generate_with_context", generate_with_context)
+    node.calls = calls
+    return node
+
+
+async def chat(node, message, context_key=None):
+    graph = GraphData(
+        graph_id="chat",
+        nodes={"chat": NodeData(
+            node_id="chat",
+            node_type="immutable_chat",
+            parameters={"system_prompt": "Be brief."},
+        )},
+        edges=[
+            EdgeData(
+                edge_id="",
+                source_node="inputs",
+                source_port=port,
+                target_node="chat",
+                target_port=port,
+            )
+            for port in ("message", "context_key")
+        ],
+    )
+    context = ExecutionContext(execution_id="", graph=graph)
+    context.node_outputs["inputs"] = {"message": message, "context_key": context_key}
+    return await node.execute(context, graph.nodes["chat"])
+
+
+async def test_chat_turns_extend_the_previous_context(chat_node, manager, monkeypatch):
+    first = await chat(chat_node, "question 1")
+    assert first["message_count"] == "3"
+
+    extended = []
+    extend_context = manager.extend_context
+
+    async def recording_extend_context(base_key, new_messages):
+        extended.append((base_key, new_messages))
+        return await extend_context(base_key, new_messages)
+
+    monkeypatch.setattr(manager, "extend_context", recording_extend_context)
+    second = await chat(chat_node, "question 2", first["context_key"])
+
+    assert extended == [(first["context_key"], history(2)[-2:])]
+    assert chat_node.calls[1] == history(1)
+    assert second["message_count"] == "5"
+    assert second["context_key"] == manager.generate_context_key(history(2))[0]
+    assert (await manager.load_context(second["context_key"]))["messages"] == history(2)
+
+
+async def test_chat_with_an_unknown_context_starts_over(chat_node, manager):
+    result = await chat(chat_node, "question 1", "0123456789abcdef")
+
+    assert result["message_count"] == "3"
+    assert result["context_key"] == manager.generate_context_key(history(1))[0]
+
+
+async def test_chat_turn_hashes_only_the_new_messages(chat_node, manager, monkeypatch):
+    first = await chat(chat_node, "question 1")
+
+    hashed = []
+    hash_messages = manager._hash_messages
+
+    def counting_hash_messages(hasher, messages):
+        hashed.append(len(messages))
+        hash_messages(hasher, messages)
+
+    monkeypatch.setattr(manager, "_hash_messages", counting_hash_messages)
+    second = await chat(chat_node, "question 2", first["context_key"])
+
+    assert hashed == [2]
+    assert second["context_key"] == ContentAddressableContextManager().generate_context_key(
+        history(2)
+    )[0]
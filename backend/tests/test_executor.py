@@ -0,0 +1,230 @@
+"""Tests for the graph executor's scheduling and failure handling."""
+
+import asyncio
+
+import pytest
+
+from nodecules.core.executor import ExecutionError, GraphExecutor
+from nodecules.core.types import (
+    BaseNode,
+    DataType,
+    EdgeData,
+    ExecutionContext,
+    GraphData,
+    NodeData,
+    NodeSpec,
+    NodeStatus,
+    PortSpec,
+)
+
+
+class Recorder:
+    """Shared log of what the probe nodes of one test did."""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.max_running = 0
+        self.gate = asyncio.Event()
+        self.gate_count = 0
+
+
+def make_registry(recorder):
+    """Node registry whose probe nodes report to the recorder.
+
+    Probe parameters: ``delay`` sleeps that long, ``gate`` waits until that
+    many gated nodes are running at once, and ``fail`` raises.
+    """
+
+    class ProbeNode(BaseNode):
+        NODE_SPEC = NodeSpec(
+            node_type="probe",
+            display_name="Probe",
+            description="Records when it runs",
+            inputs=[
+                PortSpec(name="left", data_type=DataType.TEXT, required=False),
+                PortSpec(name="right", data_type=DataType.TEXT, required=False),
+            ],
+            outputs=[PortSpec(name="value", data_type=DataType.TEXT)],
+        )
+
+        async def execute(self, context, node_data):
+            params = node_data.parameters
+            recorder.events.append(("start", node_data.node_id))
+            recorder.running += 1
+            recorder.max_running = max(recorder.max_running, recorder.running)
+            try:
+                if params.get("gate"):
+                    recorder.gate_count += 1
+                    if recorder.gate_count >= params["gate"]:
+                        recorder.gate.set()
+                    await asyncio.wait_for(recorder.gate.wait(), timeout=1)
+                await asyncio.sleep(params.get("delay", 0))
+                if params.get("fail"):
+                    raise RuntimeError("probe failed")
+            finally:
+                recorder.running -= 1
+            recorder.events.append(("end", node_data.node_id))
+
+            parts = [
+                context.get_input_value(node_data.node_id, "left"),
+                node_data.node_id,
+                context.get_input_value(node_data.node_id, "right"),
+            ]
+            return {"value": "+".join(part for part in parts if part)}
+
+    return {"probe": ProbeNode}
+
+
+def make_graph(nodes, edges):
+    """Graph of probe nodes from {node_id: parameters} and (source, target, port) edges."""
+    return GraphData(
+        graph_id="test",
+        nodes={
+            node_id: NodeData(node_id=node_id, node_type="probe", parameters=params)
+            for node_id, params in nodes.items()
+        },
+        edges=[
+            EdgeData(
+                edge_id="",
+                source_node=source,
+                source_port="value",
+                target_node=target,
+                target_port=port,
+            )
+            for source, target, port in edges
+        ],
+    )
+
+
+def position(events, kind, node_id):
+    return events.index((kind, node_id))
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def executor(recorder):
+    return GraphExecutor(make_registry(recorder))
+
+
+async def test_dependents_run_after_their_parents(recorder, executor):
+    graph = make_graph(
+        {"a": {}, "b": {}, "c": {}},
+        [("a", "c", "left"), ("b", "c", "right")],
+    )
+
+    context = await executor.execute_graph(graph)
+
+    events = recorder.events
+    assert position(events, "start", "c") > position(events, "end", "a")
+    assert position(events, "start", "c") > position(events, "end", "b")
+    assert context.node_outputs["c"]["value"] == "a+c+b"
+    assert all(status == NodeStatus.COMPLETED for status in context.node_status.values())
+
+
+async def test_independent_nodes_overlap(recorder, executor):
+    # Each root waits until the other has started, so running them one
+    # after another times out
+    graph = make_graph(
+        {"a": {"gate": 2}, "b": {"gate": 2}, "c": {}},
+        [("a", "c", "left"), ("b", "c", "right")],
+    )
+
+    await executor.execute_graph(graph)
+
+    assert recorder.max_running == 2
+
+
+async def test_node_starts_when_its_own_parents_finish(recorder, executor):
+    # "fast_child" only depends on "fast", so it must not wait for "slow"
+    graph = make_graph(
+        {"fast": {}, "slow": {"delay": 0.05}, "fast_child": {}},
+        [("fast", "fast_child", "left")],
+    )
+
+    await executor.execute_graph(graph)
+
+    events = recorder.events
+    assert position(events, "end", "fast_child") < position(events, "end", "slow")
+
+
+async def test_max_concurrency_bounds_running_nodes(recorder):
+    executor = GraphExecutor(make_registry(recorder), max_concurrency=2)
+    graph = make_graph({f"n{i}": {"delay": 0.01} for i in range(6)}, [])
+
+    await executor.execute_graph(graph)
+
+    assert recorder.max_running == 2
+    assert len(recorder.events) == 12
+
+
+async def test_failure_raises_and_cancels_running_siblings(recorder, executor):
+    graph = make_graph(
+        {"bad": {"fail": True}, "slow": {"delay": 5}, "after": {}},
+        [("bad", "after", "left")],
+    )
+
+    with pytest.raises(ExecutionError, match="Node bad failed: probe failed"):
+        await asyncio.wait_for(executor.execute_graph(graph), timeout=1)
+
+    assert ("end", "slow") not in recorder.events
+    assert ("start", "after") not in recorder.events
+    assert recorder.running == 0
+
+
+async def test_failure_is_recorded_on_the_context(recorder, executor):
+    graph = make_graph(
+        {"bad": {"fail": True}, "after": {}},
+        [("bad", "after", "left")],
+    )
+    context = ExecutionContext(execution_id="", graph=graph)
+
+    with pytest.raises(ExecutionError):
+        await executor.execute_graph_with_context(context)
+
+    assert context.node_status["bad"] == NodeStatus.FAILED
+    assert context.node_status["after"] == NodeStatus.PENDING
+    assert context.errors["bad"] == "probe failed"
+    assert context.completed_at is not None
+
+
+async def test_unknown_node_type_fails_the_execution(executor):
+    graph = GraphData(
+        graph_id="test",
+        nodes={"x": NodeData(node_id="x", node_type="missing")},
+    )
+
+    with pytest.raises(ExecutionError, match="Unknown node type: missing"):
+        await executor.execute_graph(graph)
+
+
+async def test_parallel_batches_follow_dependency_levels(recorder, executor):
+    graph = make_graph(
+        {"a": {"gate": 2}, "b": {"gate": 2}, "c": {}},
+        [("a", "c", "left"), ("b", "c", "right")],
+    )
+
+    context = await executor.execute_parallel_batches(graph)
+
+    events = recorder.events
+    assert recorder.max_running == 2
+    assert position(events, "start", "c") > position(events, "end", "a")
+    assert position(events, "start", "c") > position(events, "end", "b")
+    assert context.node_outputs["c"]["value"] == "a+c+b"
+
+
+async def test_parallel_batch_failure_cancels_the_batch(recorder, executor):
+    graph = make_graph(
+        {"bad": {"fail": True}, "slow": {"delay": 5}, "after": {}},
+        [("bad", "after", "left"), ("slow", "after", "right")],
+    )
+
+    with pytest.raises(ExecutionError, match="probe failed"):
+        await asyncio.wait_for(executor.execute_parallel_batches(graph), timeout=1)
+
+    assert ("end", "slow") not in recorder.events
+    assert ("start", "after") not in recorder.events
@@ -0,0 +1,142 @@
+"""Tests for conditional GETs of graphs via ETag / If-None-Match."""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from nodecules.api import graphs
+from nodecules.main import app
+from nodecules.models.database import get_async_database
+from nodecules.models.schemas import Graph
+
+GRAPH_ID = UUID("01890000-0000-7000-8000-000000000001")
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def make_graph(updated_at=UPDATED_AT):
+    return Graph(
+        id=GRAPH_ID,
+        name="etag-graph",
+        description=None,
+        nodes={
+            "in": {"node_type": "input", "parameters": {"label": "Question"}},
+            "out": {"node_type": "output", "parameters": {"label": "Answer"}},
+        },
+        edges=[],
+        meta_data={},
+        input_node_ids=["in"],
+        output_node_ids=["out"],
+        created_at=UPDATED_AT,
+        updated_at=updated_at,
+        created_by="system",
+    )
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def stored_graph(monkeypatch):
+    """Serve one in-memory graph to the graph endpoints instead of the database."""
+    holder = {"graph": make_graph()}
+
+    async def resolve(graph_identifier, db):
+        return holder["graph"]
+
+    async def no_database():
+        yield None
+
+    monkeypatch.setattr(graphs, "resolve_graph_by_id_or_name_async", resolve)
+    app.dependency_overrides[get_async_database] = no_database
+    yield holder
+    app.dependency_overrides.pop(get_async_database, None)
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the lifespan (database setup) is skipped
+    return TestClient(app)
+
+
+def test_etag_is_weak_and_tracks_updated_at():
+    etag = graphs._graph_etag(make_graph())
+
+    assert etag == f'W/"{GRAPH_ID}-{int(UPDATED_AT.timestamp() * 1_000_000)}"'
+    assert graphs._graph_etag(make_graph(UPDATED_AT + timedelta(microseconds=1))) != etag
+
+
+def test_etag_variant_is_appended():
+    graph = make_graph()
+
+    assert graphs._graph_etag(graph, "schema1") == graphs._graph_etag(graph)[:-1] + '-schema1"'
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        (" * ", True),
+        ('W/"other"', False),
+        ('W/"other", {etag}', True),
+        ('{etag},W/"other"', True),
+        ("{etag}", True),
+    ],
+)
+def test_etag_matches(if_none_match, matches):
+    etag = graphs._graph_etag(make_graph())
+    if if_none_match is not None:
+        if_none_match = if_none_match.format(etag=etag)
+
+    assert graphs._etag_matches(make_request(if_none_match), etag) is matches
+
+
+@pytest.mark.parametrize("suffix", ["", "/raw", "/schema"])
+def test_matching_if_none_match_returns_not_modified(stored_graph, client, suffix):
+    url = f"/api/v1/graphs/{GRAPH_ID}{suffix}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    second = client.get(url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+@pytest.mark.parametrize("suffix", ["", "/raw", "/schema"])
+def test_stale_if_none_match_returns_the_graph(stored_graph, client, suffix):
+    url = f"/api/v1/graphs/{GRAPH_ID}{suffix}"
+    etag = client.get(url).headers["etag"]
+
+    stored_graph["graph"] = make_graph(UPDATED_AT + timedelta(seconds=1))
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_graph_and_raw_share_an_etag_but_schema_does_not(stored_graph, client):
+    url = f"/api/v1/graphs/{GRAPH_ID}"
+
+    graph_etag = client.get(url).headers["etag"]
+
+    assert client.get(f"{url}/raw").headers["etag"] == graph_etag
+    assert client.get(f"{url}/schema").headers["etag"] != graph_etag
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_raw_body_matches_the_json_response(stored_graph, client):
+    url = f"/api/v1/graphs/{GRAPH_ID}"
+
+    assert client.get(f"{url}/raw").json() == client.get(url).json()
@@ -0,0 +1,85 @@
+"""Tests for resolving graphs by id or name in PostgreSQL."""
+
+from uuid import UUID
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from nodecules.api.graphs import (
+    resolve_graph_by_id_or_name,
+    resolve_graph_by_id_or_name_async,
+    resolve_graph_pk,
+)
+from nodecules.models.database import _json_dumps
+from nodecules.models.schemas import Graph
+
+GRAPH_ID = UUID("01890000-0000-7000-8000-0000000000aa")
+OTHER_ID = UUID("01890000-0000-7000-8000-0000000000bb")
+
+
+@pytest.fixture
+def graphs(session_factory):
+    """A graph, and another one named after the first one's id."""
+    # The namesake is stored first, so an unordered scan would find it first
+    with session_factory() as db:
+        db.add(Graph(id=OTHER_ID, name=str(GRAPH_ID), nodes={}, edges=[]))
+        db.commit()
+        db.add(Graph(id=GRAPH_ID, name="Summarizer", nodes={}, edges=[]))
+        db.commit()
+
+
+@pytest.fixture
+async def async_session_factory(postgres_engine):
+    engine = create_async_engine(
+        postgres_engine.url.set(drivername="postgresql+asyncpg"),
+        json_serializer=_json_dumps,
+        json_deserializer=orjson.loads
+    )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+ID_FORMS = [
+    str(GRAPH_ID),
+    str(GRAPH_ID).upper(),
+    GRAPH_ID.hex,
+    "{%s}" % GRAPH_ID,
+    GRAPH_ID.urn,
+]
+
+
+@pytest.mark.parametrize("identifier", ID_FORMS)
+def test_id_match_wins_over_a_graph_named_like_it(graphs, session_factory, identifier):
+    with session_factory() as db:
+        assert resolve_graph_by_id_or_name(identifier, db).id == GRAPH_ID
+
+
+@pytest.mark.parametrize("identifier", ID_FORMS)
+async def test_async_resolvers_prefer_the_id_match(graphs, async_session_factory, identifier):
+    async with async_session_factory() as db:
+        assert (await resolve_graph_by_id_or_name_async(identifier, db)).id == GRAPH_ID
+        assert await resolve_graph_pk(identifier, db) == GRAPH_ID
+
+
+def test_uuid_shaped_name_is_found_when_no_id_matches(session_factory):
+    name = "01890000-0000-7000-8000-0000000000cc"
+    with session_factory() as db:
+        db.add(Graph(id=OTHER_ID, name=name, nodes={}, edges=[]))
+        db.commit()
+
+        assert resolve_graph_by_id_or_name(name, db).id == OTHER_ID
+
+
+def test_names_match_case_insensitively(graphs, session_factory):
+    with session_factory() as db:
+        assert resolve_graph_by_id_or_name("summarizer", db).id == GRAPH_ID
+
+
+def test_unknown_identifier_is_a_404(graphs, session_factory):
+    with session_factory() as db:
+        with pytest.raises(HTTPException) as excinfo:
+            resolve_graph_by_id_or_name("no-such-graph", db)
+
+    assert excinfo.value.status_code == 404
@@ -0,0 +1,170 @@
+"""Tests for recording graph instance runs in PostgreSQL."""
+
+import pytest
+
+from nodecules.core.instance_executor import GraphInstanceExecutor
+from nodecules.core.types import BaseNode, DataType, NodeSpec, ParameterSpec, PortSpec
+from nodecules.models.instance import GraphInstance, InstanceExecution
+from nodecules.models.schemas import Graph
+
+
+class CountingNode(BaseNode):
+    """Counts its runs in instance state and remembers the last input."""
+
+    NODE_SPEC = NodeSpec(
+        node_type="counting",
+        display_name="Counting",
+        description="Counts runs in instance state",
+        outputs=[
+            PortSpec(name="count", data_type=DataType.JSON),
+            PortSpec(name="context_key", data_type=DataType.TEXT),
+        ],
+        parameters=[ParameterSpec(name="fail", data_type="boolean", default=False)],
+    )
+
+    async def execute(self, context, node_data):
+        count = context.increment_instance_counter("runs")
+        context.set_instance_state("last_input", context.execution_inputs.get("text"))
+        if node_data.parameters.get("fail"):
+            raise RuntimeError("counting failed")
+        return {"count": count, "context_key": f"ctx-{count}", "unkept": "x" * 10}
+
+
+class LocalLocks:
+    """Stands in for the Redis client, which only provides run locks here."""
+
+    def __init__(self):
+        self.held = set()
+
+    def lock(self, name, **kwargs):
+        return LocalLock(self.held, name)
+
+
+class LocalLock:
+    def __init__(self, held, name):
+        self.held = held
+        self.name = name
+
+    async def acquire(self):
+        if self.name in self.held:
+            return False
+        self.held.add(self.name)
+        return True
+
+    async def release(self):
+        self.held.discard(self.name)
+
+
+def make_graph(fail=False):
+    return Graph(
+        name="counting",
+        nodes={
+            "counter": {
+                "node_id": "counter",
+                "node_type": "counting",
+                "parameters": {"fail": fail},
+            }
+        },
+        edges=[],
+        meta_data={},
+    )
+
+
+@pytest.fixture
+def instance_executor():
+    return GraphInstanceExecutor({"counting": CountingNode}, redis_client=LocalLocks())
+
+
+def create_instance(session_factory, instance_executor, graph, state=None):
+    with session_factory() as db:
+        db.add(graph)
+        db.commit()
+        instance_id = instance_executor.create_instance(db, str(graph.id))
+        if state:
+            db.query(GraphInstance).filter_by(instance_id=instance_id).update(
+                {"instance_state": state}
+            )
+            db.commit()
+    return instance_id
+
+
+def load_instance(session_factory, instance_id):
+    with session_factory() as db:
+        return db.query(GraphInstance).filter_by(instance_id=instance_id).one()
+
+
+async def test_runs_merge_changed_state_and_count_runs(session_factory, instance_executor):
+    instance_id = create_instance(
+        session_factory, instance_executor, make_graph(), state={"keep": "me"}
+    )
+
+    for text in ("first", "second"):
+        with session_factory() as db:
+            execution = await instance_executor.execute_instance(db, instance_id, {"text": text})
+        assert execution.status == "completed"
+
+    instance = load_instance(session_factory, instance_id)
+    assert instance.instance_state == {
+        "keep": "me",
+        "counter:runs": 2,
+        "last_input": "second",
+    }
+    assert instance.run_count == 2
+    assert instance.last_executed is not None
+    # Only what the next run injects is kept on the instance
+    assert instance.last_outputs == {"counter": {"context_key": "ctx-2"}}
+
+
+async def test_run_refreshes_the_loaded_instance(session_factory, instance_executor):
+    instance_id = create_instance(session_factory, instance_executor, make_graph())
+
+    with session_factory() as db:
+        await instance_executor.execute_instance(db, instance_id, {"text": "hello"})
+        instance = db.query(GraphInstance).filter_by(instance_id=instance_id).one()
+
+        assert instance.run_count == 1
+        assert instance.instance_state["counter:runs"] == 1
+
+
+async def test_run_keeps_keys_written_elsewhere(session_factory, instance_executor):
+    instance_id = create_instance(session_factory, instance_executor, make_graph())
+
+    with session_factory() as db:
+        await instance_executor.execute_instance(db, instance_id, {"text": "one"})
+
+    # Another writer adds a key between runs; the next run only writes its own keys
+    with session_factory() as db:
+        instance = db.query(GraphInstance).filter_by(instance_id=instance_id).one()
+        instance.instance_state["external"] = True
+        db.commit()
+
+    with session_factory() as db:
+        await instance_executor.execute_instance(db, instance_id, {"text": "two"})
+
+    instance = load_instance(session_factory, instance_id)
+    assert instance.instance_state == {
+        "counter:runs": 2,
+        "last_input": "two",
+        "external": True,
+    }
+
+
+async def test_failed_run_leaves_the_instance_unchanged(session_factory, instance_executor):
+    instance_id = create_instance(
+        session_factory, instance_executor, make_graph(fail=True), state={"keep": "me"}
+    )
+
+    with session_factory() as db:
+        with pytest.raises(Exception, match="counting failed"):
+            await instance_executor.execute_instance(db, instance_id, {"text": "boom"})
+
+    instance = load_instance(session_factory, instance_id)
+    assert instance.instance_state == {"keep": "me"}
+    assert instance.run_count == 0
+    assert instance.last_executed is None
+
+    with session_factory() as db:
+        execution = db.query(InstanceExecution).filter_by(instance_id=instance.id).one()
+    assert execution.status == "failed"
+    assert "counting failed" in execution.errors["system"]
+    assert not instance_executor.redis.held
@@ -0,0 +1,56 @@
+"""Tests for app-wide error handling."""
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nodecules.main import app
+from nodecules.models.database import get_async_database
+
+ORIGIN = {"Origin": "http://localhost:3000"}
+
+
+@pytest.fixture
+def failing_database():
+    """Make every route that opens a database session fail unexpectedly."""
+
+    async def broken_database():
+        raise ValueError("could not connect to postgresql://nodecules:secret@db/nodecules")
+        yield
+
+    app.dependency_overrides[get_async_database] = broken_database
+    yield
+    app.dependency_overrides.pop(get_async_database, None)
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the lifespan (database setup) is skipped
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_unexpected_error_is_a_generic_500_with_cors_headers(failing_database, client):
+    response = client.get("/api/v1/graphs/some-graph", headers=ORIGIN)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+    assert "secret" not in response.text
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_unexpected_error_is_logged_once(failing_database, client, caplog):
+    with caplog.at_level(logging.ERROR):
+        client.get("/api/v1/graphs/some-graph")
+
+    errors = [record for record in caplog.records if record.levelno >= logging.ERROR]
+    assert len(errors) == 1
+    assert "GET /api/v1/graphs/some-graph" in errors[0].getMessage()
+    assert errors[0].exc_info is not None
+
+
+def test_http_errors_pass_through(client):
+    response = client.get("/api/v1/no-such-route", headers=ORIGIN)
+
+    assert response.status_code == 404
+    assert response.headers["access-control-allow-origin"] == "*"
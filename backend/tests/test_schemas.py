@@ -0,0 +1,99 @@
+"""Tests for how JSON columns are serialized by the application's engines."""
+
+import uuid
+
+import orjson
+import pytest
+from sqlalchemy import JSON, Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from nodecules.models import database
+from nodecules.models.database import _json_dumps
+
+VALUES = [
+    {"nodes": {"a": {"type": "input", "position": {"x": 1.5, "y": -2}}}},
+    [{"source": "a", "target": "b"}, None, True, 3],
+    ["sorted", "ids"],
+    "plain string",
+    {},
+    [],
+]
+
+metadata = MetaData()
+documents = Table(
+    "json_documents",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("body", JSON),
+)
+
+
+def make_engine(url):
+    # Configured like the application's engines
+    return create_engine(url, json_serializer=_json_dumps, json_deserializer=orjson.loads)
+
+
+def round_trip(connection, value):
+    """Store value in a scratch table and read it back."""
+    metadata.create_all(connection)
+    try:
+        connection.execute(insert(documents).values(id=1, body=value))
+        return connection.execute(select(documents.c.body)).scalar_one()
+    finally:
+        metadata.drop_all(connection)
+
+
+@pytest.mark.parametrize(
+    "engine", [database.engine, database.async_engine.sync_engine], ids=["psycopg2", "asyncpg"]
+)
+def test_engines_serialize_json_with_orjson(engine):
+    assert engine.dialect.driver in ("psycopg2", "asyncpg")
+    assert engine.dialect._json_serializer is _json_dumps
+    assert engine.dialect._json_deserializer is orjson.loads
+
+
+@pytest.mark.parametrize(
+    "engine", [database.engine, database.async_engine.sync_engine], ids=["psycopg2", "asyncpg"]
+)
+@pytest.mark.parametrize("value", VALUES)
+def test_json_columns_bind_orjson_text(engine, value):
+    dialect = engine.dialect
+    bind = JSON().dialect_impl(dialect).bind_processor(dialect)
+
+    # The drivers hand the column back decoded with the engine's deserializer
+    assert orjson.loads(bind(value)) == value
+
+
+def test_non_string_keys_are_stringified():
+    assert orjson.loads(_json_dumps({1: "one", uuid.UUID(int=0): "zero"})) == {
+        "1": "one",
+        "00000000-0000-0000-0000-000000000000": "zero",
+    }
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_round_trip_through_sqlite(value):
+    with make_engine("sqlite://").begin() as connection:
+        assert round_trip(connection, value) == value
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_round_trip_through_postgres(postgres_engine, value):
+    with postgres_engine.begin() as connection:
+        assert round_trip(connection, value) == value
+
+
+@pytest.mark.parametrize("value", VALUES)
+async def test_round_trip_through_postgres_with_asyncpg(postgres_engine, value):
+    engine = create_async_engine(
+        postgres_engine.url.set(drivername="postgresql+asyncpg"),
+        json_serializer=_json_dumps,
+        json_deserializer=orjson.loads
+    )
+    try:
+        async with engine.begin() as connection:
+            fetched = await connection.run_sync(round_trip, value)
+    finally:
+        await engine.dispose()
+
+    assert fetched == value
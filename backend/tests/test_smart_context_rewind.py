@@ -0,0 +1,104 @@
+"""Tests for rewinding smart contexts in PostgreSQL."""
+
+import pytest
+
+from nodecules.core.smart_context import SmartContext, SmartContextManager, SmartContextMessage
+
+
+class DictRedis:
+    """Stands in for the Redis client as a plain in-memory cache."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+
+@pytest.fixture
+def manager(session_factory):
+    return SmartContextManager(redis_client=DictRedis(), session_factory=session_factory)
+
+
+async def make_context(manager, turns):
+    context_id = await manager.create_context("mock", system_prompt="Be brief.")
+    for turn in range(1, turns + 1):
+        await manager.continue_conversation(context_id, f"question {turn}")
+    return context_id
+
+
+def stored_rows(session_factory, context_id):
+    with session_factory() as db:
+        messages = db.query(SmartContextMessage).filter_by(context_id=context_id).order_by(
+            SmartContextMessage.seq
+        ).all()
+        context = db.query(SmartContext).filter_by(context_id=context_id).one()
+        return [(m.seq, m.role, m.content) for m in messages], context.turn_count
+
+
+async def test_rewind_drops_the_last_exchanges(manager, session_factory):
+    context_id = await make_context(manager, turns=3)
+
+    assert await manager.rewind_context(context_id, steps=2)
+
+    rows, turn_count = stored_rows(session_factory, context_id)
+    assert [(seq, role) for seq, role, _ in rows] == [(0, "system"), (1, "user"), (2, "assistant")]
+    assert rows[1][2] == "question 1"
+    assert turn_count == 1
+
+
+async def test_rewind_drops_the_cached_copy(manager):
+    context_id = await make_context(manager, turns=2)
+    await manager._wait_for_cache_write(context_id)
+    assert manager._get_cache_key(context_id) in manager.redis.values
+
+    await manager.rewind_context(context_id)
+
+    assert manager._get_cache_key(context_id) not in manager.redis.values
+    info = await manager.get_context_info(context_id)
+    assert [m["role"] for m in info["messages"]] == ["system", "user", "assistant"]
+    assert info["messages"][1]["content"] == "question 1"
+    assert info["turn_count"] == 1
+
+
+async def test_conversation_continues_after_a_rewind(manager, session_factory):
+    context_id = await make_context(manager, turns=2)
+
+    await manager.rewind_context(context_id)
+    await manager.continue_conversation(context_id, "question 2 again")
+
+    rows, _ = stored_rows(session_factory, context_id)
+    assert [seq for seq, _, _ in rows] == [0, 1, 2, 3, 4]
+    assert rows[3][2] == "question 2 again"
+
+
+async def test_rewind_keeps_at_least_one_message(manager, session_factory):
+    context_id = await make_context(manager, turns=1)
+    before = stored_rows(session_factory, context_id)
+
+    # Dropping two exchanges would also remove the system prompt
+    assert not await manager.rewind_context(context_id, steps=2)
+
+    assert stored_rows(session_factory, context_id) == before
+
+
+async def test_rewind_of_missing_or_inactive_context_fails(manager, session_factory):
+    assert not await manager.rewind_context("no-such-context")
+
+    context_id = await make_context(manager, turns=1)
+    with session_factory() as db:
+        db.query(SmartContext).filter_by(context_id=context_id).update({"is_active": False})
+        db.commit()
+
+    assert not await manager.rewind_context(context_id)
+    rows, _ = stored_rows(session_factory, context_id)
+    assert len(rows) == 3
@@ -180,6 +180,11 @@ export default function ChatInterface() {
             setThinkingState({ isThinking: true, message: 'Streaming response...', startTime: Date.now() })
             
           } else if (chunk.type === 'node_complete') {
+            // Collect per-node outputs; execution_complete doesn't repeat them
+            if (chunk.outputs) {
+              finalOutputs[chunk.node_id] = chunk.outputs
+            }
+            
             // Node completed - check for any potential response content
             // This handles non-streaming nodes that might provide final responses
             if (!streamedContent && chunk.outputs) {
@@ -203,8 +208,7 @@ export default function ChatInterface() {
             }
             
           } else if (chunk.type === 'execution_complete') {
-            // Execution finished
-            finalOutputs = chunk.outputs
+            // Execution finished (outputs were collected from node_complete events)
             console.log('Execution complete - setting rawExecutionData:', { finalOutputs, allChunks })
             setThinkingState({ isThinking: false, message: '' })
             